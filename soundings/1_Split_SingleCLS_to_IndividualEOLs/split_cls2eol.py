@@ -0,0 +1,406 @@
+### NAME:  split_cls2eol.py
+
+### MODIFICATION HISTORY:  Written by Maiana Hanshaw (03/17/2020); Merged the PECAN, VSE and
+#                          RELAMPAGO split scripts into one table-driven splitter (10/17/2026);
+
+### PURPOSE:  To split (parse) sounding data in EOL format that comes in combined
+#             ".cls" files and need to be split into individual sounding text files,
+#             ultimately to output into "SPC" file format, which SHARPpy can read and simulate.
+
+### USAGE:  python split_cls2eol.py                                  (splits every project in "archives" below)
+#           python split_cls2eol.py --project PECAN --project VSE    (splits only the given projects)
+#           python split_cls2eol.py --workers 32                     (splits on 32 processes, handing out each "CLS" file
+#                                                                     in chunks of "soundings_per_task" soundings)
+#           python split_cls2eol.py --force                          (splits every "CLS" file again, even if unchanged)
+
+### RESTRICTIONS:
+##   INCOMING data needs to be in the NCAR EOL ".cls" file format as shown below:
+
+#Data Type:                         GAUS SOUNDING DATA/Ascending
+#Project ID:                        PECAN
+#Release Site Type/Site ID:         IOP 15
+#Release Location (lon,lat,alt):    098 57.05'W, 40 30.93'N, -98.951, 40.516, 668.9
+#UTC Release Time (y,m,d,h,m,s):    2015, 06, 25, 00:01:01
+#...
+#/
+#Nominal Release Time (y,m,d,h,m,s):2015, 06, 25, 00:01:01
+# Time  Press  Temp  Dewpt  RH    Ucmp   Vcmp   spd   dir   Wcmp     Lon     Lat   Ele   Azi    Alt    Qp   Qt   Qrh  Qu   Qv   QdZ
+#  sec    mb     C     C     %     m/s    m/s   m/s   deg   m/s      deg     deg   deg   deg     m    code code code code code code
+#------ ------ ----- ----- ----- ------ ------ ----- ----- ----- -------- ------- ----- ----- ------- ---- ---- ---- ---- ---- ----
+#  -1.0  936.3  29.7  22.3  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   658.0  1.0  1.0  1.0  1.0  1.0  9.0
+#   0.0  936.2  29.7  21.8  61.6   -0.9   -4.1   4.2  11.8   3.0  -98.951  40.516 999.0 999.0   658.7  1.0  1.0  1.0  1.0  1.0 99.0
+#....
+#3907.0   89.3 -62.8 -89.1   2.5   -0.8   -6.9   6.9   6.6   5.7  -98.155  40.428 999.0 999.0 17348.2  1.0  1.0  1.0  1.0  1.0 99.0
+#3908.0   89.2 -62.8 -89.1   2.5   -0.8   -6.8   6.8   7.1   5.7  -98.155  40.428 999.0 999.0 17354.1  1.0  1.0  1.0  1.0  1.0 99.0
+#Data Type:                         GAUS SOUNDING DATA/Ascending
+#Project ID:                        PECAN
+#Release Site Type/Site ID:         IOP 15
+#....
+
+##   Site names for the output files come from each project's site registry in
+#    "sounding_utils/cls_splitter.py" (add new sites/projects there).
+
+##   OUTGOING data just needs to be data for individual soundings.
+
+##   "CLS" files can also be compressed (".gz", ".bz2", ".xz") or inside ".zip"/tar archives
+#    (see "sounding_utils/compressed_files.py"). These are streamed through one sounding at a time,
+#    without being decompressed to disk, but are not split in chunks across the workers
+#    and have no sidecar index.
+
+##   Only "CLS" files that are new or have changed since the last run are split. Each
+#    folder of "CLS" files keeps a "split_manifest.json" of the size, modification time,
+#    content hash and output files of every "CLS" file already split (see
+#    "sounding_utils/split_manifest.py"). The outputs of a changed or removed "CLS" file
+#    that it no longer produces are deleted. A "CLS" file is also split again if any of
+#    its output files is missing, or if the output settings have changed (including the
+#    convert_eol2spc.py settings in spc_settings below, when converting to "SPC" files).
+
+##   Soundings can also be converted straight from the "CLS" files into "SPC" and/or "UV"
+#    files (with the stage 2 convert_eol2spc.py and extract_eol2uv.py parsers), without the
+#    "EOL" files being written and read back in. Set the locations in
+#    "converted_directories_out" below, and set write_eol_files to False if the "EOL"
+#    files themselves are not needed. The problems found in the converted soundings are
+#    written to the problem report of each location at the end of the run (see
+#    "sounding_utils/problem_report.py"), and the counts of their QC flags to the QC summary
+#    of the "SPC" location (see "sounding_utils/qc_summary.py").
+
+###############################################################################
+
+import argparse  # command line argument library
+import os  # operating system library
+import sys  # system library
+from concurrent.futures import ProcessPoolExecutor  # process pool for splitting files in parallel
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import compressed_files  # reads compressed files and archives
+from sounding_utils import cls_reader  # indexes and copies soundings in "CLS" files
+from sounding_utils import cls_splitter  # names soundings from the per-project site registry
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import split_manifest  # keeps track of the "CLS" files already split
+
+###### UPDATE THIS ######
+archives = [  # (project site registry, location of "CLS" sounding data files, location to output "EOL" sounding data files)
+    ("PECAN", "C:/Users/Maiana/Desktop/Downloads/Soundings/PECAN/CLS_Files", "C:/Users/Maiana/Desktop/Downloads/Soundings/PECAN/EOL_Files"),
+    ("VSE", "C:/Users/Maiana/Desktop/Downloads/Soundings/VSE-2018/Data/CLS_Files", "C:/Users/Maiana/Desktop/Downloads/Soundings/VSE-2018/Data/EOL_Files"),
+    ("RELAMPAGO", "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CLS_Files", "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/EOL_Files"),
+]
+extension = "cls"
+write_eol_files = True  # set to False to only save the sidecar index of each "CLS" file, which stage 2 can read soundings through
+converted_directories_out = {  # project: (location to output "SPC" files, location to output "UV" files), converted straight from the "CLS" files (leave blank to skip)
+    "PECAN": ("", ""),
+    "VSE": ("", ""),
+    "RELAMPAGO": ("", ""),
+}
+soundings_per_task = 1000  # with --workers, each "CLS" file is handed out to the workers in chunks of this many soundings
+#########################
+
+spc_settings = ["resample_by", "resample_bands", "fill_gaps_below", "fill_gaps_spacing", "physical_qc", "physical_qc_thresholds"]  # convert_eol2spc.py settings that change the "SPC" files written (kept in the manifest)
+
+#########################
+
+def get_files_from_directory_by_extension(directory_in, extension):
+
+    selected_files = []
+    for root, dirs, files in os.walk(directory_in):
+        if root == directory_in:
+            for file in files:
+                if "." + extension in file or compressed_files.is_archive(file):
+                    selected_files += [file]
+    return selected_files
+
+#########################
+
+def create_directory_out(directory_out):  # Check if directory exists, and if not, make it
+    if not os.path.exists(directory_out):
+        os.makedirs(directory_out)
+
+#########################
+
+def import_converters():  # Import the stage 2 "EOL" parsers (only needed, along with pandas, when converting)
+    stages_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for stage in ["2_Convert_IndividualSoundings_to_SPCforSHARPpy", "2_Optional_Extract_UVData_for_ShearAnalyses"]:
+        if os.path.join(stages_directory, stage) not in sys.path:
+            sys.path.append(os.path.join(stages_directory, stage))
+    import convert_eol2spc  # parses "EOL" soundings into "SPC" files
+    import extract_eol2uv  # parses "EOL" soundings into "UV" files
+    return convert_eol2spc, extract_eol2uv
+
+#########################
+
+def convert_soundings(project, soundings_lines):  # Convert each (EOL file name, sounding lines) straight into "SPC" and/or "UV" files, and return their (EOL file name, SPC problem records, UV problem records, SPC QC summary rows)
+    problems = []
+    spc_directory_out, uv_directory_out = converted_directories_out.get(project, ("", ""))
+    if spc_directory_out == "" and uv_directory_out == "":
+        return problems
+
+    convert_eol2spc, extract_eol2uv = import_converters()
+    for file_out, file_lines in soundings_lines:
+        spc_problems = []
+        uv_problems = []
+        spc_qc_rows = []
+        if spc_directory_out != "":
+            sounding_file_dict = convert_eol2spc.parse_info_from_eol_lines(file_out, file_lines)
+            convert_eol2spc.write_to_spc_files(convert_eol2spc.output_to_spc_format(sounding_file_dict), spc_directory_out)
+            spc_problems = convert_eol2spc.get_problems(sounding_file_dict)
+            spc_qc_rows = convert_eol2spc.get_qc_statistics(sounding_file_dict)
+        if uv_directory_out != "":
+            sounding_file_dict = extract_eol2uv.parse_info_from_eol_lines(file_out, file_lines)
+            extract_eol2uv.write_to_uv_files(extract_eol2uv.output_to_uv_format(sounding_file_dict, project), uv_directory_out)
+            uv_problems = extract_eol2uv.get_problems(sounding_file_dict)
+        problems.append((file_out, spc_problems, uv_problems, spc_qc_rows))
+    return problems
+
+#########################
+
+def write_problem_reports(project, problems):  # Write the problems of converted soundings to the problem report of each output location, and their QC flag counts to the QC summary of the "SPC" location (replacing the old records of these soundings)
+    spc_directory_out, uv_directory_out = converted_directories_out.get(project, ("", ""))
+    convert_eol2spc, extract_eol2uv = import_converters()
+    files_out = [file_out for file_out, spc_problems, uv_problems, spc_qc_rows in problems]
+    if spc_directory_out != "":
+        spc_records = [record for file_out, spc_problems, uv_problems, spc_qc_rows in problems for record in spc_problems]
+        problem_report.update_problem_report(os.path.join(spc_directory_out, convert_eol2spc.problem_report_name), spc_records, files_out)
+        if convert_eol2spc.qc_summary_name != "":
+            summary_rows = [row for file_out, spc_problems, uv_problems, spc_qc_rows in problems for row in spc_qc_rows]
+            convert_eol2spc.qc_summary.update_qc_summary(os.path.join(spc_directory_out, convert_eol2spc.qc_summary_name), summary_rows, files_out)
+    if uv_directory_out != "":
+        uv_records = [record for file_out, spc_problems, uv_problems, spc_qc_rows in problems for record in uv_problems]
+        problem_report.update_problem_report(os.path.join(uv_directory_out, extract_eol2uv.problem_report_name), uv_records, files_out)
+
+#########################
+
+def split_sounding_ranges(file_path, project, directory_out, sounding_ranges):  # Name the soundings in the given byte ranges of a "CLS" file (all of them if None), copy each one's bytes straight into its own "EOL" file, and convert them
+    if compressed_files.is_compressed(file_path):
+        return split_compressed_file(file_path, project, directory_out)
+
+    eol_files = list(cls_splitter.process_single_file(file_path, project, sounding_ranges))
+    if write_eol_files:
+        cls_reader.write_soundings(file_path, [(os.path.join(directory_out, file_out), sounding) for file_out, sounding in eol_files])
+    problems = convert_soundings(project, ((file_out, cls_reader.read_sounding_lines(file_path, sounding)) for file_out, sounding in eol_files))
+    return eol_files, problems
+
+#########################
+
+def iterate_compressed_soundings(file_path, project):  # Yield the (EOL file name, sounding, byte lines) of each sounding in the "CLS" members of a compressed file or archive, streaming through it
+    for member_name, member in compressed_files.iterate_members(file_path):
+        if "." + extension not in os.path.basename(member_name):
+            continue
+        for number, (file_out, sounding_lines) in enumerate(cls_splitter.process_lines(member_name, member, project)):
+            yield file_out, {"member": member_name, "number": number}, sounding_lines
+
+#########################
+
+def split_compressed_file(file_path, project, directory_out):  # Write each sounding in a compressed file or archive into its own "EOL" file, and convert them, one sounding at a time
+    eol_files = []
+    problems = []
+    for file_out, sounding, sounding_lines in iterate_compressed_soundings(file_path, project):
+        eol_files.append((file_out, sounding))
+        if write_eol_files:
+            with open(os.path.join(directory_out, file_out), "wb") as f:
+                f.writelines(sounding_lines)
+        problems += convert_soundings(project, [(file_out, cls_reader.decode_sounding_lines(b"".join(sounding_lines)))])
+    return eol_files, problems
+
+#########################
+
+def rewrite_sounding(file_path, project, path_out, sounding):  # Write (and convert) one sounding again from its "CLS" file
+    if "member" not in sounding:
+        if write_eol_files:
+            cls_reader.write_soundings(file_path, [(path_out, sounding)])
+        convert_soundings(project, [(os.path.basename(path_out), cls_reader.read_sounding_lines(file_path, sounding))])
+        return
+
+    for file_out, compressed_sounding, sounding_lines in iterate_compressed_soundings(file_path, project):
+        if compressed_sounding == sounding:
+            if write_eol_files:
+                with open(path_out, "wb") as f:
+                    f.writelines(sounding_lines)
+            convert_soundings(project, [(os.path.basename(path_out), cls_reader.decode_sounding_lines(b"".join(sounding_lines)))])
+            return
+
+#########################
+
+def get_chunks_of_sounding_ranges(file_path, workers):  # Find the byte ranges of the soundings in a "CLS" file and group them into chunks for the workers (one chunk of all of them if not in parallel, or if compressed)
+    if workers <= 1 or compressed_files.is_compressed(file_path):
+        return [None]
+    sounding_ranges = cls_reader.find_cls_sounding_ranges(file_path)
+    chunks = [sounding_ranges[i:i+soundings_per_task] for i in range(0, len(sounding_ranges), soundings_per_task)]
+    if chunks == []:
+        return [[]]
+    return chunks
+
+#########################
+
+def save_sounding_index(file_path, eol_files):  # Save the sidecar index of a "CLS" file, from its (EOL file name, sounding) pairs
+    cls_reader.save_index(file_path, [dict(sounding, eol_file=file_out) for file_out, sounding in eol_files])
+
+#########################
+
+def get_split_settings(project, directory_out):  # Get the settings a "CLS" file is split with, which are kept in the manifest (with the convert_eol2spc.py settings that change the "SPC" files, if converting to them)
+    settings = {}
+    settings["directory_out"] = directory_out
+    settings["write_eol_files"] = write_eol_files
+    settings["converted_directories_out"] = list(converted_directories_out.get(project, ("", "")))
+    if settings["converted_directories_out"][0] != "":
+        convert_eol2spc, extract_eol2uv = import_converters()
+        for name in spc_settings:
+            settings[name] = getattr(convert_eol2spc, name)
+    return settings
+
+#########################
+
+def get_output_paths(settings, eol_file):  # Get the path of every file written for a sounding with the given settings
+    output_paths = []
+    if settings["write_eol_files"]:
+        output_paths.append(os.path.join(settings["directory_out"], eol_file))
+    spc_directory_out, uv_directory_out = settings["converted_directories_out"]
+    if spc_directory_out != "":
+        output_paths.append(os.path.join(spc_directory_out, eol_file.replace("EOL", "SPC")))
+    if uv_directory_out != "":
+        output_paths.append(os.path.join(uv_directory_out, eol_file.replace("EOL", "UV")))
+    return output_paths
+
+#########################
+
+def outputs_exist(entry):  # Check if every file written for the soundings of a manifest entry is still there
+    for eol_file in entry["eol_files"]:
+        for output_path in get_output_paths(entry["settings"], eol_file):
+            if not os.path.exists(output_path):
+                return False
+    return True
+
+#########################
+
+def remove_stale_outputs(stale_entries, manifests):  # Delete the outputs of changed or removed "CLS" files that no "CLS" file in the manifests produces any more
+    current_paths = set()
+    for manifest in manifests.values():
+        for entry in manifest.values():
+            for eol_file in entry["eol_files"]:
+                current_paths.update(get_output_paths(entry["settings"], eol_file))
+
+    for entry in stale_entries:
+        for eol_file in entry["eol_files"]:
+            for output_path in get_output_paths(entry["settings"], eol_file):
+                if output_path not in current_paths and os.path.exists(output_path):
+                    print("REMOVED: " + output_path)
+                    os.remove(output_path)
+
+#########################
+
+def split_files(files, workers):  # Split each (CLS file path, project, directory_out, chunks of sounding ranges), on a pool of worker processes if workers > 1, and return the merged listing
+    listing = []  # (CLS file path, project, directory_out, EOL file name, sounding) of every sounding, in the same order as splitting one file after another
+    tasks = [(file_path, project, directory_out, chunk) for file_path, project, directory_out, chunks in files for chunk in chunks]
+    if workers > 1 and tasks != []:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(split_sounding_ranges, *zip(*tasks))
+    else:
+        executor = None
+        results = (split_sounding_ranges(*task) for task in tasks)
+
+    # Results come back in task order, so each file's chunks are merged back in order
+    problems_by_project = {}  # project: (EOL file name, SPC problem records, UV problem records, SPC QC summary rows) of every converted sounding
+    for file_path, project, directory_out, chunks in files:
+        print(file_path)
+        eol_files = []
+        problems = []
+        for chunk in chunks:
+            chunk_eol_files, chunk_problems = next(results)
+            eol_files += chunk_eol_files
+            problems += chunk_problems
+        for file_out, sounding in eol_files:
+            print(file_out)
+            listing.append((file_path, project, directory_out, file_out, sounding))
+        problems_by_project.setdefault(project, []).extend(problems)
+        if not compressed_files.is_compressed(file_path):  # compressed "CLS" files have no byte ranges to index
+            save_sounding_index(file_path, eol_files)
+
+    # Write each project's problem reports once, from the records the workers returned (so they never write to them at the same time)
+    for project, problems in problems_by_project.items():
+        if problems != []:
+            write_problem_reports(project, problems)
+
+    if executor is not None:
+        executor.shutdown()
+    return listing
+
+#########################
+
+def report_collisions(listing, workers):  # Report EOL files written by more than one sounding (the last one wins, as when splitting one file after another)
+
+    written_by = {}
+    for file_path, project, directory_out, file_out, sounding in listing:
+        written_by.setdefault(os.path.join(directory_out, file_out), []).append((file_path, project, sounding))
+
+    for path_out, soundings in written_by.items():
+        if len(soundings) == 1:
+            continue
+        cls_files = sorted(set(os.path.basename(file_path) for file_path, project, sounding in soundings))
+        print("COLLISION: {} written by {} soundings from {}".format(os.path.basename(path_out), len(soundings), ", ".join(cls_files)))
+
+        # Workers may have written a collided file in any order, so copy (and convert) the last sounding again
+        if workers > 1:
+            file_path, project, sounding = soundings[-1]
+            rewrite_sounding(file_path, project, path_out, sounding)
+
+#############################################################################
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Split combined \".cls\" sounding files into individual \"EOL\" files.")
+    parser.add_argument("--project", action="append", choices=sorted(cls_splitter.site_registry), help="project to split (can be given more than once; default: all archives)")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes to split \"CLS\" files with (default: 1)")
+    parser.add_argument("--force", action="store_true", help="split every \"CLS\" file again, even if it is unchanged since the last run")
+    args = parser.parse_args()
+
+    files = []
+    manifests = {}  # manifest of each folder of "CLS" files
+    stale_entries = []  # manifest entries of "CLS" files that have changed or been removed
+    manifest_keys = {}  # (folder, file name) of each "CLS" file path to split
+    for project, directory_in, directory_out in archives:
+        if args.project is not None and project not in args.project:
+            continue
+
+        files_to_process = get_files_from_directory_by_extension(directory_in, extension)
+        if write_eol_files:
+            create_directory_out(directory_out)
+        for converted_directory_out in converted_directories_out.get(project, ("", "")):
+            if converted_directory_out != "":
+                create_directory_out(converted_directory_out)
+
+        if directory_in not in manifests:
+            manifests[directory_in] = split_manifest.load_manifest(directory_in)
+        manifest = manifests[directory_in]
+        settings = get_split_settings(project, directory_out)
+
+        for file in files_to_process:
+            file_path = os.path.join(directory_in, file)
+            entry = manifest.get(file)
+            if not args.force and entry is not None and entry["project"] == project and split_manifest.file_is_unchanged(entry, file_path, settings) and outputs_exist(entry):
+                if not compressed_files.is_compressed(file_path) and cls_reader.load_index(file_path) is None:  # only the modification time changed, so the sidecar index needs saving again
+                    save_sounding_index(file_path, list(cls_splitter.process_single_file(file_path, project)))
+                continue
+            if entry is not None:
+                stale_entries.append(manifest.pop(file))
+            files.append((file_path, project, directory_out, get_chunks_of_sounding_ranges(file_path, args.workers)))
+            manifest_keys[file_path] = (directory_in, file)
+
+        # Forget the "CLS" files of this project that have been removed
+        for file in sorted(manifest):
+            if manifest[file]["project"] == project and file not in files_to_process:
+                stale_entries.append(manifest.pop(file))
+
+    listing = split_files(files, args.workers)
+    report_collisions(listing, args.workers)
+
+    # Record what each newly split "CLS" file produced, then delete outputs that nothing produces any more
+    eol_files_by_cls_file = {}
+    for file_path, project, directory_out, file_out, sounding in listing:
+        eol_files_by_cls_file.setdefault(file_path, []).append(file_out)
+    for file_path, project, directory_out, chunks in files:
+        directory_in, file = manifest_keys[file_path]
+        manifests[directory_in][file] = split_manifest.make_entry(file_path, project, get_split_settings(project, directory_out), eol_files_by_cls_file.get(file_path, []))
+    remove_stale_outputs(stale_entries, manifests)
+
+    for directory_in, manifest in manifests.items():
+        split_manifest.save_manifest(directory_in, manifest)
+
+#############################################################################
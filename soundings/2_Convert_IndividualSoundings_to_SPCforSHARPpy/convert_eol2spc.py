@@ -5,6 +5,9 @@
 ### PURPOSE:  To read in atmospheric sounding data in "EOL" file format and
 #             output into "SPC" file format, which SHARPpy can read and simulate.
 
+### USAGE:  python convert_eol2spc.py                (converts one file after another)
+#           python convert_eol2spc.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING data needs to be in the "EOL" file format as shown below:
 
@@ -53,13 +56,32 @@
 ###############################################################################
 
 import os  # operating system library
-import pandas as pd  # pandas library for dictionary and data frames
 import re  # regular expressions library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import cls_reader  # reads soundings straight from indexed "CLS" files
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import eol_reader  # reads the header and data of "EOL" soundings into arrays
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import qc_summary  # counts of questionable, bad and missing levels of each QC flag
+from sounding_utils import spc_writer  # writes a Sounding in "SPC" file format
 
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/EOL_Files"  # location of "EOL" sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/SPC_Files"  # location to output "SPC" sounding data files
-invalid_value = "-9999"
+cls_directory_in = ""  # location of indexed "CLS" files to read soundings from directly (leave blank to read the "EOL" files in directory_in)
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
+qc_summary_name = "QC_Summary.csv"  # name of the summary table of QC flag counts (per flag and height band) in directory_out (".csv" or ".jsonl", leave blank for none)
+resample_by = ""  # resample the levels written to "SPC" files by "height" or "pressure" to the spacings in resample_bands (leave blank to write every level), see "sounding_utils/resample.py"
+resample_bands = [(1000, 10), (3000, 25), (10000, 50), (30000, 100)]  # (top, spacing) of each band of levels from the surface up: m above the first level and m for "height", or mb and mb for "pressure" (e.g. [(700, 2), (300, 5), (0, 10)])
+fill_gaps_below = 0  # fill the pressure gaps (drops of 20 mb or more between levels) smaller than this (mb) with levels interpolated in log pressure (0 to leave every gap as it is), see "sounding_utils/gap_fill.py"
+fill_gaps_spacing = 5  # pressure spacing (mb) of the levels filled into a gap
+physical_qc = False  # mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear before writing, see "sounding_utils/qc.py"
+physical_qc_thresholds = {}  # thresholds of the physical QC checks to use instead of the ones in "sounding_utils/qc.py" (e.g. {"temperature_spike": 2.0})
 #########################
 
 def get_files_from_directory(directory_in):
@@ -75,6 +97,8 @@ def get_files_from_directory(directory_in):
 #########################
 
 def open_file_and_split_into_lines(file_in):
+    if cls_directory_in != "":  # read a "virtual" EOL file straight from its byte range in the "CLS" file
+        return cls_reader.read_virtual_eol_file(virtual_eol_files, file_in)
     file_lines = []
     with open (os.path.join(directory_in, file_in), "r") as myfile:
         for file_line in myfile:          
@@ -83,41 +107,13 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
 
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:       
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]            
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
-
-########################
-    
-def pressure_decreasing(pressure, index, p):    
-    lower = True
-    if invalid_value not in pressure:        
-        if index != 0:
-            previous_pressure = p[index - 1]           
-            if invalid_value in previous_pressure:
-                lower = pressure_decreasing(pressure, index -1, p)
-            else:
-                lower = pressure < previous_pressure                
-    return lower
-
-########################
-
 def parse_info_from_eol_file(file_in):
+    file_lines = open_file_and_split_into_lines(file_in)
+    return parse_info_from_eol_lines(file_in, file_lines)
 
-    print(file_in)  
+#########################
+
+def parse_info_from_eol_lines(file_in, file_lines):  # Parse the lines of one sounding, named by its "EOL" file name (also used by the fused split in stage 1)
      
     # Extract site info for site header from file name
     site_info = re.split(r'[_.\s]\s*', file_in)
@@ -144,268 +140,62 @@ def parse_info_from_eol_file(file_in):
         date = d[2:9]
         time = site_info[5]
     
-    # Get lat and lon
-    file_lines = open_file_and_split_into_lines(file_in)
-    latlon = file_lines[3].split()
-    lat = ""
-    lon = ""
-    for i, v in enumerate(latlon):
-        if i == 7:
-            ln = float(v.strip(","))
-            lon = '{:.5f}'.format(ln)
-        if i == 8:
-            lt = float(v.strip(","))
-            lat = '{:.5f}'.format(lt)
-       
-    # Get initial altitude
-    alt_line = file_lines[3].replace(" ","").split(",")
-    altitude = float(alt_line[6].rstrip())
+    # Get lat, lon and initial altitude, and the data as float arrays, one for each column (from the parsed sounding cache, if it is there)
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "eol_reader", eol_reader.parser_version, eol_reader.read_eol_sounding)
+
+    # Mask bad or missing data, using the QC flags
+    sounding = eol_reader.get_spc_sounding(file_in, name, date, time, header, data)
+    sounding.info["file_name_date"] = d  # full date, for the problem report
 
     ########################
 
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep="\s{1,}", engine="python", header=12, skiprows=[13,14], usecols=["Time", "Press", "Alt", "Temp", "Dewpt", "dir", "spd", "Qp", "Qt", "Qrh", "Qu", "Qv"]).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Format numbers to varying decimal places and get other data into lists
-    p_temp = ["%.2f"%item for item in data_df["Press"].values.tolist()]
-    h_temp = ["%.2f"%item for item in data_df["Alt"].values.tolist()]
-    t_temp = ["%.2f"%item for item in data_df["Temp"].values.tolist()]
-    dp_temp = ["%.2f"%item for item in data_df["Dewpt"].values.tolist()]
-    wd_temp = ["%.2f"%item for item in data_df["dir"].values.tolist()]
-    ws_temp = data_df["spd"].values.tolist()  # will be formatted later after converting to knots
-    time_temp = data_df["Time"].values.tolist()
-    qp_temp = data_df["Qp"].values.tolist()
-    qt_temp = data_df["Qt"].values.tolist()
-    qrh_temp = data_df["Qrh"].values.tolist()
-    qu_temp = data_df["Qu"].values.tolist()
-    qv_temp = data_df["Qv"].values.tolist()
-    
-    # Create new variables, put in good data, and replace bad data values with invalid value: "-9999"
-    p = []
-    h = []
-    t = []
-    dp = []
-    wd = []
-    ws = []
-    for ind in range(len(data_df)):
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = invalid_value
-
-        # Get initial values (sometimes these are flagged bad, but then this invalidates all initial conditions)     
-        if ind == 0:
-            if time_temp[ind] < 0:
-                h.append("{0:>10s}".format(invalid_value))
-                p.append("{0:>8s}".format(invalid_value))
-                t.append("{0:>10s}".format(invalid_value))
-                dp.append("{0:>10s}".format(invalid_value))
-                wd.append("{0:>10s}".format(invalid_value))
-                ws.append("{0:>10s}".format(invalid_value))
-            
-            if time_temp[ind] >= 0:
-                h.append("{0:>10s}".format(str(h_temp[ind])))  # this is the only one that usually has a value
-                
-            # If values are not missing, retain those values    
-            if time_temp[ind] >= 0 and "9999" not in p_temp[ind]:
-                p.append("{0:>8s}".format(str(p_temp[ind])))
-                
-            if time_temp[ind] >= 0 and "999" not in t_temp[ind]:
-                t.append("{0:>10s}".format(str(t_temp[ind])))
-                
-            if time_temp[ind] >= 0 and "999" not in dp_temp[ind]:
-                dp.append("{0:>10s}".format(str(dp_temp[ind])))  
-                
-            if time_temp[ind] >= 0 and wd_temp[ind] == invalid_value:
-                wd.append("{0:>10s}".format(str(wd_temp[ind])))                    
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" not in wd_temp[ind]:
-                wd.append("{0:>10s}".format(str(wd_temp[ind])))
-                
-            if time_temp[ind] >= 0 and ws_temp[ind] != 999:
-                ws_value = '{:.2f}'.format(float(ws_temp[ind]) * 1.94384)  # convert wind speed to knots
-                ws.append("{0:>10s}".format(str(ws_value)))
-
-            # If values are missing, get the next values for the initial conditions, unless they still have bad values
-            if time_temp[ind] >= 0 and "9999" in p_temp[ind] and "9999" not in p_temp[ind+1]:
-                p.append("{0:>8s}".format(str(p_temp[ind+1])))
-            if time_temp[ind] >= 0 and "9999" in p_temp[ind] and "9999" in p_temp[ind+1]:
-                p.append("{0:>8s}".format(invalid_value))                
-                
-            if time_temp[ind] >= 0 and "999" in t_temp[ind] and "999" not in t_temp[ind+1]:
-                t.append("{0:>10s}".format(str(t_temp[ind+1])))
-            if time_temp[ind] >= 0 and "999" in t_temp[ind] and "999" in t_temp[ind+1]:
-                t.append("{0:>10s}".format(invalid_value))                
-                
-            if time_temp[ind] >= 0 and "999" in dp_temp[ind] and "999" not in dp_temp[ind+1]:
-                dp.append("{0:>10s}".format(str(dp_temp[ind+1]))) 
-            if time_temp[ind] >= 0 and "999" in dp_temp[ind] and "999" in dp_temp[ind+1]:
-                dp.append("{0:>10s}".format(invalid_value))                 
-                 
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" in wd_temp[ind] and "999" not in wd_temp[ind+1]:
-                wd.append("{0:>10s}".format(str(wd_temp[ind+1])))  
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" in wd_temp[ind] and "999" in wd_temp[ind+1]:
-                wd.append("{0:>10s}".format(invalid_value))                  
-                
-            if time_temp[ind] >= 0 and ws_temp[ind] == 999 and ws_temp[ind+1] != 999:
-                ws_value = '{:.2f}'.format(float(ws_temp[ind+1]) * 1.94384)  # convert wind speed to knots
-                ws.append("{0:>10s}".format(str(ws_value)))  
-            if time_temp[ind] >= 0 and ws_temp[ind] == 999 and ws_temp[ind+1] == 999:
-                ws.append("{0:>10s}".format(invalid_value))                
-
-        # For the rest of the data, add "invalid value" (-9999) if QC flags are missing (9) or bad (3)
-        elif ind != 0:
-            if qp_temp[ind] == 9: 
-                p.append("{0:>8s}".format(invalid_value))
-            else:
-                p.append("{0:>8s}".format(str(p_temp[ind])))
-                
-            if qp_temp[ind] == 9 or qp_temp[ind] == 3 or "99999" in h_temp[ind]: 
-                h.append("{0:>10s}".format(invalid_value))
-            else:
-                h.append("{0:>10s}".format(str(h_temp[ind])))                
-
-            if qt_temp[ind] == 9 or qt_temp[ind] == 3:
-                t.append("{0:>10s}".format(invalid_value))
-            else:
-                t.append("{0:>10s}".format(str(t_temp[ind])))            
-            
-            if qrh_temp[ind] == 9 or qrh_temp[ind] == 3 or qt_temp[ind] == 9 or qt_temp[ind] == 3:
-                dp.append("{0:>10s}".format(invalid_value))
-            else:
-                dp.append("{0:>10s}".format(str(dp_temp[ind])))
-                
-            if qu_temp[ind] == 9 or qu_temp[ind] == 3 or qv_temp[ind] == 9 or qv_temp[ind] == 3:
-                wd.append("{0:>10s}".format(invalid_value))
-                ws.append("{0:>10s}".format(invalid_value))
-            else:
-                wd.append("{0:>10s}".format(str(wd_temp[ind])))
-                ws_value = '{:.2f}'.format(float(ws_temp[ind]) * 1.94384)  # convert wind speed to knots
-                ws.append("{0:>10s}".format(str(ws_value))) 
-                
-    ########################                
-
-    # Check if pressure values are decreasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        lower = pressure_decreasing(p[index], index, p)
-    
-        if not lower:
-            p[index] = "{0:>10s}".format(invalid_value)
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-    
-    # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-          
+    # Check if pressure values are decreasing, and if height values are increasing, and if not, make values -9999
+    qc.mask_pressure_not_decreasing(sounding, ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+    qc.mask_height_not_increasing(sounding, ["height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+
     ########################
 
-    # Put the data together
-    spc_data_list = []  # create empty list to fill with correctly spaced data    
-
-    for ind in range(len(data_df)):
-        if "-9999" in p[ind]:
-            continue
-        if p[ind] == p[ind-1]:
-            continue         
-        pressure = p[ind]
-        height = h[ind]
-        temp = t[ind]
-        dwpt = dp[ind]
-        wdir = wd[ind]
-        wspd = ws[ind] 
-
-        spc_string = "{},{},{},{},{},{}".format(pressure, height, temp, dwpt, wdir, wspd)  # create the new string for each row
-        spc_data_list.append(spc_string)  # add each row into the new list    
-       
-    spc_data = "\n".join(spc_data_list)  # join all the elements together again into a string
+    # Mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear
+    physical_qc_masked = 0
+    if physical_qc:
+        physical_qc_masked = qc.mask_physical_outliers(sounding, physical_qc_thresholds)
 
     ########################
-    
+
+    # Put the data together
+    spc_data, h_init, pressure_gaps = spc_writer.get_spc_data(sounding, resample_by, resample_bands, fill_gaps_below, fill_gaps_spacing)
+
     # Get info that could be problematic
-    flag = ""
-    if spc_data_list != []:
-        h_line = spc_data_list[0].split()
-        h_init = float(h_line[1].strip(","))
-    else:
-        h_init = altitude
-        flag = "FILE COMPLETELY EMPTY"
-        
-    # Add a problem flag if the pressure difference is > 20mb
-    missing_interpolated = ""    
-    pressure = []
-    for ind in range(len(spc_data_list)):
-        line = spc_data_list[ind].split()
-        pressure.append(float(line[0].strip(",")))
-     
-    for ind in range(len(pressure)):
-        if ind != 0:
-            pressure_current = pressure[ind]
-            pressure_previous = pressure[ind-1]
-            pressure_diff = pressure_current - pressure_previous
-            if pressure_diff <= -20:
-                diff_string = '{:.1f}'.format(pressure_diff)
-                missing_interpolated += "PROBLEM (Missing/Interpolated) = " + "Diff: " + diff_string
+    flags = []
+    if spc_data == "":
+        flags.append("FILE_EMPTY_EOL")
 
     ########################
-        
+
     # Add relevant information to a dictionary
     sounding_file_dict = {}
-    
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["site_name"] = name
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
-    sounding_file_dict["missing"] = missing_interpolated
+    sounding_file_dict["flags"] = flags
+    sounding_file_dict["physical_qc_masked"] = physical_qc_masked
+    sounding_file_dict["pressure_gaps"] = pressure_gaps
     sounding_file_dict["data"] = spc_data
-    
+
     return sounding_file_dict
 
 #########################
 
 def output_to_spc_format(sounding_file_dict):
 
-    # Construct site header
-    site_header = " {}   {}/{} {},{}".format(sounding_file_dict["site_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"])
+    # Add file_name and data to a dictionary which will then be printed out to text files
+    spc_dict = {}
 
-    # Construct data header
-    pressure = "LEVEL"
-    height = "HGHT"
-    temp = "TEMP"
-    dwpt = "DWPT"
-    wdir = "WDIR"
-    wspd = "WSPD"
+    sounding = sounding_file_dict["sounding"]
+    file_out = sounding.file_in.replace("EOL", "SPC")  # create output file name
 
-    data_header = "   {}       {}       {}       {}       {}       {}".format(pressure, height, temp, dwpt, wdir, wspd)
+    spc_dict.update({file_out: (sounding, sounding_file_dict["data"])}) # append file name (key) and sounding and data (value) to dictionary
 
-    ########################
-
-    # Add file_name and data to a dictionary which will then be printed out to text files
-    spc_dict = {}
-    
-    file_in = sounding_file_dict["file_in"]
-    file_out = file_in.replace("EOL", "SPC")  # create output file name
-
-    whole_file = ("%TITLE%" + "\n" + site_header + "\n\n" + data_header + "\n"
-                  + "-------------------------------------------------------------------"
-                  + "\n" + "%RAW%" + "\n" + sounding_file_dict["data"] + "\n" + "%END%")
-  
-    spc_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
-    
     return spc_dict
 
 #########################
@@ -416,43 +206,69 @@ def create_directory_out(directory_out):  # Check if directory exists, and if no
 
 #########################
     
-def write_to_spc_files(dictionary):  # Write dictionary items to files
-    for name, data in dictionary.items():
-        with open(os.path.join(directory_out, name), "w+") as f:
-            f.write(data)
+def write_to_spc_files(dictionary, directory_out):  # Write dictionary items to files
+    for name, (sounding, data) in dictionary.items():
+        spc_writer.write_spc_file(os.path.join(directory_out, name), sounding, data)
 
-#############################################################################
-    
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
+#########################
+
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing), each from (code, value) or (code, value, bottom, top)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
+    if alt_diff >= 5:
+        problems.append(("ALT_DIFF_EOL", alt_diff))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    if sounding_file_dict["physical_qc_masked"] > 0:
+        problems.append(("PHYSICAL_QC_MASKED", sounding_file_dict["physical_qc_masked"]))
+    for gap in sounding_file_dict["pressure_gaps"]:
+        problems.append(("PRESSURE_GAP", gap["difference"], gap["bottom"], gap["top"]))
+        if gap["filled"] > 0:
+            problems.append(("PRESSURE_GAP_FILLED", gap["filled"], gap["bottom"], gap["top"]))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.info["file_name_date"], sounding.time, *problem) for problem in problems]
 
-for file in files_to_process:
+#########################
+
+def get_qc_statistics(sounding_file_dict):  # Get the QC summary rows of the sounding's QC flags (none if it has no flags), see "sounding_utils/qc_summary.py"
+    sounding = sounding_file_dict["sounding"]
+    return qc_summary.get_flag_statistics(sounding.file_in, sounding.site, sounding.info["file_name_date"], sounding.time, sounding, "eol")
+
+#########################
+
+def convert_file(file):  # Convert one "EOL" file into its "SPC" file, and return its problem records and QC summary rows (see "sounding_utils/conversion_driver.py")
     sounding_file_dict = parse_info_from_eol_file(file)
     spc_dict = output_to_spc_format(sounding_file_dict)
+    write_to_spc_files(spc_dict, directory_out)
+    return get_problems(sounding_file_dict), get_qc_statistics(sounding_file_dict)
 
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
-    if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "PROBLEM (Alt. Diff >= 5) = " + alt_diff_string
-        
-    if sounding_file_dict["flag"] != "":
-        problem += "PROBLEM = " + sounding_file_dict["flag"]
-        
-    if sounding_file_dict["missing"] != "":
-        problem += sounding_file_dict["missing"]
+#########################
+
+def set_virtual_eol_files(eol_files):  # Set the virtual "EOL" files to read from the "CLS" files (run in each worker process too)
+    global virtual_eol_files
+    virtual_eol_files = eol_files
+
+#############################################################################
     
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-           
-    # Write converted files to text files
-    write_to_spc_files(spc_dict)
+if __name__ == "__main__":
+
+    workers = conversion_driver.get_workers("Convert \"EOL\" sounding files into \"SPC\" files.")
+    virtual_eol_files = {}
+    if cls_directory_in != "":
+        virtual_eol_files = cls_reader.get_virtual_eol_files(cls_directory_in)
+        files_to_process = list(virtual_eol_files.keys())
+    else:
+        files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
+
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems and QC summary rows to write once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers, set_virtual_eol_files, (virtual_eol_files,))
+
+    # Write the problem report and QC summary (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, (records, qc_rows) in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
+    if qc_summary_name != "":
+        summary_rows = [row for file, (records, qc_rows) in converted for row in qc_rows]
+        qc_summary.update_qc_summary(os.path.join(directory_out, qc_summary_name), summary_rows, files_to_process)
 
 #############################################################################
\ No newline at end of file
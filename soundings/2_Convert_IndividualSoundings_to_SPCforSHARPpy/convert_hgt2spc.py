@@ -5,6 +5,9 @@
 ### PURPOSE:  To read in CSWR quality-controlled atmospheric sounding data in "HGT" file
 #            format and output into "SPC" file format, which SHARPpy can read and simulate.
 
+### USAGE:  python convert_hgt2spc.py                (converts one file after another)
+#           python convert_hgt2spc.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING data needs to be in the "Hgt" file format as shown below:
 
@@ -46,14 +49,38 @@
 
 ###############################################################################
 
+import io  # input/output library
 import os  # operating system library
+import numpy as np  # numpy library for arrays
 import pandas as pd  # pandas library for dictionary and data frames
 import re  # regular expressions library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import qc_summary  # counts of questionable, bad and missing levels of each QC flag
+from sounding_utils import spc_writer  # writes a Sounding in "SPC" file format
+from sounding_utils.sounding import Sounding  # shared sounding data model
 
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/HGT_Files"  # location of "Hgt" sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/SPC_Files"  # location to output "SPC" sounding data files
-invalid_value = "-9999"
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
+qc_summary_name = "QC_Summary.csv"  # name of the summary table of QC flag counts (per flag and height band) in directory_out (".csv" or ".jsonl", leave blank for none)
+resample_by = ""  # resample the levels written to "SPC" files by "height" or "pressure" to the spacings in resample_bands (leave blank to write every level), see "sounding_utils/resample.py"
+resample_bands = [(1000, 10), (3000, 25), (10000, 50), (30000, 100)]  # (top, spacing) of each band of levels from the surface up: m above the first level and m for "height", or mb and mb for "pressure" (e.g. [(700, 2), (300, 5), (0, 10)])
+fill_gaps_below = 0  # fill the pressure gaps (drops of 20 mb or more between levels) smaller than this (mb) with levels interpolated in log pressure (0 to leave every gap as it is), see "sounding_utils/gap_fill.py"
+fill_gaps_spacing = 5  # pressure spacing (mb) of the levels filled into a gap
+physical_qc = False  # mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear before writing, see "sounding_utils/qc.py"
+physical_qc_thresholds = {}  # thresholds of the physical QC checks to use instead of the ones in "sounding_utils/qc.py" (e.g. {"temperature_spike": 2.0})
+#########################
+
+parser_version = 1  # version of what read_hgt_data returns (see "parse_cache.py"), change it whenever that changes
+
 #########################
 
 def get_files_from_directory(directory_in):
@@ -77,42 +104,36 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
     
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:        
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]           
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
+def read_hgt_data(file_lines):  # Get the data columns of a "Hgt" file as float arrays (the header values are read from the lines)
 
-########################
-    
-def pressure_decreasing(pressure, index, p):    
-    lower = True
-    if invalid_value not in pressure:        
-        if index != 0:
-            previous_pressure = p[index - 1]            
-            if invalid_value in previous_pressure:
-                lower = pressure_decreasing(pressure, index -1, p)
-            else:
-                lower = pressure < previous_pressure                
-    return lower
+    data_df = pd.read_csv(io.StringIO("".join(file_lines)), sep="\s{1,}", engine="python", header=3, usecols=["P", "HT", "TC", "TD", "DIR", "SPD", "QP", "QH", "QT", "QD", "QW"]).astype(float)
+    data = {}
+    for column in data_df.columns:
+        data[column] = data_df[column].to_numpy()
+    return {}, data
 
-########################
+#########################
+
+def get_sounding(file_in, vehicle, date, time, lat, lon, altitude, data):  # Get a Sounding of the pressure, height, temperature, dewpoint, wind direction and wind speed (m/s), with bad or missing data masked using the QC flags
+
+    sounding = Sounding(file_in, vehicle, date, time, lat, lon, altitude)
+    for flag in ["QP", "QH", "QT", "QD", "QW"]:
+        sounding.add_flags(flag, data[flag])
+
+    # Mask data if QC flags are missing (9), visually bad (5), or objectively bad (4), and wind direction if wind speed is 0
+    wind_bad = np.isin(data["QW"], (4, 5, 9))
+    sounding.add_column("pressure", data["P"], np.isin(data["QP"], (4, 5, 9)))
+    sounding.add_column("height", data["HT"], np.isin(data["QH"], (4, 5, 9)))
+    sounding.add_column("temperature", data["TC"], np.isin(data["QT"], (4, 5, 9)))
+    sounding.add_column("dewpoint", data["TD"], np.isin(data["QD"], (4, 5, 9)))
+    sounding.add_column("wind_direction", data["DIR"], wind_bad | (data["SPD"] == 0))
+    sounding.add_column("wind_speed", data["SPD"], wind_bad, "m/s")
+    return sounding
+
+#########################
 
 def parse_info_from_hgt_file(file_in):
         
-    print(file_in)
-       
     # Extract vehicle info for vehicle header from file name
     vehicle_info = re.split(r'[_.\s]\s*', file_in)
  
@@ -143,189 +164,67 @@ def parse_info_from_hgt_file(file_in):
 
     ########################
 
-    # Extract data header and data into a dictionary and then a data frame      
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep="\s{1,}", engine="python", header=3, usecols=["P", "HT", "TC", "TD", "DIR", "SPD", "QP", "QH", "QT", "QD", "QW"]).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Format numbers to 2 decimal places
-    p_temp = ["%.2f"%item for item in data_df["P"].values.tolist()]
-    h_temp = ["%.2f"%item for item in data_df["HT"].values.tolist()]
-    t_temp = ["%.2f"%item for item in data_df["TC"].values.tolist()]
-    dp_temp = ["%.2f"%item for item in data_df["TD"].values.tolist()]
-    wd_temp = ["%.2f"%item for item in data_df["DIR"].values.tolist()]
-    ws_temp = data_df["SPD"].values.tolist()  # will be formatted later after converting to knots
-    
-    # Create new variables, put in good data, and replace bad data values with "-9999"
-    p = []
-    h = []
-    t = []
-    dp = []
-    wd = []
-    ws = []
-    for ind in range(len(data_df)):
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = invalid_value         
-            
-        # Add "-9999" if QC flags are missing (9), visually bad (5), or objectively bad (4)
-        if data_df["QP"][ind] == 9 or data_df["QP"][ind] == 5 or data_df["QP"][ind] == 4:
-            p.append("{0:>8s}".format(invalid_value))
-        else:
-            p.append("{0:>8s}".format(str(p_temp[ind])))
-            
-        if data_df["QH"][ind] == 9 or data_df["QH"][ind] == 5 or data_df["QH"][ind] == 4:
-            h.append("{0:>10s}".format(invalid_value))
-        else:
-            h.append("{0:>10s}".format(str(h_temp[ind])))        
-            
-        if data_df["QT"][ind] == 9 or data_df["QT"][ind] == 5 or data_df["QT"][ind] == 4:
-            t.append("{0:>10s}".format(invalid_value))
-        else:
-            t.append("{0:>10s}".format(str(t_temp[ind])))
-            
-        if data_df["QD"][ind] == 9 or data_df["QD"][ind] == 5 or data_df["QD"][ind] == 4:
-            dp.append("{0:>10s}".format(invalid_value))
-        else:
-            dp.append("{0:>10s}".format(str(dp_temp[ind])))            
-         
-        if data_df["QW"][ind] == 9 or data_df["QW"][ind] == 5 or data_df["QW"][ind] == 4:
-            wd.append("{0:>10s}".format(invalid_value))
-            ws.append("{0:>10s}".format(invalid_value))
-        else:
-            wd.append("{0:>10s}".format(str(wd_temp[ind])))
-            ws_value = '{:.2f}'.format(float(ws_temp[ind]) * 1.94384)  # convert wind speed to knots
-            ws.append("{0:>10s}".format(str(ws_value))) 
-                                    
+    # Extract data header and data (from the parsed sounding cache, if it is there), and mask bad or missing data, using the QC flags
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "convert_hgt2spc.read_hgt_data", parser_version, read_hgt_data)
+    sounding = get_sounding(file_in, vehicle, date, time, lat, lon, altitude, data)
+    sounding.info["file_name_date"] = d  # full date, for the problem report
+
     ########################
-    
-    # Check if pressure values are decreasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        lower = pressure_decreasing(p[index], index, p)
-    
-        if not lower:
-            p[index] = "{0:>10s}".format(invalid_value)
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-            
-    # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            p[index] = "{0:>10s}".format(invalid_value)
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-            
+
+    # Check if pressure values are decreasing, and if height values are increasing, and if not, make values -9999
+    qc.mask_pressure_not_decreasing(sounding, ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+    qc.mask_height_not_increasing(sounding, ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+
     ########################
 
-    # Put the data together 
-    spc_data_list = []  # create empty list to fill with correctly spaced data    
-
-    for ind in range(len(data_df)):
-        if "-9999" in p[ind]:
-            continue
-        if p[ind] == p[ind-1]:
-            continue
-        pressure = p[ind]
-        height = h[ind]
-        temp = t[ind]
-        dwpt = dp[ind]
-        wdir = wd[ind]
-        wspd = ws[ind]   
-        
-        spc_string = "{},{},{},{},{},{}".format(pressure, height, temp, dwpt, wdir, wspd)  # create the new string for each row
-        spc_data_list.append(spc_string)  # add each row into the new list    
-       
-    spc_data = "\n".join(spc_data_list)  # join all the elements together again into a string
+    # Mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear
+    physical_qc_masked = 0
+    if physical_qc:
+        physical_qc_masked = qc.mask_physical_outliers(sounding, physical_qc_thresholds)
 
     ########################
-    
+
+    # Put the data together
+    spc_data, h_init, pressure_gaps = spc_writer.get_spc_data(sounding, resample_by, resample_bands, fill_gaps_below, fill_gaps_spacing)
+
     # Get info that could be problematic
-    flag = ""
-    if spc_data_list != []:
-        h_line = spc_data_list[0].split()
-        h_init = float(h_line[1].strip(","))
-    else:
-        h_init = altitude
-        flag = "FILE COMPLETELY EMPTY"
-        
-    h_flag_0 = data_df["QH"][0]
-    h_flag_100 = data_df["QH"][100]
-    
-    # Add a problem flag if the pressure difference is > 20mb
-    missing_interpolated = ""    
-    pressure = []
-    for ind in range(len(spc_data_list)):
-        line = spc_data_list[ind].split()
-        pressure.append(float(line[0].strip(",")))
-     
-    for ind in range(len(pressure)):
-        if ind != 0:
-            pressure_current = pressure[ind]
-            pressure_previous = pressure[ind-1]
-            pressure_diff = pressure_current - pressure_previous
-            if pressure_diff <= -20:
-                diff_string = '{:.1f}'.format(pressure_diff)
-                missing_interpolated += "PROBLEM (Missing/Interpolated) = " + "Diff: " + diff_string
+    flags = []
+    if spc_data == "":
+        flags.append("FILE_EMPTY")
+
+    # QH flags of the first and 101st levels (None if the sounding is too short to have them)
+    h_flags = sounding.flags["QH"]
+    h_flag_0 = h_flags[0] if len(h_flags) > 0 else None
+    h_flag_100 = h_flags[100] if len(h_flags) > 100 else None
 
     ########################
-    
+
     # Add relevant information to a dictionary
     sounding_file_dict = {}
-    
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["vehicle_name"] = vehicle
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
+    sounding_file_dict["flags"] = flags
+    sounding_file_dict["physical_qc_masked"] = physical_qc_masked
     sounding_file_dict["h_flag_0"] = h_flag_0
     sounding_file_dict["h_flag_100"] = h_flag_100
-    sounding_file_dict["missing"] = missing_interpolated
+    sounding_file_dict["pressure_gaps"] = pressure_gaps
     sounding_file_dict["data"] = spc_data
-    
-    return sounding_file_dict    
-        
+
+    return sounding_file_dict
+
 #########################
     
 def output_to_spc_format(sounding_file_dict):
 
-    # Construct vehicle header
-    vehicle_header = " {}   {}/{} {},{}".format(sounding_file_dict["vehicle_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"])
-
-    # Construct data header in "SPC" format
-    pressure = "LEVEL"
-    height = "HGHT"
-    temp = "TEMP"
-    dewpt = "DWPT"
-    wdir = "WDIR"
-    wspd = "WSPD"
-
-    data_header = "   {}       {}       {}       {}       {}       {}".format(pressure, height, temp, dewpt, wdir, wspd)
-
-    ######################## 
-    
-    # Add file_name and data to a dictionary which will then be printed out to text files    
+    # Add file_name and data to a dictionary which will then be printed out to text files
     spc_dict = {}
-   
-    file_in = sounding_file_dict["file_in"]
-    file_out = file_in.replace("Hgt", "SPC") + ".txt"  # create output file name
 
-    whole_file = ("%TITLE%" + "\n" + vehicle_header + "\n\n" + data_header + "\n"
-                  + "-------------------------------------------------------------------"
-                  + "\n" + "%RAW%" + "\n" + sounding_file_dict["data"] + "\n" + "%END%")
+    sounding = sounding_file_dict["sounding"]
+    file_out = sounding.file_in.replace("Hgt", "SPC") + ".txt"  # create output file name
+
+    spc_dict.update({file_out: (sounding, sounding_file_dict["data"])}) # append file name (key) and sounding and data (value) to dictionary
 
-    spc_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
-    
     return spc_dict
 
 #########################
@@ -337,50 +236,61 @@ def create_directory_out(directory_out):  # Check if directory exists, and if no
 #########################
     
 def write_to_spc_files(dictionary):  # Write dictionary items to files
-    for name, data in dictionary.items():
-        with open(os.path.join(directory_out, name), "w+") as f:
-            f.write(data)
+    for name, (sounding, data) in dictionary.items():
+        spc_writer.write_spc_file(os.path.join(directory_out, name), sounding, data)
              
-#############################################################################
-    
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
+#########################
 
-for file in files_to_process:
-    sounding_file_dict = parse_info_from_hgt_file(file)
-    spc_dict = output_to_spc_format(sounding_file_dict)
-    
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing), each from (code, value) or (code, value, bottom, top)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
     if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "Problem (Alt. Diff >= 5) = " + alt_diff_string
-        
-    h_flag_string = ""    
+        problems.append(("ALT_DIFF", alt_diff))
     if sounding_file_dict["h_flag_0"] and sounding_file_dict["h_flag_100"] == 4:
-        h_flag_string = "4 THROUGHOUT"
+        problems.append(("QH_FLAG_THROUGHOUT", None))
     elif sounding_file_dict["h_flag_0"] == 4 and sounding_file_dict["h_flag_100"] != 4:
-        h_flag_string = "4 INITIALLY"            
-    if h_flag_string != "":
-        problem += "Problem (QH Flag) = " + h_flag_string
-        
-    if sounding_file_dict["flag"] != "":
-        problem += "Problem = " + sounding_file_dict["flag"]
-                
-    if sounding_file_dict["missing"] != "":
-        problem += sounding_file_dict["missing"]
-
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-
-    # Write converted files to text files
+        problems.append(("QH_FLAG_INITIALLY", None))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    if sounding_file_dict["physical_qc_masked"] > 0:
+        problems.append(("PHYSICAL_QC_MASKED", sounding_file_dict["physical_qc_masked"]))
+    for gap in sounding_file_dict["pressure_gaps"]:
+        problems.append(("PRESSURE_GAP", gap["difference"], gap["bottom"], gap["top"]))
+        if gap["filled"] > 0:
+            problems.append(("PRESSURE_GAP_FILLED", gap["filled"], gap["bottom"], gap["top"]))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.info["file_name_date"], sounding.time, *problem) for problem in problems]
+
+#########################
+
+def get_qc_statistics(sounding_file_dict):  # Get the QC summary rows of the sounding's QC flags (none if it has no flags), see "sounding_utils/qc_summary.py"
+    sounding = sounding_file_dict["sounding"]
+    return qc_summary.get_flag_statistics(sounding.file_in, sounding.site, sounding.info["file_name_date"], sounding.time, sounding, "hgt")
+
+#########################
+
+def convert_file(file):  # Convert one "Hgt" file into its "SPC" file, and return its problem records and QC summary rows (see "sounding_utils/conversion_driver.py")
+    sounding_file_dict = parse_info_from_hgt_file(file)
+    spc_dict = output_to_spc_format(sounding_file_dict)
     write_to_spc_files(spc_dict)
+    return get_problems(sounding_file_dict), get_qc_statistics(sounding_file_dict)
+
+#############################################################################
+    
+if __name__ == "__main__":
+
+    workers = conversion_driver.get_workers("Convert \"Hgt\" sounding files into \"SPC\" files.")
+    files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
+
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems and QC summary rows to write once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers)
+
+    # Write the problem report and QC summary (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, (records, qc_rows) in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
+    if qc_summary_name != "":
+        summary_rows = [row for file, (records, qc_rows) in converted for row in qc_rows]
+        qc_summary.update_qc_summary(os.path.join(directory_out, qc_summary_name), summary_rows, files_to_process)
 
 #############################################################################
\ No newline at end of file
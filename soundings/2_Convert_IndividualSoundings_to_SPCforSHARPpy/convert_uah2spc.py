@@ -5,6 +5,9 @@
 ### PURPOSE:  To read in atmospheric sounding data from UAH, which is in its own format,
 #             and output into "SPC" file format, which SHARPpy can read and simulate.
 
+### USAGE:  python convert_uah2spc.py                (converts one file after another)
+#           python convert_uah2spc.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING UAH data needs to be in the format as shown below:
 
@@ -39,13 +42,30 @@
 ###############################################################################
 
 import os  # operating system library
-import pandas as pd  # pandas library for dictionary and data frames
+import numpy as np  # numpy library for arrays
 import re  # regular expressions library
-import math # math library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import spc_writer  # writes a Sounding in "SPC" file format
+from sounding_utils import uah_reader  # reads the data of UAH soundings into arrays, whichever column header format they have
+from sounding_utils.sounding import Sounding, format_values  # shared sounding data model
 
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Downloads/Soundings/VSE-2017/Data/UAH"  # location of UAH sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/VSE-2017/Data/UAH/SPC_Files"  # location to output "SPC" sounding data files
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files_UAH.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
+resample_by = ""  # resample the levels written to "SPC" files by "height" or "pressure" to the spacings in resample_bands (leave blank to write every level), see "sounding_utils/resample.py"
+resample_bands = [(1000, 10), (3000, 25), (10000, 50), (30000, 100)]  # (top, spacing) of each band of levels from the surface up: m above the first level and m for "height", or mb and mb for "pressure" (e.g. [(700, 2), (300, 5), (0, 10)])
+fill_gaps_below = 0  # fill the pressure gaps (drops of 20 mb or more between levels) smaller than this (mb) with levels interpolated in log pressure (0 to leave every gap as it is), see "sounding_utils/gap_fill.py"
+fill_gaps_spacing = 5  # pressure spacing (mb) of the levels filled into a gap
+physical_qc = False  # mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear before writing, see "sounding_utils/qc.py"
+physical_qc_thresholds = {}  # thresholds of the physical QC checks to use instead of the ones in "sounding_utils/qc.py" (e.g. {"temperature_spike": 2.0})
 invalid_value = "-9999"
 #########################
 
@@ -70,48 +90,56 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
     
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:        
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]           
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
-
-########################
-    
-def pressure_decreasing(pressure, index, p):    
-    lower = True
-    if invalid_value not in pressure:        
-        if index != 0:
-            previous_pressure = p[index - 1]            
-            if invalid_value in previous_pressure:
-                lower = pressure_decreasing(pressure, index -1, p)
-            else:
-                lower = pressure < previous_pressure                
-    return lower
-
-########################
-    
-def calculate_dewpoint(t_value, rh_value):
-    dewpoint = 243.04*(math.log(rh_value/100)+((17.625*t_value)/(243.04+t_value)))/(17.625-math.log(rh_value/100)-((17.625*t_value)/(243.04+t_value)))
-    return dewpoint
+def shows_invalid(values):  # Check which values show the invalid value once formatted to 2 decimal places (missing data is -9999.0)
+    return np.char.find(np.char.mod("%.2f", values), invalid_value) >= 0
+
+#########################
+
+def get_sounding(file_in, name, date, time, lat, lon, altitude, header, data):  # Get a Sounding of the pressure, height, temperature, dewpoint, wind direction and wind speed (kt), with missing data masked
+
+    sounding = Sounding(file_in, name, date, time, lat, lon, altitude)
+
+    # Standardize columns
+    height = data["height"]
+    pressure = data["pressure"]
+    temp = data["temperature"]
+    wspd = data["wind_speed"]
+    wdir = data["wind_direction"]
+    if header["height_agl"]:
+        height = height + altitude  # add initial altitude to height values
+
+    # Some files do not have dewpoint, so it needs to be calculated from RH
+    if "dewpoint" in data:
+        dwpt_or_rh = data["dewpoint"]
+        dwpt = dwpt_or_rh
+    else:
+        dwpt_or_rh = data["rh"]
+        dwpt = uah_reader.calculate_dewpoint(temp, dwpt_or_rh)
+
+    # Mask data if it is missing (-9999.0), and wind direction if wind speed is 0 (to 2 decimal places)
+    pressure_mask = shows_invalid(pressure)
+
+    # Correct some bad data as noted in the log notes
+    ## For VSE-2017
+    if file_in == "upperair.UAH_Sonde.201703271505.Huntsville_AL.txt" and len(pressure) > 0:
+        pressure = pressure.copy()
+        pressure[0] = 990.80  # launch pressure taken from 1700 sounding at this site, as it was previously incorrectly SL pressure
+        pressure_mask = np.ones(len(pressure), dtype=bool)
+        pressure_mask[0] = False
+        sounding.info["flags"] = ["BAD_PRESSURES"]
+
+    sounding.add_column("pressure", pressure, pressure_mask)
+    sounding.add_column("height", height, shows_invalid(height))
+    sounding.add_column("temperature", temp, shows_invalid(temp))
+    sounding.add_column("dewpoint", dwpt, shows_invalid(dwpt_or_rh))
+    sounding.add_column("wind_direction", wdir, shows_invalid(wdir) | (np.char.mod("%.2f", wspd).astype(float) == 0))
+    sounding.add_column("wind_speed", wspd, shows_invalid(wspd), "kt")
+    return sounding
 
 #########################
 
 def parse_info_from_uah_file(file_in):
 
-    print(file_in)  
-     
     # Extract site info from file name for both the "SPC" format site header and the new file name
     site_info = re.split(r'[_.\s]\s*', file_in)
  
@@ -141,253 +169,70 @@ def parse_info_from_uah_file(file_in):
 
     ########################
                                                                                                                 
-    # Different header formats exist, so extract data depending on which you have    
-    if "height (m MSL)"  in file_lines[2] and "dewpoint (deg C)" in file_lines[2] and "Calculated" in file_lines[2]:
-        col_headers = ["height (m MSL)", "pressure(mb)", "temp (deg C)", "dewpoint (deg C)", "Calculated wind speed (kts)", "Calculated wind direction (deg)"]
-    elif "height (m MSL)"  in file_lines[2] and "dewpoint (deg C)" in file_lines[2] and "Calculated" not in file_lines[2]:
-        col_headers = ["height (m MSL)", "pressure(mb)", "temp (deg C)", "dewpoint (deg C)", "wind speed (kts)", "wind direction (deg)"]
-    elif "height (m AGL)" in file_lines[2]:
-        col_headers = ["height (m AGL)", "pressure(mb)", "temp (deg C)", "dewpoint (deg C)", "wind speed (kts)", "wind direction (deg)"]
-    elif "height (m MSL)" in file_lines[2] and "dewpoint (deg C)" not in file_lines[2]:
-        col_headers = ["height (m MSL)", "pressure(mb)", "temp (deg C)", "RH (%)", "wind speed (kts)", "wind direction (deg)"]
-
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep=",", engine="python", header=2, skipfooter=1, usecols=col_headers).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Standardize column headers   
-    if "Calculated" in file_lines[2]:
-        data_df.columns = ["Height (masl)", "Pressure (mb)", "Temp (C)", "DWPT (C)", "WSPD (kts)", "WDIR (deg)"]
-    elif "height (m MSL)" in file_lines[2] and "dewpoint (deg C)" in file_lines[2] and "Calculated" not in file_lines[2]:
-        data_df.columns = ["Height (masl)", "Pressure (mb)", "Temp (C)", "DWPT (C)", "WSPD (kts)", "WDIR (deg)"]        
-    elif "height (m AGL)" in file_lines[2]:
-        data_df["height (m AGL)"] += altitude  # add initial altitude to height values
-        data_df.columns = ["Height (masl)", "Pressure (mb)", "Temp (C)", "DWPT (C)", "WSPD (kts)", "WDIR (deg)"]
-    # This is a complicated one that does not have dewpoint, so it needs to be calculated from RH
-    elif "height (m MSL)" in file_lines[2] and "dewpoint (deg C)" not in file_lines[2]:
-        data_df.columns = ["Height (masl)", "Pressure (mb)", "Temp (C)", "RH (%)", "WSPD (kts)", "WDIR (deg)"]
-        
-    # Get data into lists
-    h_list = data_df["Height (masl)"].values.tolist()
-    p_list = data_df["Pressure (mb)"].values.tolist()  
-    t_list = data_df["Temp (C)"].values.tolist()
-    ws_list = data_df["WSPD (kts)"].values.tolist() 
-    wd_list = data_df["WDIR (deg)"].values.tolist()
-    if "dewpoint (deg C)" in file_lines[2]:
-        dp_list = data_df["DWPT (C)"].values.tolist()
-    elif "dewpoint (deg C)" not in file_lines[2]:
-        rh_list = data_df["RH (%)"].values.tolist()
-        rh_temp = ["%.2f"%item for item in rh_list]
-        dp_list = []
-        for ind in range(len(data_df)):
-            dp_value = calculate_dewpoint(t_list[ind], rh_list[ind])
-            dp_list.append(dp_value)
-
-    ########################        
-        
-    # Format numbers to varying decimal places
-    p_temp = ["%.2f"%item for item in p_list]    
-    h_temp = ["%.2f"%item for item in h_list]
-    t_temp = ["%.2f"%item for item in t_list]
-    dp_temp = ["%.2f"%item for item in dp_list]
-    wd_temp = ["%.2f"%item for item in wd_list]
-    ws_temp = ["%.2f"%item for item in ws_list] 
-    
-    # Create new variables and put in good data
-    p = []
-    h = []
-    t = []
-    dp = []
-    wd = []
-    ws = []
-    flag = ""
-    for ind in range(len(data_df)):
-        
-        # Correct some bad data as noted in the log notes
-        ## For VSE-2017
-        if file_in == "upperair.UAH_Sonde.201703271505.Huntsville_AL.txt":
-            if ind == 0:
-                p_temp[0] = "990.80" # launch pressure taken from 1700 sounding at this site, as it was previously incorrectly SL pressure
-            else:
-                p_temp[ind] = invalid_value
-            flag = "BAD PRESSURES"
-            
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = invalid_value
-                
-        # Add "-9999" if data is missing (-9999.0)
-        if invalid_value in p_temp[ind]:
-            p.append("{0:>8s}".format(invalid_value))
-        else:
-            p.append("{0:>8s}".format(str(p_temp[ind])))
-            
-        if invalid_value in h_temp[ind]:
-            h.append("{0:>10s}".format(invalid_value))
-        else:
-            h.append("{0:>10s}".format(str(h_temp[ind])))        
-            
-        if invalid_value in t_temp[ind]:
-            t.append("{0:>10s}".format(invalid_value))
-        else:
-            t.append("{0:>10s}".format(str(t_temp[ind])))
-            
-        if "dewpoint (deg C)" in file_lines[2]:
-            if invalid_value in dp_temp[ind]:
-                dp.append("{0:>10s}".format(invalid_value))
-            else:
-                dp.append("{0:>10s}".format(str(dp_temp[ind])))  
-        elif "dewpoint (deg C)" not in file_lines[2]:
-            if invalid_value in rh_temp[ind]:
-                dp.append("{0:>10s}".format(invalid_value))
-            else:
-                dp.append("{0:>10s}".format(str(dp_temp[ind])))
-                
-        if invalid_value in wd_temp[ind]:
-            wd.append("{0:>10s}".format(invalid_value))
-        else:
-            wd.append("{0:>10s}".format(str(wd_temp[ind])))
-            
-        if invalid_value in ws_temp[ind]:
-            ws.append("{0:>10s}".format(invalid_value))
-        else:
-            ws.append("{0:>10s}".format(str(ws_temp[ind])))
-            
+    # Extract data header and data (from the parsed sounding cache, if it is there), and mask missing data
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "uah_reader", uah_reader.parser_version, uah_reader.read_uah_sounding)
+    sounding = get_sounding(file_in, name, date, time, lat, lon, altitude, header, data)
+    sounding.info["inst_id"] = inst_id
+    sounding.info["location"] = location
+    sounding.info["file_name_date"] = file_name_date
+
     ########################
 
-    # Check if pressure values are decreasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        lower = pressure_decreasing(p[index], index, p)
-    
-        if not lower:
-            p[index] = "{0:>10s}".format(invalid_value)
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-
-    # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            p[index] = "{0:>10s}".format(invalid_value)
-            h[index] = "{0:>10s}".format(invalid_value)
-            t[index] = "{0:>10s}".format(invalid_value)
-            dp[index] = "{0:>10s}".format(invalid_value)
-            wd[index] = "{0:>10s}".format(invalid_value)
-            ws[index] = "{0:>10s}".format(invalid_value)
-            
+    # Check if pressure values are decreasing, and if height values are increasing, and if not, make values -9999
+    qc.mask_pressure_not_decreasing(sounding, ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+    qc.mask_height_not_increasing(sounding, ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"])
+
     # Sometimes the last wind value is super funky, so check it and make ws and wd -9999 if necessary
-    for ind in range(len(data_df)):
-        if ind == (len(data_df)-1):
-            wind = ws[ind]
-            previous_wind = ws[ind-1]
-            if wind > previous_wind * 3:
-                ws[ind] = "{0:>10s}".format(invalid_value)
-                wd[ind] = "{0:>10s}".format(invalid_value)
-            
+    ws = format_values(sounding.values("wind_speed")[-2:], 2, 10).tolist()
+    if ws != []:
+        wind = ws[-1]
+        previous_wind = ws[0]
+        if wind > previous_wind * 3:
+            sounding.mask_levels([len(sounding) - 1], ["wind_speed", "wind_direction"])
+
     ########################
 
-    # Put the data together  
-    spc_data_list = []  # create empty list to fill with correctly spaced data    
-
-    for ind in range(len(data_df)):
-        if "-9999" in p[ind]:
-            continue
-        if p[ind] == p[ind-1]:
-            continue
-        pressure = p[ind]
-        height = h[ind]
-        temp = t[ind]
-        dwpt = dp[ind]
-        wdir = wd[ind]
-        wspd = ws[ind]   
-        
-        spc_string = "{},{},{},{},{},{}".format(pressure, height, temp, dwpt, wdir, wspd)  # create the new string for each row
-        spc_data_list.append(spc_string)  # add each row into the new list    
-       
-    spc_data = "\n".join(spc_data_list)  # join all the elements together again into a string
+    # Mask temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear
+    physical_qc_masked = 0
+    if physical_qc:
+        physical_qc_masked = qc.mask_physical_outliers(sounding, physical_qc_thresholds)
 
-    #########################
-        
-    # Get info that could be problematic 
-    if spc_data_list != []:
-        h_line = spc_data_list[0].split()
-        h_init = float(h_line[1].strip(","))
-    else:
-        h_init = altitude
-        flag += "FILE COMPLETELY EMPTY"
-        
-    # Add a problem flag if the pressure difference is > 20mb
-    missing_interpolated = ""    
-    pressure = []
-    for ind in range(len(spc_data_list)):
-        line = spc_data_list[ind].split()
-        pressure.append(float(line[0].strip(",")))
-     
-    for ind in range(len(pressure)):
-        if ind != 0:
-            pressure_current = pressure[ind]
-            pressure_previous = pressure[ind-1]
-            pressure_diff = pressure_current - pressure_previous
-            if pressure_diff <= -20:
-                diff_string = '{:.1f}'.format(pressure_diff)
-                missing_interpolated += "PROBLEM (Missing/Interpolated) = " + "Diff: " + diff_string
+    ########################
+
+    # Put the data together
+    spc_data, h_init, pressure_gaps = spc_writer.get_spc_data(sounding, resample_by, resample_bands, fill_gaps_below, fill_gaps_spacing)
+
+    # Get info that could be problematic
+    flags = sounding.info.get("flags", [])
+    if spc_data == "":
+        flags.append("FILE_EMPTY")
 
     ########################
-        
+
     # Add relevant information to a dictionary
     sounding_file_dict = {}
-    
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["inst_id"] = inst_id
-    sounding_file_dict["location"] = location
-    sounding_file_dict["site_name"] = name
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["file_name_date"] = file_name_date
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
-    sounding_file_dict["missing"] = missing_interpolated
+    sounding_file_dict["flags"] = flags
+    sounding_file_dict["physical_qc_masked"] = physical_qc_masked
+    sounding_file_dict["pressure_gaps"] = pressure_gaps
     sounding_file_dict["data"] = spc_data
-     
+
     return sounding_file_dict
 
 #########################
 
 def output_to_spc_format(sounding_file_dict):
 
-    # Construct site header
-    site_header = " {}   {}/{} {},{}".format(sounding_file_dict["site_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"])
-
-    # Construct data header in "SPC" format
-    pressure = "LEVEL"
-    height = "HGHT"
-    temp = "TEMP"
-    dwpt = "DWPT"
-    wdir = "WDIR"
-    wspd = "WSPD"
-
-    data_header = "   {}       {}       {}       {}       {}       {}".format(pressure, height, temp, dwpt, wdir, wspd)
-
-    ########################
-                                                                                                                
     # Add file_name and data to a dictionary which will then be printed out to text files
     spc_dict = {}
-  
-    file_out = "SPC_{}_{}_{}_{}.txt".format(sounding_file_dict["inst_id"], sounding_file_dict["location"], sounding_file_dict["file_name_date"], sounding_file_dict["time"])  # create output file name
 
-    whole_file = ("%TITLE%" + "\n" + site_header + "\n\n" + data_header + "\n"
-                  + "-------------------------------------------------------------------"
-                  + "\n" + "%RAW%" + "\n" + sounding_file_dict["data"] + "\n" + "%END%")
+    sounding = sounding_file_dict["sounding"]
+    file_out = "SPC_{}_{}_{}_{}.txt".format(sounding.info["inst_id"], sounding.info["location"], sounding.info["file_name_date"], sounding.time)  # create output file name
+
+    spc_dict.update({file_out: (sounding, sounding_file_dict["data"])}) # append file name (key) and sounding and data (value) to dictionary
 
-    spc_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
-    
     return spc_dict
 
 #########################
@@ -399,42 +244,48 @@ def create_directory_out(directory_out):  # Check if directory exists, and if no
 #########################
     
 def write_to_spc_files(dictionary):  # Write dictionary items to files
-    for name, data in dictionary.items():
-        with open(os.path.join(directory_out, name), "w+") as f:
-            f.write(data)
+    for name, (sounding, data) in dictionary.items():
+        spc_writer.write_spc_file(os.path.join(directory_out, name), sounding, data)
              
-#############################################################################
-    
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
+#########################
+
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing), each from (code, value) or (code, value, bottom, top)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
+    if alt_diff >= 5:
+        problems.append(("ALT_DIFF", alt_diff))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    if sounding_file_dict["physical_qc_masked"] > 0:
+        problems.append(("PHYSICAL_QC_MASKED", sounding_file_dict["physical_qc_masked"]))
+    for gap in sounding_file_dict["pressure_gaps"]:
+        problems.append(("PRESSURE_GAP", gap["difference"], gap["bottom"], gap["top"]))
+        if gap["filled"] > 0:
+            problems.append(("PRESSURE_GAP_FILLED", gap["filled"], gap["bottom"], gap["top"]))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.info["file_name_date"], sounding.time, *problem) for problem in problems]
 
-for file in files_to_process:
+#########################
+
+def convert_file(file):  # Convert one UAH file into its "SPC" file, and return its problem records (see "sounding_utils/conversion_driver.py")
     sounding_file_dict = parse_info_from_uah_file(file)
     spc_dict = output_to_spc_format(sounding_file_dict)
-
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
-    if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "Problem (Alt. Diff >= 5) = " + alt_diff_string
-         
-    if sounding_file_dict["flag"] != "":
-        problem += "Problem (Flag) = " + sounding_file_dict["flag"]
-        
-    if sounding_file_dict["missing"] != "":
-        problem += sounding_file_dict["missing"]
-
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files_UAH.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-           
-    # Write converted files to text files
     write_to_spc_files(spc_dict)
+    return get_problems(sounding_file_dict)
+
+#############################################################################
+    
+if __name__ == "__main__":
+
+    workers = conversion_driver.get_workers("Convert UAH sounding files into \"SPC\" files.")
+    files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
+
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems to write to the problem report once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers)
+
+    # Write the problem report (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, records in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
 
 #############################################################################
\ No newline at end of file
@@ -4,6 +4,9 @@
 
 ### PURPOSE:  To extract U and V wind components from "EOL" formatted files as produced by other institutions
 
+### USAGE:  python extract_eol2uv.py                (converts one file after another)
+#           python extract_eol2uv.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING data needs to be in the "EOL" file format as shown below:
 
@@ -50,14 +53,26 @@
 ###############################################################################
 
 import os  # operating system library
-import pandas as pd  # pandas library for dictionary and data frames
 import re  # regular expressions library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import cls_reader  # reads soundings straight from indexed "CLS" files
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import eol_reader  # reads the header and data of "EOL" soundings into arrays
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import uv_writer  # writes a Sounding as a "UV" text file
+from sounding_utils.sounding import format_values  # formats columns with masked values as the invalid value
 
 ###### UPDATE THIS ######
 project = "RELAMPAGO"
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/EOL_Files"  # location of "EOL" sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/UV_Files"  # location to output "UV" text files
-invalid_value = "-9999"
+cls_directory_in = ""  # location of indexed "CLS" files to read soundings from directly (leave blank to read the "EOL" files in directory_in)
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
 #########################
 
 def get_files_from_directory(directory_in):
@@ -73,6 +88,8 @@ def get_files_from_directory(directory_in):
 #########################
 
 def open_file_and_split_into_lines(file_in):    
+    if cls_directory_in != "":  # read a "virtual" EOL file straight from its byte range in the "CLS" file
+        return cls_reader.read_virtual_eol_file(virtual_eol_files, file_in)
     file_lines = []
     with open (os.path.join(directory_in, file_in), "r") as myfile:
         for file_line in myfile:          
@@ -81,28 +98,13 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
 
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:       
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]            
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
+def parse_info_from_eol_file(file_in):
+    file_lines = open_file_and_split_into_lines(file_in)
+    return parse_info_from_eol_lines(file_in, file_lines)
 
 #########################
 
-def parse_info_from_eol_file(file_in):
-    
-    print(file_in)
+def parse_info_from_eol_lines(file_in, file_lines):  # Parse the lines of one sounding, named by its "EOL" file name (also used by the fused split in stage 1)
     
     # Extract site info for site header from file name, and construct into "UV" format
     site_info = re.split(r'[_.\s]\s*', file_in)
@@ -126,215 +128,60 @@ def parse_info_from_eol_file(file_in):
         date = site_info[4]
         time = site_info[5]
      
-    # Get lat and lon
-    file_lines = open_file_and_split_into_lines(file_in)
-    latlon = file_lines[3].split()
-    lat = ""
-    lon = ""
-    for i, v in enumerate(latlon):
-        if i == 7:
-            ln = float(v.strip(","))
-            lon = '{:.5f}'.format(ln)
-        if i == 8:
-            lt = float(v.strip(","))
-            lat = '{:.5f}'.format(lt)
-            
-    # Get initial altitude
-    alt_line = file_lines[3].replace(" ","").split(",")
-    altitude = float(alt_line[6].rstrip())
-    
-    #########################
-    
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep="\s{1,}", engine="python", header=12, skiprows=[13,14], usecols=["Time", "Alt", "spd", "dir", "Ucmp", "Vcmp", "Qp", "Qu", "Qv"]).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Format numbers to varying decimal places and get other data into lists
-    h_temp = ["%.1f"%item for item in data_df["Alt"].values.tolist()]
-    ws_temp = ["%.1f"%item for item in data_df["spd"].values.tolist()]
-    wd_temp = ["%.1f"%item for item in data_df["dir"].values.tolist()]
-    u_temp = ["%.1f"%item for item in data_df["Ucmp"].values.tolist()]
-    v_temp = ["%.1f"%item for item in data_df["Vcmp"].values.tolist()]
-    time_temp = data_df["Time"].values.tolist()
-    qp_temp = data_df["Qp"].values.tolist()
-    qu_temp = data_df["Qu"].values.tolist()
-    qv_temp = data_df["Qv"].values.tolist()
-    
-    # Create new variables, put in good data, and replace bad data values with invalid value: "-9999"
-    h = []
-    ws = []
-    wd = []
-    u = []
-    v = []      
-    for ind in range(len(data_df)):
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = invalid_value
-            
-        # Get initial values (sometimes these are flagged bad, but then this invalidates all initial conditions)  
-        if ind == 0:
-            if time_temp[ind] < 0:
-                h.append("{0:>8s}".format(invalid_value))
-                ws.append("{0:>11s}".format(invalid_value))
-                wd.append("{0:>8s}".format(invalid_value))
-                u.append("{0:>6s}".format(invalid_value))
-                v.append("{0:>7s}".format(invalid_value))
-
-            if time_temp[ind] >= 0:
-                h.append("{0:>8s}".format(str(h_temp[ind])))  # this is the only one that usually has a value
-
-            # If values are not missing, retain those values     
-            if time_temp[ind] >= 0 and "999" not in ws_temp[ind]:
-                ws.append("{0:>11s}".format(str(ws_temp[ind])))  
-                
-            if time_temp[ind] >= 0 and wd_temp[ind] == invalid_value:
-                wd.append("{0:>8s}".format(str(wd_temp[ind])))                    
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" not in wd_temp[ind]:
-                wd.append("{0:>8s}".format(str(wd_temp[ind])))
-                
-            if time_temp[ind] >= 0 and "9999" not in u_temp[ind]:
-                u.append("{0:>6s}".format(str(u_temp[ind])))
-                
-            if time_temp[ind] >= 0 and "9999" not in v_temp[ind]:
-                v.append("{0:>7s}".format(str(v_temp[ind])))  
-                
-            # If values are missing, get the next values for the initial conditions, unless they still have bad values
-            if time_temp[ind] >= 0 and "999" in ws_temp[ind] and "999" not in ws_temp[ind+1]:
-                ws.append("{0:>11s}".format(str(ws_temp[ind+1])))
-            if time_temp[ind] >= 0 and "999" in ws_temp[ind] and "999" in ws_temp[ind+1]:
-                ws.append("{0:>11s}".format(invalid_value))
-                
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" in wd_temp[ind] and "999" not in wd_temp[ind+1]:
-                wd.append("{0:>8s}".format(str(wd_temp[ind+1])))
-            if time_temp[ind] >= 0 and wd_temp[ind] != invalid_value and "999" in wd_temp[ind] and "999" in wd_temp[ind+1]:
-                wd.append("{0:>8s}".format(invalid_value))
-                
-            if time_temp[ind] >= 0 and "9999" in u_temp[ind] and "9999" not in u_temp[ind+1]:
-                u.append("{0:>6s}".format(str(u_temp[ind+1])))
-            if time_temp[ind] >= 0 and "9999" in u_temp[ind] and "9999" in u_temp[ind+1]:
-                u.append("{0:>6s}".format(invalid_value)) 
-                                 
-            if time_temp[ind] >= 0 and "9999" in v_temp[ind] and "9999" not in v_temp[ind+1]:
-                v.append("{0:>7s}".format(str(v_temp[ind+1])))
-            if time_temp[ind] >= 0 and "9999" in v_temp[ind] and "9999" in v_temp[ind+1]:
-                v.append("{0:>7s}".format(invalid_value)) 
-                
-        # For the rest of the data, add "invalid value" (-9999) if QC flags are missing (9) or bad (3)
-        elif ind != 0:
-            if qp_temp[ind] == 9 or qp_temp[ind] == 3 or "99999" in h_temp[ind]:
-                h.append("{0:>8s}".format(invalid_value))
-            else:
-                h.append("{0:>8s}".format(str(h_temp[ind])))
-                                
-            if qu_temp[ind] == 9 or qu_temp[ind] == 3 or qv_temp[ind] == 9 or qv_temp[ind] == 3:
-                ws.append("{0:>11s}".format(invalid_value))
-                wd.append("{0:>8s}".format(invalid_value))
-            else:
-                ws.append("{0:>11s}".format(str(ws_temp[ind])))
-                wd.append("{0:>8s}".format(str(wd_temp[ind])))
-            
-            if qu_temp[ind] == 9 or qu_temp[ind] == 3:
-                u.append("{0:>6s}".format(invalid_value))
-            else:
-                u.append("{0:>6s}".format(str(u_temp[ind])))            
-            
-            if qv_temp[ind] == 9 or qv_temp[ind] == 3:
-                v.append("{0:>7s}".format(invalid_value))
-            else:
-                v.append("{0:>7s}".format(str(v_temp[ind])))
-                                    
-    ########################                
+    # Get lat, lon and initial altitude, and the data as float arrays, one for each column (from the parsed sounding cache, if it is there)
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "eol_reader", eol_reader.parser_version, eol_reader.read_eol_sounding)
+
+    # Mask bad or missing data, using the QC flags
+    sounding = eol_reader.get_uv_sounding(file_in, name, date, time, header, data)
+
+    ########################
 
     # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            h[index] = "{0:>8s}".format(invalid_value)
-            ws[index] = "{0:>11s}".format(invalid_value)
-            wd[index] = "{0:>8s}".format(invalid_value)
-            u[index] = "{0:>6s}".format(invalid_value)
-            v[index] = "{0:>7s}".format(invalid_value)
-            
-    ######################## 
-    
-    # Put the data together    
-    uv_data_list = []  # create empty list to fill with correctly spaced data
-   
-    for ind in range(len(data_df)):
-        if "-9999" in h[ind]:
-            continue
-        if h[ind] == h[ind-1]:
-            continue
-        height = h[ind]
-        wspd = ws[ind]
-        wdir = wd[ind]
-        u_wind = u[ind]
-        v_wind = v[ind]
-            
-        uv_string = "{} {} {} {} {}".format(height, wspd, wdir, u_wind, v_wind)  # create the new string for each row
-        uv_data_list.append(uv_string)  # add each row into the new list
-     
-    uv_data = "\n".join(uv_data_list)  # join all the elements together again into a string
-    
+    qc.mask_height_not_increasing(sounding, ["height", "wind_speed", "wind_direction", "u", "v"], 1, 8)
+
+    ########################
+
+    # Format numbers to 1 decimal place (masked values as invalid value: "-9999"), and put the data together
+    h = format_values(sounding.values("height"), 1, 8)
+    ws = format_values(sounding.values("wind_speed"), 1, 11)
+    wd = format_values(sounding.values("wind_direction"), 1, 8)
+    u = format_values(sounding.values("u"), 1, 6)
+    v = format_values(sounding.values("v"), 1, 7)
+    uv_data, h_init = uv_writer.get_uv_data(sounding, [h, ws, wd, u, v])
+
     #########################
 
     # Get info that could be problematic
-    flag = ""
-    if uv_data_list != []:
-        h_line = uv_data_list[0].split()
-        h_init = float(h_line[0])
-    else:
-        h_init = altitude
-        flag = "FILE COMPLETELY EMPTY"
-        
+    flags = []
+    if uv_data == "":
+        flags.append("FILE_EMPTY")
+
     # Add relevant information to a dictionary
     sounding_file_dict = {}
-    
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["site_name"] = name
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
+    sounding_file_dict["flags"] = flags
     sounding_file_dict["data"] = uv_data
-    
+
     return sounding_file_dict
 
 #########################
     
-def output_to_uv_format(sounding_file_dict):
-    
-    # Construct site header
-    site_header = ("Project: " + "\t\t\t\t{}" + "\n" + "Platform ID/Location: " + "\t{}" + "\n" + "Date/Time (UTC): " + "\t\t{}/{}" + "\n" + "Latitude/Longitude: " + "\t{}/{}" + "\n" 
-                   + "Altitude (masl): " + "\t\t{}").format(project, sounding_file_dict["site_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"], sounding_file_dict["alt"])
-
-    # Construct data header
-    height = "HEIGHT(masl)"
-    wspd = "WSPD(m/s)"
-    wdir = "WDIR"
-    u_header = "U(m/s)"
-    v_header = "V(m/s)"
-    
-    data_header = "{}  {}  {}  {}  {}".format(height, wspd, wdir, u_header, v_header)
-    
-    #########################
-    
+def output_to_uv_format(sounding_file_dict, project):
+
     # Add file_name and data to a dictionary which will then be printed out to text files
     uv_dict = {}
-  
-    file_in = sounding_file_dict["file_in"]
-    file_out = file_in.replace("EOL", "UV")  # create output file name
-    
-    whole_file = site_header + "\n" + "---------------------------------------------" + "\n" + data_header + "\n" + sounding_file_dict["data"]
+
+    sounding = sounding_file_dict["sounding"]
+    file_out = sounding.file_in.replace("EOL", "UV")  # create output file name
+
+    whole_file = uv_writer.get_whole_file(sounding, project, sounding_file_dict["data"])
 
     uv_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
-           
+
     return uv_dict
-    
+
 #########################
        
 def create_directory_out(directory_out):  # Check if directory exists, and if not, make it
@@ -343,40 +190,55 @@ def create_directory_out(directory_out):  # Check if directory exists, and if no
 
 #########################
     
-def write_to_uv_files(dictionary):  # Write dictionary (uv_dict) items to files
+def write_to_uv_files(dictionary, directory_out):  # Write dictionary (uv_dict) items to files
     for name, data in dictionary.items():
         with open(os.path.join(directory_out, name), "w+") as f:
             f.write(data)
-                         
+
+#########################
+
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
+    if alt_diff >= 5:
+        problems.append(("ALT_DIFF", alt_diff))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.date, sounding.time, code, value) for code, value in problems]
+
+#########################
+
+def convert_file(file):  # Convert one "EOL" file into its "UV" file, and return its problem records (see "sounding_utils/conversion_driver.py")
+    sounding_file_dict = parse_info_from_eol_file(file)
+    uv_dict = output_to_uv_format(sounding_file_dict, project)
+    write_to_uv_files(uv_dict, directory_out)
+    return get_problems(sounding_file_dict)
+
+#########################
+
+def set_virtual_eol_files(eol_files):  # Set the virtual "EOL" files to read from the "CLS" files (run in each worker process too)
+    global virtual_eol_files
+    virtual_eol_files = eol_files
+
 #############################################################################
     
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
+if __name__ == "__main__":
 
-for file in files_to_process:
-    sounding_file_dict = parse_info_from_eol_file(file)
-    uv_dict = output_to_uv_format(sounding_file_dict)
+    workers = conversion_driver.get_workers("Convert \"EOL\" sounding files into \"UV\" files.")
+    virtual_eol_files = {}
+    if cls_directory_in != "":
+        virtual_eol_files = cls_reader.get_virtual_eol_files(cls_directory_in)
+        files_to_process = list(virtual_eol_files.keys())
+    else:
+        files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
 
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
-    if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "Problem (Alt. Diff >= 5) = " + alt_diff_string
-        
-    if sounding_file_dict["flag"] != "":
-        problem += "Problem = " + sounding_file_dict["flag"]
-        
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-           
-    # Write converted files to text files    
-    write_to_uv_files(uv_dict)
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems to write to the problem report once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers, set_virtual_eol_files, (virtual_eol_files,))
+
+    # Write the problem report (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, records in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
 
 #############################################################################
\ No newline at end of file
@@ -4,6 +4,9 @@
 
 ### PURPOSE:  To extract U and V wind components from CSWR "HGT" formatted files.
 
+### USAGE:  python extract_hgt2uv.py                (converts one file after another)
+#           python extract_hgt2uv.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING data needs to be in the "HGT" file format as shown below:
 
@@ -42,16 +45,31 @@
 
 ###############################################################################
 
+import io  # input/output library
 import os  # operating system library
+import numpy as np  # numpy library for arrays
 import pandas as pd  # pandas library for dictionary and data frames
 import re  # regular expressions library
-import math  # math library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import uv_writer  # writes a Sounding in "UV" file format
+from sounding_utils.sounding import Sounding, format_values  # shared sounding data model
 
 ###### UPDATE THIS ######
 project = "RELAMPAGO"
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/HGT_Files"  # location of "HGT" sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/UV_Files"  # location to output "UV" text files
-invalid_value = "-9999"
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
+#########################
+
+parser_version = 1  # version of what read_hgt_data returns (see "parse_cache.py"), change it whenever that changes
+
 #########################
 
 def get_files_from_directory(directory_in):
@@ -75,28 +93,39 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
 
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:       
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]            
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
+def read_hgt_data(file_lines):  # Get the data columns of a "Hgt" file as float arrays (the header values are read from the lines)
+
+    data_df = pd.read_csv(io.StringIO("".join(file_lines)), sep="\s{1,}", engine="python", header=3, usecols=["HT", "SPD", "DIR", "QH", "QW"]).astype(float)
+    data = {}
+    for column in data_df.columns:
+        data[column] = data_df[column].to_numpy()
+    return {}, data
 
 #########################
-    
-def parse_info_from_hgt_file(file_in):
 
-    print(file_in)  
+def get_sounding(file_in, vehicle, date, time, lat, lon, altitude, data):  # Get a Sounding of the height, wind speed (m/s), wind direction, u and v, with bad or missing data masked using the QC flags
+
+    sounding = Sounding(file_in, vehicle, date, time, lat, lon, altitude)
+    for flag in ["QH", "QW"]:
+        sounding.add_flags(flag, data[flag])
+
+    # Calculate u and v (0 if wind speed is 0, to 1 decimal place)
+    wind_zero = np.char.mod("%.1f", data["SPD"]).astype(float) == 0
+    u = np.where(wind_zero, 0.0, -data["SPD"] * np.sin(np.radians(data["DIR"])))
+    v = np.where(wind_zero, 0.0, -data["SPD"] * np.cos(np.radians(data["DIR"])))
+
+    # Mask data if QC flags are missing (9), visually bad (5), or objectively bad (4), and wind direction if wind speed is 0
+    wind_bad = np.isin(data["QW"], (4, 5, 9))
+    sounding.add_column("height", data["HT"], np.isin(data["QH"], (4, 5, 9)))
+    sounding.add_column("wind_speed", data["SPD"], wind_bad, "m/s")
+    sounding.add_column("wind_direction", data["DIR"], wind_bad | (data["SPD"] == 0))
+    sounding.add_column("u", u, wind_bad, "m/s")
+    sounding.add_column("v", v, wind_bad, "m/s")
+    return sounding
+
+#########################
+
+def parse_info_from_hgt_file(file_in):
 
     # Extract site info for site header from file name, and construct into "UV" format
     vehicle_info = re.split(r'[_.\s]\s*', file_in)
@@ -127,122 +156,44 @@ def parse_info_from_hgt_file(file_in):
 
     ########################
 
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep="\s{1,}", engine="python", header=3, usecols=["HT", "SPD", "DIR", "QH", "QW"]).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Convert variables to list
-    h_temp = ["%.1f"%item for item in data_df["HT"].values.tolist()]
-    ws_temp = data_df["SPD"].values.tolist()
-    wd_temp = data_df["DIR"].values.tolist()
-    u_temp = [float(invalid_value)] * len(ws_temp)
-    v_temp = [float(invalid_value)] * len(ws_temp)
-       
-    # Create new variables, put in good data, and replace bad data values with invalid value: "-9999"
-    h = []
-    ws = []
-    wd = []
-    u = []
-    v = []     
-    for ind in range(len(data_df)):
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = float(invalid_value)
-            
-        # Add "-9999" if QC flags are missing (9), visually bad (5), or objectively bad (4)
-        if data_df["QH"][ind] == 9 or data_df["QH"][ind] == 5 or data_df["QH"][ind] == 4:
-            h.append("{:>8}".format(invalid_value))
-        else:
-            h.append("{:>8}".format(str(h_temp[ind])))
-            
-        if data_df["QW"][ind] == 9 or data_df["QW"][ind] == 5 or data_df["QW"][ind] == 4:
-            ws.append("{:>11}".format(invalid_value))
-            wd.append("{:>8}".format(invalid_value))
-        else:
-            ws_value = '{:.1f}'.format(ws_temp[ind])
-            ws.append("{:>11}".format(str(ws_value)))
-            wd_value = '{:.1f}'.format(wd_temp[ind])
-            wd.append("{:>8}".format(str(wd_value)))
-
-    # Calculate u and v
-    for ind in range(len(ws_temp)):
-        # If wind speed is 0, set u and v to 0 also
-        if float(ws[ind]) == 0.0 and (data_df["QW"][ind] != 9 or data_df["QW"][ind] != 5 or data_df["QW"][ind] != 4):
-            u.append("{:>6}".format(str("0.00")))
-            v.append("{:>7}".format(str("0.00")))        
-        # Otherwise continue to add flags
-        elif float(ws[ind]) != 0.0 and (data_df["QW"][ind] == 9 or data_df["QW"][ind] == 5 or data_df["QW"][ind] == 4):
-            u.append("{:>6}".format(invalid_value))
-            v.append("{:>7}".format(invalid_value))
-        else:
-            u_value = -ws_temp[ind] * math.sin(math.radians(wd_temp[ind]))
-            u_temp[ind] = '{:.2f}'.format(u_value)
-            u.append("{:>6}".format(str(u_temp[ind])))
-
-            v_value = -ws_temp[ind] * math.cos(math.radians(wd_temp[ind]))
-            v_temp[ind] = '{:.2f}'.format(v_value)
-            v.append("{:>7}".format(str(v_temp[ind])))
+    # Extract data header and data (from the parsed sounding cache, if it is there), and mask bad or missing data, using the QC flags
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "extract_hgt2uv.read_hgt_data", parser_version, read_hgt_data)
+    sounding = get_sounding(file_in, vehicle, date, time, lat, lon, altitude, data)
 
     #########################
     
     # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            h[index] = "{0:>8s}".format(invalid_value)
-            ws[index] = "{0:>11s}".format(invalid_value)
-            wd[index] = "{0:>8s}".format(invalid_value)
-            u[index] = "{0:>6s}".format(invalid_value)
-            v[index] = "{0:>7s}".format(invalid_value)
-            
+    qc.mask_height_not_increasing(sounding, ["height", "wind_speed", "wind_direction", "u", "v"], 1, 8)
+        
     ######################## 
     
-    # Put the data together
-    uv_data_list = []  # create empty list to fill with correctly spaced data
-   
-    for ind in range(len(data_df)):
-        if "-9999" in h[ind]:
-            continue
-        if h[ind] == h[ind-1]:
-            continue
-        height = h[ind]
-        wspd = ws[ind]
-        wdir = wd[ind]
-        u_wind = u[ind]
-        v_wind = v[ind]
-            
-        uv_string = "{} {} {} {} {}".format(height, wspd, wdir, u_wind, v_wind)  # create the new string for each row
-        uv_data_list.append(uv_string)  # add each row into the new list
-
-    uv_data = "\n".join(uv_data_list)  # join all the elements together again into a string
+    # Format numbers (masked values as invalid value: "-9999"), and put the data together
+    h = format_values(sounding.values("height"), 1, 8)
+    ws = format_values(sounding.values("wind_speed"), 1, 11)
+    wd = format_values(sounding.values("wind_direction"), 1, 8)
+    wd[sounding.masks["wind_direction"] & ~sounding.masks["wind_speed"]] = "{:>8}".format("-9999.0")  # wind direction of 0 wind speed has always been written as -9999.0
+    u = format_values(sounding.values("u"), 2, 6)
+    v = format_values(sounding.values("v"), 2, 7)
+    uv_data, h_init = uv_writer.get_uv_data(sounding, [h, ws, wd, u, v])
 
     #########################
 
     # Get info that could be problematic
-    flag = ""
-    if uv_data_list != []:
-        h_line = uv_data_list[0].split()
-        h_init = float(h_line[0])
-    else:
-        h_init = altitude
-        flag = "FILE COMPLETELY EMPTY"
+    flags = []
+    if uv_data == "":
+        flags.append("FILE_EMPTY")
         
-    h_flag_0 = data_df["QH"][0]
-    h_flag_100 = data_df["QH"][100]
+    # QH flags of the first and 101st levels (None if the sounding is too short to have them)
+    h_flags = sounding.flags["QH"]
+    h_flag_0 = h_flags[0] if len(h_flags) > 0 else None
+    h_flag_100 = h_flags[100] if len(h_flags) > 100 else None
    
     # Add relevant information to a dictionary
     sounding_file_dict = {}
     
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["vehicle_name"] = vehicle
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
+    sounding_file_dict["flags"] = flags
     sounding_file_dict["h_flag_0"] = h_flag_0
     sounding_file_dict["h_flag_100"] = h_flag_100
     sounding_file_dict["data"] = uv_data
@@ -253,28 +204,13 @@ def parse_info_from_hgt_file(file_in):
 
 def output_to_uv_format(sounding_file_dict):
 
-    # Construct site header
-    vehicle_header = ("Project: " + "\t\t\t\t{}" + "\n" + "Platform ID/Location: " + "\t{}" + "\n" + "Date/Time (UTC): " + "\t\t{}/{}" + "\n" + "Latitude/Longitude: " + "\t{}/{}" + "\n" 
-                   + "Altitude (masl): " + "\t\t{}").format(project, sounding_file_dict["vehicle_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"], sounding_file_dict["alt"])
-
-    # Construct data header
-    height = "HEIGHT(masl)"
-    wspd = "WSPD(m/s)"
-    wdir = "WDIR"
-    u_header = "U(m/s)"
-    v_header = "V(m/s)"
-    
-    data_header = "{}  {}  {}  {}  {}".format(height, wspd, wdir, u_header, v_header)
-    
-    ########################
-
     # Add file_name and data to a dictionary which will then be printed out to text files
     uv_dict = {}
   
-    file_in = sounding_file_dict["file_in"]
-    file_out = file_in.replace("Hgt", "UV") + ".txt" # create output file name
+    sounding = sounding_file_dict["sounding"]
+    file_out = sounding.file_in.replace("Hgt", "UV") + ".txt" # create output file name
                    
-    whole_file = vehicle_header + "\n" + "---------------------------------------------" + "\n" + data_header + "\n" + sounding_file_dict["data"]
+    whole_file = uv_writer.get_whole_file(sounding, project, sounding_file_dict["data"])
 
     uv_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
        
@@ -293,43 +229,43 @@ def write_to_uv_files(dictionary):  # Write dictionary items to files
         with open(os.path.join(directory_out, name), "w+") as f:
             f.write(data)
                         
-#############################################################################
-    
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
-
-for file in files_to_process:
-    sounding_file_dict = parse_info_from_hgt_file(file)
-    uv_dict = output_to_uv_format(sounding_file_dict)
+#########################
 
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
     if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "Problem (Alt. Diff >= 5) = " + alt_diff_string
-        
-    h_flag_string = ""    
+        problems.append(("ALT_DIFF", alt_diff))
     if sounding_file_dict["h_flag_0"] and sounding_file_dict["h_flag_100"] == 4:
-        h_flag_string = "4 THROUGHOUT"
+        problems.append(("QH_FLAG_THROUGHOUT", None))
     elif sounding_file_dict["h_flag_0"] == 4 and sounding_file_dict["h_flag_100"] != 4:
-        h_flag_string = "4 INITIALLY"            
-    if h_flag_string != "":
-        problem += "Problem (QH Flag) = " + h_flag_string
-        
-    if sounding_file_dict["flag"] != "":
-        problem += "Problem = " + sounding_file_dict["flag"]
-
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-           
-    # Write converted files to text files    
+        problems.append(("QH_FLAG_INITIALLY", None))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.date, sounding.time, code, value) for code, value in problems]
+
+#########################
+
+def convert_file(file):  # Convert one "Hgt" file into its "UV" file, and return its problem records (see "sounding_utils/conversion_driver.py")
+    sounding_file_dict = parse_info_from_hgt_file(file)
+    uv_dict = output_to_uv_format(sounding_file_dict)
     write_to_uv_files(uv_dict)
+    return get_problems(sounding_file_dict)
+
+#############################################################################
+    
+if __name__ == "__main__":
+
+    workers = conversion_driver.get_workers("Convert \"Hgt\" sounding files into \"UV\" files.")
+    files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
+
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems to write to the problem report once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers)
+
+    # Write the problem report (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, records in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
 
 #############################################################################
\ No newline at end of file
@@ -4,6 +4,9 @@
 
 ### PURPOSE:  To extract U and V wind components from UAH, which is in its own format.
 
+### USAGE:  python extract_uah2uv.py                (converts one file after another)
+#           python extract_uah2uv.py --workers 8    (converts on 8 worker processes, see "sounding_utils/conversion_driver.py")
+
 ### RESTRICTIONS:
 ##   INCOMING UAH data needs to be in the format as shown below:
 
@@ -32,14 +35,25 @@
 ###############################################################################
 
 import os  # operating system library
-import pandas as pd  # pandas library for dictionary and data frames
+import numpy as np  # numpy library for arrays
 import re  # regular expressions library
-import math  # math library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import conversion_driver  # converts each file, one after another or on a pool of worker processes
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+from sounding_utils import qc  # quality control checks on whole arrays (e.g. pressure decreasing, height increasing)
+from sounding_utils import uah_reader  # reads the data of UAH soundings into arrays, whichever column header format they have
+from sounding_utils import uv_writer  # writes a Sounding in "UV" file format
+from sounding_utils.sounding import Sounding, convert_units, format_values  # shared sounding data model
 
 ###### UPDATE THIS ######
 project = "VSE-2018"
 directory_in = "C:/Users/Maiana/Downloads/Soundings/VSE-2018/Data/UAH"  # location of UAH sounding data files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/VSE-2018/Data/UAH/UV_Files"  # location to output "UV" text files
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
+problem_report_name = "Problem_Files_UAH.csv"  # name of the report of problematic soundings in directory_out (".csv" or ".jsonl")
 invalid_value = "-9999"
 #########################
 
@@ -64,28 +78,40 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
     
-def height_increasing(height, index, h, altitude):    
-    higher = True
-    if invalid_value not in height:        
-        if index == 0:
-            previous_height = altitude
-            if -2 <= (float(height) - previous_height) <= 0:
-                higher = True
-            if (float(height) - previous_height) < -2:
-                higher = False        
-        if index != 0:
-            previous_height = h[index - 1]           
-            if invalid_value in previous_height:
-                higher = height_increasing(height, index -1, h, altitude)
-            else:
-                higher = height > previous_height                
-    return higher
-
-########################
+def shows_invalid(values):  # Check which values show the invalid value once formatted to 1 decimal place (missing data is -9999.0)
+    return np.char.find(np.char.mod("%.1f", values), invalid_value) >= 0
 
-def parse_info_from_uah_file(file_in):
+#########################
+
+def get_sounding(file_in, name, date, time, lat, lon, altitude, header, data):  # Get a Sounding of the height, wind speed (kt), wind direction, u and v, with missing data masked
+
+    sounding = Sounding(file_in, name, date, time, lat, lon, altitude)
 
-    print(file_in)  
+    # Standardize columns
+    height = data["height"]
+    wspd = data["wind_speed"]
+    wdir = data["wind_direction"]
+    if header["height_agl"]:
+        height = height + altitude  # add initial altitude to height values
+
+    # Calculate u and v (0 if wind speed is 0, to 1 decimal place)
+    wspd_mps = convert_units(wspd, "kt", "m/s")
+    wind_zero = np.char.mod("%.1f", wspd_mps).astype(float) == 0
+    u = np.where(wind_zero, 0.0, -wspd_mps * np.sin(np.radians(wdir)))
+    v = np.where(wind_zero, 0.0, -wspd_mps * np.cos(np.radians(wdir)))
+
+    # Mask data if it is missing (-9999.0), and wind direction if wind speed is 0 (wind speed is never masked)
+    wdir_mask = shows_invalid(wdir) | (wspd == 0)
+    sounding.add_column("height", height, shows_invalid(height))
+    sounding.add_column("wind_speed", wspd, None, "kt")
+    sounding.add_column("wind_direction", wdir, wdir_mask)
+    sounding.add_column("u", u, wdir_mask & ~wind_zero, "m/s")
+    sounding.add_column("v", v, wdir_mask & ~wind_zero, "m/s")
+    return sounding
+
+#########################
+
+def parse_info_from_uah_file(file_in):
 
     # Extract site info for site header from file name, and construct into "UV" format
     site_info = re.split(r'[_.\s]\s*', file_in)
@@ -115,149 +141,50 @@ def parse_info_from_uah_file(file_in):
 
     ########################
 
-    # Different header formats exist, so extract data depending on which you have    
-    if "height (m MSL)"  in file_lines[2] and "Calculated" in file_lines[2]:
-        col_headers = ["height (m MSL)", "Calculated wind speed (kts)", "Calculated wind direction (deg)"]
-    elif "height (m MSL)"  in file_lines[2] and "Calculated" not in file_lines[2]:
-        col_headers = ["height (m MSL)", "wind speed (kts)", "wind direction (deg)"]
-    elif "height (m AGL)" in file_lines[2]:
-        col_headers = ["height (m AGL)", "wind speed (kts)", "wind direction (deg)"]
-
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep=",", engine="python", header=2, skipfooter=1, usecols=col_headers).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
-
-    # Standardize column headers   
-    if "height (m MSL)" in file_lines[2]:
-        data_df.columns = ["Height (masl)", "WSPD (kts)", "WDIR (deg)"]      
-    elif "height (m AGL)" in file_lines[2]:
-        data_df["height (m AGL)"] += altitude  # add initial altitude to height values
-        data_df.columns = ["Height (masl)", "WSPD (kts)", "WDIR (deg)"]
-
-    # Convert variables to list
-    h_temp = ["%.1f"%item for item in data_df["Height (masl)"].values.tolist()]
-    ws_temp = data_df["WSPD (kts)"].values.tolist()
-    wd_temp = data_df["WDIR (deg)"].values.tolist()
-    u_temp = [float(invalid_value)] * len(ws_temp)
-    v_temp = [float(invalid_value)] * len(ws_temp)
-       
-    # Create new variables, put in good data, and replace bad data values with invalid value: "-9999"
-    h = []
-    ws = []
-    wd = []
-    u = []
-    v = []               
-    for ind in range(len(data_df)):
-        # If wind speed is 0, set wind direction to -9999
-        if float(ws_temp[ind]) == 0.00:
-            wd_temp[ind] = float(invalid_value)
-            
-        # Add "-9999" if data is missing (-9999.0)
-        if h_temp[ind] == invalid_value:
-            h.append("{:>8}".format(str(invalid_value)))
-        else:
-            h.append("{:>8}".format(str(h_temp[ind])))
-            
-        if ws_temp[ind] == invalid_value:
-            ws.append("{0:>11}".format(invalid_value))
-        else:
-            ws_temp[ind] = ws_temp[ind] / 1.94384  # knots to m/s
-            ws_value = '{:.1f}'.format(ws_temp[ind])
-            ws.append("{0:>11}".format(str(ws_value)))
-            
-        if wd_temp[ind] == invalid_value:
-            wd.append("{:>8}".format(invalid_value))
-        else:
-            wd_value = '{:.1f}'.format(wd_temp[ind])
-            wd.append("{:>8}".format(str(wd_value)))
-     
-    # Sometimes the last wind value is super funky, so check it and make ws and wd -9999 if necessary
-    for ind in range(len(data_df)):
-        if ind == (len(data_df)-1):
-            wind = ws[ind]
-            previous_wind = ws[ind-1]
-            if wind > previous_wind * 3:
-                ws[ind] = "{0:>11s}".format(invalid_value)
-                wd[ind] = "{0:>8s}".format(invalid_value)
-                
-    # Calculate u and v
-    for ind in range(len(ws_temp)):        
-        # If wind speed is 0, set u and v to 0 also
-        if float(ws[ind]) == 0.0:
-            u.append("{:>6}".format(str("0.00")))
-            v.append("{:>7}".format(str("0.00")))        
-        # Otherwise continue to add flags
-        elif float(ws[ind]) != 0.0 and (invalid_value in ws[ind] or invalid_value in wd[ind]):
-            u.append("{:>7}".format(invalid_value))
-            v.append("{:>7}".format(invalid_value))
-        else:
-            u_value = -ws_temp[ind] * math.sin(math.radians(wd_temp[ind]))
-            u_temp[ind] = '{:.2f}'.format(u_value)
-            u.append("{:>7}".format(str(u_temp[ind])))
-
-            v_value = -ws_temp[ind] * math.cos(math.radians(wd_temp[ind]))
-            v_temp[ind] = '{:.2f}'.format(v_value)
-            v.append("{:>7}".format(str(v_temp[ind])))
-            
+    # Extract data header and data (from the parsed sounding cache, if it is there), and mask missing data
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "uah_reader", uah_reader.parser_version, uah_reader.read_uah_sounding)
+    sounding = get_sounding(file_in, name, date, time, lat, lon, altitude, header, data)
+    sounding.info["inst_id"] = inst_id
+    sounding.info["location"] = location
+
+    # Sometimes the last wind value is super funky, so check it and make ws, wd, u and v -9999 if necessary
+    ws = format_values(sounding.values("wind_speed", "m/s")[-2:], 1, 11).tolist()
+    if ws != []:
+        wind = ws[-1]
+        previous_wind = ws[0]
+        if wind > previous_wind * 3:
+            sounding.mask_levels([len(sounding) - 1], ["wind_speed", "wind_direction", "u", "v"])
+
     #########################
 
     # Check if height values are increasing, and if not, make values -9999
-    for index in range(len(data_df)):
-        higher = height_increasing(h[index], index, h, altitude)
-    
-        if not higher:
-            h[index] = "{0:>8s}".format(invalid_value)
-            ws[index] = "{0:>11s}".format(invalid_value)
-            wd[index] = "{0:>8s}".format(invalid_value)
-            u[index] = "{0:>6s}".format(invalid_value)
-            v[index] = "{0:>7s}".format(invalid_value)
-            
+    qc.mask_height_not_increasing(sounding, ["height", "wind_speed", "wind_direction", "u", "v"], 1, 8)
+        
     ######################## 
     
-    # Put the data together
-    uv_data_list = []  # create empty list to fill with correctly spaced data
-   
-    for ind in range(len(data_df)):
-        if "-9999" in h[ind]:
-            continue
-        if h[ind] == h[ind-1]:
-            continue
-        height = h[ind]
-        wspd = ws[ind]
-        wdir = wd[ind]
-        u_wind = u[ind]
-        v_wind = v[ind]
-            
-        uv_string = "{} {} {} {} {}".format(height, wspd, wdir, u_wind, v_wind)  # create the new string for each row
-        uv_data_list.append(uv_string)  # add each row into the new list
-
-    uv_data = "\n".join(uv_data_list)  # join all the elements together again into a string
+    # Format numbers (masked values as invalid value: "-9999"), and put the data together
+    h = format_values(sounding.values("height"), 1, 8)
+    ws = format_values(sounding.values("wind_speed", "m/s"), 1, 11)
+    wd = format_values(sounding.values("wind_direction"), 1, 8)
+    wd[sounding.masks["wind_direction"] & ~sounding.masks["wind_speed"]] = "{:>8}".format("-9999.0")  # missing wind direction (or of 0 wind speed) has always been written as -9999.0
+    u = format_values(sounding.values("u"), 2, 7)
+    v = format_values(sounding.values("v"), 2, 7)
+    u[ws.astype(float) == 0] = "{:>6}".format("0.00")  # u of 0 wind speed has always been 1 character narrower
+    uv_data, h_init = uv_writer.get_uv_data(sounding, [h, ws, wd, u, v])
 
     #########################
 
     # Get info that could be problematic
-    flag = ""
-    if uv_data_list != []:
-        h_line = uv_data_list[0].split()
-        h_init = float(h_line[0])
-    else:
-        h_init = altitude
-        flag = "FILE COMPLETELY EMPTY"
+    flags = []
+    if uv_data == "":
+        flags.append("FILE_EMPTY")
    
     # Add relevant information to a dictionary
     sounding_file_dict = {}
     
-    sounding_file_dict["file_in"] = file_in
-    sounding_file_dict["inst_id"] = inst_id
-    sounding_file_dict["location"] = location
-    sounding_file_dict["site_name"] = name
-    sounding_file_dict["date"] = date
-    sounding_file_dict["time"] = time
-    sounding_file_dict["lat"] = lat
-    sounding_file_dict["lon"] = lon
-    sounding_file_dict["alt"] = altitude
+    sounding_file_dict["sounding"] = sounding
     sounding_file_dict["h_init"] = h_init
-    sounding_file_dict["flag"] = flag
+    sounding_file_dict["flags"] = flags
     sounding_file_dict["data"] = uv_data
     
     return sounding_file_dict
@@ -266,27 +193,13 @@ def parse_info_from_uah_file(file_in):
 
 def output_to_uv_format(sounding_file_dict):
 
-    # Construct site header
-    site_header = ("Project: " + "\t\t\t\t{}" + "\n" + "Platform ID/Location: " + "\t{}" + "\n" + "Date/Time (UTC): " + "\t\t{}/{}" + "\n" + "Latitude/Longitude: " + "\t{}/{}" + "\n" 
-                   + "Altitude (masl): " + "\t\t{}").format(project, sounding_file_dict["site_name"], sounding_file_dict["date"], sounding_file_dict["time"], sounding_file_dict["lat"], sounding_file_dict["lon"], sounding_file_dict["alt"])
-
-    # Construct data header
-    height = "HEIGHT(masl)"
-    wspd = "WSPD(m/s)"
-    wdir = "WDIR"
-    u_header = "U(m/s)"
-    v_header = "V(m/s)"
-    
-    data_header = "{}  {}  {}  {}  {}".format(height, wspd, wdir, u_header, v_header)
-    
-    ########################
-
     # Add file_name and data to a dictionary which will then be printed out to text files
     uv_dict = {}
   
-    file_out = "UV_{}_{}_{}_{}.txt".format(sounding_file_dict["inst_id"], sounding_file_dict["location"], sounding_file_dict["date"], sounding_file_dict["time"])  # create output file name
+    sounding = sounding_file_dict["sounding"]
+    file_out = "UV_{}_{}_{}_{}.txt".format(sounding.info["inst_id"], sounding.info["location"], sounding.date, sounding.time)  # create output file name
                    
-    whole_file = site_header + "\n" + "---------------------------------------------" + "\n" + data_header + "\n" + sounding_file_dict["data"]
+    whole_file = uv_writer.get_whole_file(sounding, project, sounding_file_dict["data"])
 
     uv_dict.update({file_out: whole_file}) # append file name (key) and data (value) to dictionary
        
@@ -305,35 +218,39 @@ def write_to_uv_files(dictionary):  # Write dictionary items to files
         with open(os.path.join(directory_out, name), "w+") as f:
             f.write(data)
                         
-#############################################################################
-    
-files_to_process = get_files_from_directory(directory_in)
-create_directory_out(directory_out)
+#########################
+
+def get_problems(sounding_file_dict):  # Get the problem records of anything problematic in the sounding (none if nothing)
+    sounding = sounding_file_dict["sounding"]
+    problems = []
+    alt_diff = sounding_file_dict["h_init"] - sounding.altitude
+    if alt_diff >= 5:
+        problems.append(("ALT_DIFF", alt_diff))
+    for flag in sounding_file_dict["flags"]:
+        problems.append((flag, None))
+    return [problem_report.get_problem_record(sounding.file_in, sounding.site, sounding.date, sounding.time, code, value) for code, value in problems]
 
-for file in files_to_process:
+#########################
+
+def convert_file(file):  # Convert one UAH file into its "UV" file, and return its problem records (see "sounding_utils/conversion_driver.py")
     sounding_file_dict = parse_info_from_uah_file(file)
     uv_dict = output_to_uv_format(sounding_file_dict)
-
-    # Incrementally append problem file names to a text file
-    problem = ""
-    alt_diff = sounding_file_dict["h_init"] - sounding_file_dict["alt"]
-    if alt_diff >= 5:
-        alt_diff_string = '{:.1f}'.format(alt_diff)
-        problem += "Problem (Alt. Diff >= 5) = " + alt_diff_string
-        
-    if sounding_file_dict["flag"] != "":
-        problem += "Problem = " + sounding_file_dict["flag"]
-
-    if problem != "":
-        with open(os.path.join(directory_out, "Problem_Files_UAH.txt"), "a+") as f:            
-            f.seek(0)  # move cursor to the start of file            
-            data = f.read(100) # if file is not empty then append '\n'
-            if len(data) > 0:
-                f.write("\n")
-            # Append text to the end of the file
-            f.write(file + ": " + problem)
-           
-    # Write converted files to text files    
     write_to_uv_files(uv_dict)
+    return get_problems(sounding_file_dict)
+
+#############################################################################
+    
+if __name__ == "__main__":
+
+    workers = conversion_driver.get_workers("Convert UAH sounding files into \"UV\" files.")
+    files_to_process = get_files_from_directory(directory_in)
+    create_directory_out(directory_out)
+
+    # Convert each file (on a pool of worker processes with --workers), and collect the problems to write to the problem report once every file is converted
+    converted = conversion_driver.convert_files(convert_file, files_to_process, workers)
+
+    # Write the problem report (replacing the old records of every file, so a file that could not be converted has none left)
+    problem_records = [record for file, records in converted for record in records]
+    problem_report.update_problem_report(os.path.join(directory_out, problem_report_name), problem_records, files_to_process)
 
 #############################################################################
\ No newline at end of file
@@ -8,15 +8,19 @@
 
 import os  # operating system library
 import re  # regular expressions library
+import sys  # system library
 from openpyxl.workbook import Workbook
 from openpyxl.styles import Font, Alignment, Border, NamedStyle, Side
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import problem_report  # structured report of problematic soundings
+
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/SHARPpy/Indices"  # location of SHARPpy Indices text files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO"  # location to output excel file
 file_out = "RELAMPAGO_CSU_IOP04_Indices.xlsx"
 directory_in_problemfile = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/SPC_Files"  # location of sounding file problem list
-problem_file_name = "Problem_Files.txt"
+problem_file_name = "Problem_Files.csv"  # problem report written by stage 2 (".csv" or ".jsonl")
 #########################
 
 def get_iop(date):
@@ -102,14 +106,8 @@ def get_files_from_directory(directory_in):
 
 #########################
     
-def get_list_of_problem_files(directory_in, problem_file_name):
-
-    file_lines = []    
-    if os.path.exists(os.path.join(directory_in, problem_file_name)):
-        with open (os.path.join(directory_in, problem_file_name), "r") as myfile:
-            for file_line in myfile:          
-                file_lines.append(file_line)
-    return file_lines
+def get_problem_texts(directory_in, problem_file_name):  # Get the problem texts of each (site, date, time) in the stage 2 problem report
+    return problem_report.get_problem_texts(problem_report.read_problem_report(os.path.join(directory_in, problem_file_name)))
     
 #########################
 
@@ -123,10 +121,8 @@ def parse_info_from_indices_file(file_in):
     # Get site id/name
     if "RELAMPAGO" in directory_in:
         name = site_info[2]
-        inst_id = name
         
     else:        
-        inst_id = site_info[1]
         if len(site_info) == 5:
             name = site_info[1]
         if len(site_info) == 6:
@@ -214,11 +210,8 @@ def parse_info_from_indices_file(file_in):
         
     #########################
   
-    file_lines = get_list_of_problem_files(directory_in_problemfile, problem_file_name)
-    problem = ""
-    for ind in range(len(file_lines)):
-        if inst_id in file_lines[ind] and date in file_lines[ind] and t in file_lines[ind]:
-            problem = file_lines[ind].split(": ", 1)[1]
+    # Get the problems of this sounding from the problem report (joined on site, date and time)
+    problem = problem_texts.get((problem_report.get_site_key(name), date, t), "")
     
     #########################    
         
@@ -288,6 +281,7 @@ def format_xlsx_worksheet(workbook, worksheet, header_values, number_of_rows):
 ###############################################################################
 
 files_to_process = get_files_from_directory(directory_in)
+problem_texts = get_problem_texts(directory_in_problemfile, problem_file_name)
 number_of_rows = len(files_to_process) + 2
 wb = Workbook()
 ws = wb.active
@@ -16,20 +16,31 @@
 
 ###############################################################################
 
+import io  # input/output library
 import os  # operating system library
 import pandas as pd  # pandas library for dictionary and data frames
+import sys  # system library
 from openpyxl.workbook import Workbook
 from openpyxl.styles import Font, Alignment, Border, NamedStyle, Side
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import parse_cache  # cache of parsed soundings, so they are only parsed once
+from sounding_utils import problem_report  # structured report of problematic soundings
+
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/UV_Files"  # location of UV text files
 directory_out = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO"  # location to output excel file
 file_out = "RELAMPAGO_CSU_IOP04_UV.xlsx"
 directory_in_problemfile = "C:/Users/Maiana/Downloads/Soundings/RELAMPAGO/CSU/UV_Files"  # location of sounding file problem list
-problem_file_name = "Problem_Files.txt"
+problem_file_name = "Problem_Files.csv"  # problem report written by stage 2 (".csv" or ".jsonl")
+cache_directory = ""  # location of the parsed sounding cache (leave blank to always parse the text)
 invalid_value = -9999
 #########################
 
+parser_version = 1  # version of what read_uv_data returns (see "parse_cache.py"), change it whenever that changes
+
+#########################
+
 def get_iop(date):
 
     iop = ""
@@ -122,14 +133,8 @@ def open_file_and_split_into_lines(file_in):
 
 #########################
     
-def get_list_of_problem_files(directory_in, problem_file_name):
-
-    file_lines = []    
-    if os.path.exists(os.path.join(directory_in, problem_file_name)):
-        with open (os.path.join(directory_in, problem_file_name), "r") as myfile:
-            for file_line in myfile:          
-                file_lines.append(file_line)
-    return file_lines
+def get_problem_texts(directory_in, problem_file_name):  # Get the problem texts of each (site, date, time) in the stage 2 problem report
+    return problem_report.get_problem_texts(problem_report.read_problem_report(os.path.join(directory_in, problem_file_name)))
 
 #########################
 
@@ -191,6 +196,16 @@ def uv_at_closest_height(height_values, altitude_level, u_values, v_values):
     
 #########################
 
+def read_uv_data(file_lines):  # Get the height, u and v columns of a "UV" file as float arrays (the header values are read from the lines)
+
+    data_df = pd.read_csv(io.StringIO("".join(file_lines)), sep="\s{1,}", engine="python", header=6, usecols=["HEIGHT(masl)", "U(m/s)", "V(m/s)"]).astype(float)
+    data = {}
+    for column in data_df.columns:
+        data[column] = data_df[column].to_numpy()
+    return {}, data
+
+#########################
+
 def parse_info_from_uv_file(file_in):
 
     print(file_in)  
@@ -212,9 +227,9 @@ def parse_info_from_uv_file(file_in):
         
     #########################
 
-    # Extract data header and data into a dictionary and then a data frame
-    data_d = pd.read_csv(os.path.join(directory_in, file_in), sep="\s{1,}", engine="python", header=6, usecols=["HEIGHT(masl)", "U(m/s)", "V(m/s)"]).to_dict(orient="list")
-    data_df = pd.DataFrame.from_dict(data_d, orient='columns').astype(float).sort_index()  # convert dictionary to a data frame with float numbers
+    # Extract data header and data into a data frame (from the parsed sounding cache, if it is there)
+    header, data = parse_cache.read_parsed_sounding(cache_directory, file_lines, "convert_uv2xls.read_uv_data", parser_version, read_uv_data)
+    data_df = pd.DataFrame(data)
 
     # Get Height in MAGL not MASL    
     data_df["HEIGHT(masl)"] -= altitude  # remove initial altitude to height values to get MAGL
@@ -235,11 +250,8 @@ def parse_info_from_uv_file(file_in):
       
     #########################
   
-    file_lines = get_list_of_problem_files(directory_in_problemfile, problem_file_name)
-    problem = ""
-    for ind in range(len(file_lines)):
-        if name in file_lines[ind] and date in file_lines[ind] and t in file_lines[ind]:
-            problem += file_lines[ind].split(":", 1)[1]
+    # Get the problems of this sounding from the problem report (joined on site, date and time)
+    problem = problem_texts.get((problem_report.get_site_key(name), date, t), "")
             
     #If first height is > 15m, note it as a problem
     if h0 > 15:
@@ -296,6 +308,7 @@ def format_xlsx_worksheet(workbook, worksheet, header_values, number_of_rows):
 ###############################################################################
 
 files_to_process = get_files_from_directory(directory_in)
+problem_texts = get_problem_texts(directory_in_problemfile, problem_file_name)
 number_of_rows = len(files_to_process) + 2
 wb = Workbook()
 ws = wb.active
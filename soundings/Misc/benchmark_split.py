@@ -0,0 +1,195 @@
+### NAME:  benchmark_split.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To measure the throughput of the split stage (split_cls2eol.py) on synthetic
+#             ".cls" files from generate_synthetic_cls.py, so that regressions can be caught
+#             as the splitter changes. For each split mode it reports MB/s, soundings/s and
+#             the peak memory use (RSS).
+
+### USAGE:  python benchmark_split.py                                     (uses the settings below)
+#           python benchmark_split.py --soundings 200 --levels 10000 --workers 4 --workers 16
+
+### RESTRICTIONS:
+##   Split modes that are measured:
+#       index             - cls_splitter.process_single_file (index and name each sounding, no writes)
+#       stream            - read and write one sounding at a time, line by line (as for compressed files)
+#       split             - split_cls2eol.py on one process (index, then copy each byte range)
+#       split --workers N - split_cls2eol.py on N processes, in chunks of "soundings_per_task" soundings
+#       gzip              - split_cls2eol.py on ".cls.gz" copies of the files (streamed, not decompressed to disk)
+
+##   Each mode runs in a new process, so its peak RSS is its own. The peak RSS of the worker
+#    processes is the largest of any one of them. Peak RSS needs the "resource" library,
+#    which is not available on Windows (shown as "n/a" there).
+
+##   OUTGOING results are printed as a table, and also appended to "results_file" (if set)
+#    as CSV, so they can be compared between runs.
+
+###############################################################################
+
+import argparse  # command line argument library
+import contextlib  # context manager library
+import datetime  # date and time library
+import gzip  # gzip compression library
+import multiprocessing  # process library
+import os  # operating system library
+import shutil  # sh utilities library
+import sys  # system library
+import tempfile  # temporary file library
+import time  # time library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "1_Split_SingleCLS_to_IndividualEOLs"))  # location of split_cls2eol.py
+import generate_synthetic_cls  # writes the synthetic "CLS" files
+import split_cls2eol  # the split stage being measured
+from sounding_utils import cls_splitter  # names soundings from the per-project site registry
+
+###### UPDATE THIS ######
+projects = ["PECAN", "VSE", "RELAMPAGO"]  # header variants to generate
+number_of_soundings = 50  # soundings in each synthetic file
+levels_per_sounding = 3600  # 1 Hz levels in each sounding
+workers = [2, 4]  # worker process counts to measure "split --workers N" with
+scratch_directory = ""  # location for the synthetic files and split outputs (leave blank for a temporary folder)
+results_file = ""  # CSV file to append the results to (leave blank to only print them)
+#########################
+
+results_header = "date,mode,files,soundings,levels,MB,seconds,MB/s,soundings/s,peak RSS MB,peak worker RSS MB"
+
+#########################
+
+def get_peak_rss():  # Get the peak RSS of this process and of its largest finished child process, in MB (None, None if not available)
+    try:
+        import resource  # not available on Windows
+    except ImportError:
+        return None, None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    peak_self = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+    peak_children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 1e6
+    return peak_self, peak_children
+
+#########################
+
+def split_files_quietly(files, workers):  # Run split_cls2eol.split_files without printing every "EOL" file name, and return the number of soundings
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            return len(split_cls2eol.split_files(files, workers))
+
+#########################
+
+def run_mode(mode, file_paths, directory_out, mode_workers):  # Run one split mode over the files, and return the number of soundings split
+
+    if mode == "index":
+        soundings = 0
+        for file_path, project in file_paths:
+            soundings += len(list(cls_splitter.process_single_file(file_path, project)))
+        return soundings
+
+    if mode == "stream":
+        soundings = 0
+        for file_path, project in file_paths:
+            eol_files, problems = split_cls2eol.split_compressed_file(file_path, project, directory_out)
+            soundings += len(eol_files)
+        return soundings
+
+    # "split", "split --workers N" and "gzip"
+    files = [(file_path, project, directory_out, split_cls2eol.get_chunks_of_sounding_ranges(file_path, mode_workers)) for file_path, project in file_paths]
+    return split_files_quietly(files, mode_workers)
+
+#########################
+
+def measure_mode(mode, file_paths, directory_out, mode_workers, queue):  # Time one split mode (in its own process), and put (seconds, soundings, peak RSS, peak worker RSS) on the queue
+    start = time.perf_counter()
+    soundings = run_mode(mode, file_paths, directory_out, mode_workers)
+    seconds = time.perf_counter() - start
+    peak_self, peak_children = get_peak_rss()
+    queue.put((seconds, soundings, peak_self, peak_children))
+
+#########################
+
+def benchmark_mode(mode, file_paths, directory_out, mode_workers):  # Run one split mode in a new process, and return its measurements
+    if os.path.exists(directory_out):
+        shutil.rmtree(directory_out)
+    os.makedirs(directory_out)
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=measure_mode, args=(mode, file_paths, directory_out, mode_workers, queue))
+    process.start()
+    measurements = queue.get()
+    process.join()
+    return measurements
+
+#########################
+
+def format_mb(value):
+    return "n/a" if value is None else "{:.1f}".format(value)
+
+#########################
+
+def run_benchmarks(directory, soundings, levels, workers):  # Generate the synthetic files, run every split mode on them, and return the result rows
+
+    directory_in = os.path.join(directory, "CLS_Files")
+    directory_out = os.path.join(directory, "EOL_Files")
+    file_paths = []
+    for project in projects:
+        for file_path in generate_synthetic_cls.generate_project(project, directory_in, soundings, levels, generate_synthetic_cls.seed):
+            file_paths.append((file_path, project))
+    total_mb = sum(os.path.getsize(file_path) for file_path, project in file_paths) / 1e6
+
+    # Compressed copies for the "gzip" mode, in their own folder so they are not indexed with the plain files
+    gzip_directory_in = os.path.join(directory, "CLS_Files_gz")
+    os.makedirs(gzip_directory_in, exist_ok=True)
+    gzip_file_paths = []
+    for file_path, project in file_paths:
+        gzip_file_path = os.path.join(gzip_directory_in, os.path.basename(file_path) + ".gz")
+        with open(file_path, "rb") as f_in:
+            with gzip.open(gzip_file_path, "wb", compresslevel=6) as f_out:
+                shutil.copyfileobj(f_in, f_out)
+        gzip_file_paths.append((gzip_file_path, project))
+
+    modes = [("index", file_paths, 1), ("stream", file_paths, 1), ("split", file_paths, 1)]
+    modes += [("split --workers {}".format(n), file_paths, n) for n in workers]
+    modes += [("gzip", gzip_file_paths, 1)]
+
+    rows = []
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    print("{0:<20s}{1:>10s}{2:>10s}{3:>12s}{4:>12s}{5:>10s}{6:>12s}".format("mode", "MB", "seconds", "MB/s", "soundings/s", "RSS MB", "worker MB"))
+    for mode, mode_file_paths, mode_workers in modes:
+        seconds, mode_soundings, peak_self, peak_children = benchmark_mode(mode, mode_file_paths, directory_out, mode_workers)
+        if mode_workers <= 1:
+            peak_children = None
+        print("{0:<20s}{1:>10.1f}{2:>10.2f}{3:>12.1f}{4:>12.1f}{5:>10s}{6:>12s}".format(mode, total_mb, seconds, total_mb / seconds, mode_soundings / seconds, format_mb(peak_self), format_mb(peak_children)))
+        rows.append(",".join([date, mode, str(len(mode_file_paths)), str(mode_soundings), str(levels), "{:.1f}".format(total_mb), "{:.3f}".format(seconds),
+                              "{:.1f}".format(total_mb / seconds), "{:.1f}".format(mode_soundings / seconds), format_mb(peak_self), format_mb(peak_children)]))
+    return rows
+
+#########################
+
+def append_to_results_file(rows):  # Append the result rows to the CSV results file, with a header line if it is new
+    new_file = not os.path.exists(results_file)
+    with open(results_file, "a") as f:
+        if new_file:
+            f.write(results_header + "\n")
+        for row in rows:
+            f.write(row + "\n")
+
+#############################################################################
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the split stage on synthetic \".cls\" sounding files.")
+    parser.add_argument("--soundings", type=int, default=number_of_soundings, help="soundings in each synthetic file")
+    parser.add_argument("--levels", type=int, default=levels_per_sounding, help="1 Hz levels in each sounding")
+    parser.add_argument("--workers", type=int, action="append", help="worker process count to measure (can be given more than once)")
+    args = parser.parse_args()
+
+    if scratch_directory != "":
+        rows = run_benchmarks(scratch_directory, args.soundings, args.levels, args.workers or workers)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            rows = run_benchmarks(directory, args.soundings, args.levels, args.workers or workers)
+
+    if results_file != "":
+        append_to_results_file(rows)
+
+#############################################################################
@@ -3,24 +3,41 @@
 ### MODIFICATION HISTORY:  Written by Maiana Hanshaw for Python (03/14/2020)
 
 ### PURPOSE:  To extract all the CSWR "HGT" files for a given project into one folder.
+#             "HGT" files inside ".zip"/tar archives, or compressed as ".gz", ".bz2" or ".xz",
+#             are streamed straight out of them, without decompressing everything to disk first.
 
 ###############################################################################
 
 import os  # operating system library
 import shutil  # sh utilities library
+import sys  # system library
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import compressed_files  # reads compressed files and archives
 
 ###### UPDATE THIS ######
 directory_in = "C:/Users/Maiana/Desktop/Downloads/Soundings/RELAMPAGO/soundings-20200314"  # location of sounding data
 directory_out = "C:/Users/Maiana/Desktop/Downloads/Soundings/RELAMPAGO/HGT_Files"  # location to output "HGT" sounding data files
 #########################
 
+def copy_compressed_hgtfiles(file_path):  # Stream each "HGT" file out of an archive (or a compressed "HGT" file) into directory_out
+    for member_name, member in compressed_files.iterate_members(file_path):
+        file = os.path.basename(member_name)
+        if "Hgt" in file:
+            with open(os.path.join(directory_out, file), "wb") as f:
+                shutil.copyfileobj(member, f)
+
+#########################
+
 def copy_hgtfiles_to_directory(directory_in):
     if not os.path.exists(directory_out):
         os.makedirs(directory_out)
     for root, dirs, files in os.walk(directory_in):
         for file in files:
     #        if "IOP04" in root:
-                if "Hgt" in file:
+                if compressed_files.is_archive(file) or (compressed_files.is_compressed(file) and "Hgt" in file):
+                    copy_compressed_hgtfiles(root + "/" + file)
+                elif "Hgt" in file:
                     shutil.copy2(root + "/" + file, directory_out)
              
 ###############################################################################
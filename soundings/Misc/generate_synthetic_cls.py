@@ -0,0 +1,153 @@
+### NAME:  generate_synthetic_cls.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To generate synthetic combined NCAR EOL ".cls" sounding files, with a given
+#             number of soundings and levels (1 Hz data, up to 10,000 levels per sounding),
+#             and header variants that match the PECAN, VSE and RELAMPAGO files, so that the
+#             split stage can be tested and benchmarked without the real archives.
+
+### USAGE:  python generate_synthetic_cls.py                                (uses the settings below)
+#           python generate_synthetic_cls.py --soundings 500 --levels 5000 --project VSE
+
+### RESTRICTIONS:
+##   OUTGOING data is in the NCAR EOL ".cls" file format (see split_cls2eol.py), one file per
+#    header variant, e.g. "PECAN_MINDEN_synthetic.cls". Each sounding is released 3 hours
+#    after the one before, so the split "EOL" file names do not collide.
+
+##   The data is made up (a simple standard atmosphere with noise), with a few missing (9)
+#    and bad (3) QC flags and missing values, so it goes through the same code paths as
+#    real data. The same seed always gives the same files.
+
+###############################################################################
+
+import argparse  # command line argument library
+import datetime  # date and time library
+import math  # math library
+import os  # operating system library
+import random  # random number library
+
+###### UPDATE THIS ######
+directory_out = "C:/Users/Maiana/Downloads/Soundings/Synthetic/CLS_Files"  # location to output the synthetic "CLS" files
+number_of_soundings = 100  # soundings in each file
+levels_per_sounding = 3600  # 1 Hz levels in each sounding (at most max_levels)
+seed = 1
+#########################
+
+max_levels = 10000
+first_release = datetime.datetime(2015, 6, 25, 0, 1, 1)
+
+variants = {  # project: list of (file name, "Data Type" line text, "Release Site Type/Site ID" line text)
+    "PECAN": [("PECAN_MINDEN_synthetic.cls", "GAUS SOUNDING DATA/Ascending", "FP4 Minden, NE"),
+              ("PECAN_NWS_synthetic.cls", "NWS Sounding Data/Ascending", "KOAX Omaha, NE"),
+              ("PECAN_FP3_synthetic.cls", "GAUS SOUNDING DATA/Ascending", "FP3 Ellis, KS")],
+    "VSE": [("VSE_ATDD_synthetic.cls", "NOAA ATDD2 Mobile Sounding Data/Ascending", "Cullman, AL"),
+            ("VSE_Purdue_synthetic.cls", "Purdue Mobile Sounding Data/Ascending", "Purdue Mobile, Belle Mina, AL"),
+            ("VSE_UAH_synthetic.cls", "UAH Sounding Data/Ascending", "Courtland, AL")],
+    "RELAMPAGO": [("RELAMPAGO_GTS_synthetic.cls", "GTS Sounding Data/Ascending", "Cordoba Aero, AR"),
+                  ("RELAMPAGO_ARM_synthetic.cls", "ARM Sounding Data/Ascending", "AMF1: Villa Yacanto, AR"),
+                  ("RELAMPAGO_CSWR_synthetic.cls", "CSWR Sounding Data/Ascending", "SCOUT 1")],
+}
+
+data_header = (" Time  Press  Temp  Dewpt  RH    Ucmp   Vcmp   spd   dir   Wcmp     Lon     Lat   Ele   Azi    Alt    Qp   Qt   Qrh  Qu   Qv   QdZ\n"
+               "  sec    mb     C     C     %     m/s    m/s   m/s   deg   m/s      deg     deg   deg   deg     m    code code code code code code\n"
+               "------ ------ ----- ----- ----- ------ ------ ----- ----- ----- -------- ------- ----- ----- ------- ---- ---- ---- ---- ---- ----\n")
+data_line = "%6.1f %6.1f %5.1f %5.1f %5.1f %6.1f %6.1f %5.1f %5.1f %5.1f %8.3f %7.3f %5.1f %5.1f %7.1f %4.1f %4.1f %4.1f %4.1f %4.1f %4.1f\n"
+
+#########################
+
+def get_sounding_header(project, data_type, site, release):  # Create the header lines of one sounding
+    release_time = "{:04d}, {:02d}, {:02d}, {:02d}:{:02d}:{:02d}".format(release.year, release.month, release.day, release.hour, release.minute, release.second)
+    header = ("Data Type:                         " + data_type + "\n"
+              + "Project ID:                        " + project + "\n"
+              + "Release Site Type/Site ID:         " + site + "\n"
+              + "Release Location (lon,lat,alt):    098 57.05'W, 40 30.93'N, -98.951, 40.516, 668.9\n"
+              + "UTC Release Time (y,m,d,h,m,s):    " + release_time + "\n"
+              + "Radiosonde Serial Number:          SYNTHETIC\n"
+              + "Ground Station Software:           generate_synthetic_cls.py\n"
+              + "Surface Data Source:               SYNTHETIC\n"
+              + "System Operator/Comments:          none\n"
+              + "Additional comments:               none\n"
+              + "/\n"
+              + "Nominal Release Time (y,m,d,h,m,s):" + release_time + "\n")
+    return header + data_header
+
+#########################
+
+def get_sounding_data(levels, rnd):  # Create the 1 Hz data lines of one sounding (a standard atmosphere ascending at about 5 m/s, with noise)
+
+    lines = []
+    altitude = 668.9
+    for ind in range(levels):
+        time = ind - 1.0
+        height = altitude + max(time, 0) * 5.0 + rnd.uniform(-0.3, 0.3)
+        temp = 29.7 - 0.0065 * (height - altitude)
+        if height > 11000:
+            temp = 29.7 - 0.0065 * (11000 - altitude)
+        press = 936.3 * math.exp(-(height - altitude) / 8000.0)
+        dewpt = temp - 5.0 - rnd.uniform(0, 3)
+        rh = 100.0 * math.exp(17.625 * dewpt / (243.04 + dewpt) - 17.625 * temp / (243.04 + temp))
+        u = 5.0 + height / 1000.0 + rnd.uniform(-1, 1)
+        v = -4.0 + rnd.uniform(-1, 1)
+        spd = math.hypot(u, v)
+        wdir = (270.0 - math.degrees(math.atan2(v, u))) % 360.0
+        flags = [1.0, 1.0, 1.0, 1.0, 1.0, 99.0]
+
+        # A few missing values and bad or missing QC flags, as in real data
+        if ind == 0:
+            flags[5] = 9.0
+        if rnd.random() < 0.01:
+            press = 9999.0
+            flags[0] = 9.0
+        if rnd.random() < 0.01:
+            temp = 999.0
+            dewpt = 999.0
+            flags[1] = 3.0
+        if rnd.random() < 0.01:
+            flags[3] = 9.0
+            flags[4] = 9.0
+        lines.append(data_line % (time, press, temp, dewpt, rh, u, v, spd, wdir, 5.0, -98.951, 40.516, 999.0, 999.0, height, *flags))
+    return "".join(lines)
+
+#########################
+
+def generate_cls_file(file_path, project, data_type, site, soundings, levels, file_seed):  # Write one synthetic "CLS" file, and return its size in bytes
+    rnd = random.Random(file_seed)
+    with open(file_path, "w", newline="\n") as f:
+        for number in range(soundings):
+            release = first_release + datetime.timedelta(hours=3 * number)
+            f.write(get_sounding_header(project, data_type, site, release))
+            f.write(get_sounding_data(levels, rnd))
+    return os.path.getsize(file_path)
+
+#########################
+
+def generate_project(project, directory_out, soundings, levels, seed):  # Write a synthetic "CLS" file for each header variant of a project, and return their paths
+    if levels > max_levels:
+        raise ValueError("at most {} levels per sounding".format(max_levels))
+    if not os.path.exists(directory_out):
+        os.makedirs(directory_out)
+
+    file_paths = []
+    for file_name, data_type, site in variants[project]:
+        file_path = os.path.join(directory_out, file_name)
+        generate_cls_file(file_path, project, data_type, site, soundings, levels, "{}_{}".format(seed, file_name))
+        file_paths.append(file_path)
+    return file_paths
+
+#############################################################################
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Generate synthetic \".cls\" sounding files.")
+    parser.add_argument("--project", action="append", choices=sorted(variants), help="project header variants to generate (can be given more than once; default: all)")
+    parser.add_argument("--soundings", type=int, default=number_of_soundings, help="soundings in each file")
+    parser.add_argument("--levels", type=int, default=levels_per_sounding, help="1 Hz levels in each sounding (at most {})".format(max_levels))
+    parser.add_argument("--directory-out", default=directory_out, help="location to output the synthetic \"CLS\" files")
+    args = parser.parse_args()
+
+    for project in args.project or sorted(variants):
+        for file_path in generate_project(project, args.directory_out, args.soundings, args.levels, seed):
+            print("{}  ({:.1f} MB)".format(file_path, os.path.getsize(file_path) / 1e6))
+
+#############################################################################
@@ -0,0 +1,8 @@
+### NAME:  sounding_utils
+
+### PURPOSE:  Shared modules used by the sounding processing scripts in the numbered
+#             stage folders. Scripts add the "soundings" folder to their path and
+#             then import what they need, e.g.:
+#                 from sounding_utils import cls_reader
+
+###############################################################################
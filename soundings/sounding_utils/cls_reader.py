@@ -0,0 +1,277 @@
+### NAME:  cls_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To read combined NCAR EOL ".cls" sounding files one sounding at a time,
+#             so that memory use stays bounded by a single sounding no matter how large
+#             the ".cls" file is. "CLS" files on disk are memory-mapped and indexed by the
+#             byte offsets of their "Data Type" lines, so each sounding can be copied out
+#             without decoding its data lines.
+#             The index can be saved as a sidecar file next to the "CLS" file, so that later
+#             stages can read any sounding straight from the "CLS" file as a "virtual" EOL
+#             file, without the individual EOL files ever being written.
+
+### RESTRICTIONS:
+##   INCOMING data needs to be in the NCAR EOL ".cls" file format, where every sounding
+#    starts with a "Data Type" header line:
+
+#Data Type:                         GAUS SOUNDING DATA/Ascending
+#Project ID:                        PECAN
+#Release Site Type/Site ID:         IOP 15
+#...
+#3908.0   89.2 -62.8 -89.1   2.5   -0.8   -6.8   6.8   7.1   5.7  -98.155  40.428 999.0 999.0 17354.1  1.0  1.0  1.0  1.0  1.0 99.0
+#Data Type:                         GAUS SOUNDING DATA/Ascending
+#...
+
+##   Any lines before the first "Data Type" line are ignored.
+
+##   Compressed "CLS" files (see "compressed_files.py") cannot be memory-mapped, so they are only
+#    read one sounding at a time, and have no sidecar index.
+
+###############################################################################
+
+import json  # JSON library for the sidecar index files
+import mmap  # memory-mapped file library
+import os  # operating system library
+
+from . import compressed_files  # reads compressed files and archives
+
+sounding_start = "Data Type"  # text that marks the first header line of each sounding
+header_length = 5  # number of header lines decoded for each sounding (up to the "UTC Release Time" line)
+index_extension = ".soundings.json"  # sidecar index file name is the "CLS" file name with this in place of its extension
+
+#########################
+
+def split_lines_into_soundings(file_lines, start=sounding_start):  # Yield the lines of each sounding in turn from any iterable of lines (e.g. an open file; pass start as bytes for binary lines)
+
+    ind_data = []
+    for file_line in file_lines:
+        if start in file_line:
+            if ind_data != []:
+                yield ind_data
+            ind_data = [file_line]
+        elif ind_data != []:
+            ind_data.append(file_line)
+
+    # Continue until you reach the end of the original file
+    if ind_data != []:
+        yield ind_data
+
+#########################
+
+def iterate_soundings(file_path):  # Yield the lines of each sounding in a "CLS" file, reading one line at a time
+    with open(file_path, "r") as myfile:
+        for ind_data in split_lines_into_soundings(myfile):
+            yield ind_data
+#########################
+
+def find_sounding_ranges(mm):  # Get the (start, end) byte offsets of each sounding in a memory-mapped "CLS" file
+
+    starts = []
+    start_bytes = sounding_start.encode()
+    position = mm.find(start_bytes)
+    while position != -1:
+        line_start = mm.rfind(b"\n", 0, position) + 1
+        starts.append(line_start)
+        line_end = mm.find(b"\n", position)
+        if line_end == -1:
+            break
+        position = mm.find(start_bytes, line_end)
+
+    ends = starts[1:] + [len(mm)]  # continue until you reach the end of the original file
+    return list(zip(starts, ends))
+
+#########################
+
+def parse_sounding_header(mm, start, end):  # Decode only the first header lines of a sounding
+
+    header = []
+    position = start
+    while len(header) < header_length and position < end:
+        line_end = mm.find(b"\n", position, end)
+        line_end = end if line_end == -1 else line_end + 1
+        header.append(mm[position:line_end].decode("latin-1").replace("\r\n", "\n"))
+        position = line_end
+    return header
+
+#########################
+
+def find_cls_sounding_ranges(file_path):  # Get the (start, end) byte offsets of each sounding in a "CLS" file, without decoding any of it
+
+    if os.path.getsize(file_path) == 0:
+        return []
+    with open(file_path, "rb") as myfile:
+        with mmap.mmap(myfile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return find_sounding_ranges(mm)
+
+#########################
+
+def index_cls_file(file_path, sounding_ranges=None):  # Get the byte range, release time, site and header lines of each sounding in a "CLS" file (or of only the given byte ranges)
+
+    sounding_index = []
+    if os.path.getsize(file_path) == 0:
+        return sounding_index
+
+    with open(file_path, "rb") as myfile:
+        with mmap.mmap(myfile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if sounding_ranges is None:
+                sounding_ranges = find_sounding_ranges(mm)
+            for start, end in sounding_ranges:
+                header = parse_sounding_header(mm, start, end)
+                sounding = {}
+                sounding["start"] = start
+                sounding["end"] = end
+                sounding["site"] = header[2].split(":", 1)[-1].strip() if len(header) > 2 else ""
+                sounding["release_time"] = header[4].split(":", 1)[-1].strip() if len(header) > 4 else ""
+                sounding["header"] = header
+                sounding_index.append(sounding)
+
+    return sounding_index
+
+#########################
+
+def kernel_copy_functions():  # Get the available ways of copying between files without passing the data through Python
+
+    functions = []
+    if hasattr(os, "copy_file_range"):
+        functions.append(lambda fd_in, fd_out, offset, count: os.copy_file_range(fd_in, fd_out, count, offset))
+    if hasattr(os, "sendfile"):
+        functions.append(lambda fd_in, fd_out, offset, count: os.sendfile(fd_out, fd_in, offset, count))
+    return functions
+
+kernel_copies = kernel_copy_functions()
+
+#########################
+
+def copy_byte_range(fd_in, fd_out, offset, count):  # Copy bytes from one file to the current position of another inside the kernel, and return how many were copied
+
+    copied_total = 0
+    for kernel_copy in kernel_copies:
+        try:
+            while copied_total < count:
+                copied = kernel_copy(fd_in, fd_out, offset + copied_total, count - copied_total)
+                if copied == 0:
+                    break
+                copied_total += copied
+        except OSError:  # e.g. not supported between these files or on this file system, so try the next way
+            continue
+        break
+    return copied_total
+
+#########################
+
+def write_soundings(file_path, soundings_out):  # Copy each (output file path, sounding) pair's bytes from the "CLS" file into its own file
+
+    with open(file_path, "rb") as myfile:
+        fd_in = myfile.fileno()
+        mm = None
+        try:
+            for path_out, sounding in soundings_out:
+                count = sounding["end"] - sounding["start"]
+                with open(path_out, "wb", buffering=0) as f:
+                    copied = copy_byte_range(fd_in, f.fileno(), sounding["start"], count)
+
+                    # Otherwise write the rest straight from a memoryview slice of the mapped file
+                    if copied < count:
+                        if mm is None:
+                            mm = mmap.mmap(fd_in, 0, access=mmap.ACCESS_READ)
+                        position = sounding["start"] + copied
+                        with memoryview(mm) as view:
+                            while position < sounding["end"]:
+                                position += f.write(view[position:sounding["end"]])
+        finally:
+            if mm is not None:
+                mm.close()
+#########################
+
+def get_index_file_name(file_path):  # Get the name of the sidecar index file of a "CLS" file
+    return os.path.splitext(file_path)[0] + index_extension
+
+#########################
+
+def split_eol_file_name(eol_file):  # Get the site, date, and time from an "EOL_<site>_<date>_<time>.txt" file name
+    parts = os.path.splitext(eol_file)[0].split("_")
+    return "_".join(parts[1:-2]), parts[-2], parts[-1]
+
+#########################
+
+def save_index(file_path, sounding_index):  # Save the index (with an "eol_file" name for each sounding) in a sidecar file next to the "CLS" file
+
+    file_stat = os.stat(file_path)
+    soundings = []
+    for sounding in sounding_index:
+        site, date, time = split_eol_file_name(sounding["eol_file"])
+        soundings.append(dict(sounding, site_name=site, date=date, time=time))
+
+    index = {}
+    index["cls_file"] = os.path.basename(file_path)
+    index["size"] = file_stat.st_size
+    index["mtime_ns"] = file_stat.st_mtime_ns
+    index["soundings"] = soundings
+
+    # Write to a temporary file first, so a partly written index is never read
+    index_file = get_index_file_name(file_path)
+    with open(index_file + ".tmp", "w") as f:
+        json.dump(index, f, indent=1)
+    os.replace(index_file + ".tmp", index_file)
+
+#########################
+
+def load_index(file_path):  # Load the sidecar index of a "CLS" file, or None if it is missing or the "CLS" file has changed since
+
+    index_file = get_index_file_name(file_path)
+    if not os.path.exists(index_file):
+        return None
+    with open(index_file, "r") as f:
+        index = json.load(f)
+
+    file_stat = os.stat(file_path)
+    if index["size"] != file_stat.st_size or index["mtime_ns"] != file_stat.st_mtime_ns:
+        return None
+    return index["soundings"]
+
+#########################
+
+def get_virtual_eol_files(directory_in, extension="cls"):  # Get {EOL file name: (CLS file path, sounding)} for every indexed "CLS" file in a directory
+
+    virtual_eol_files = {}
+    for file in sorted(os.listdir(directory_in)):
+        if "." + extension not in file or compressed_files.is_compressed(file):  # compressed "CLS" files have no byte ranges to index
+            continue
+        file_path = os.path.join(directory_in, file)
+        sounding_index = load_index(file_path)
+        if sounding_index is None:
+            print("No up-to-date index for {}, re-run the split to create one".format(file))
+            continue
+        for sounding in sounding_index:
+            virtual_eol_files[sounding["eol_file"]] = (file_path, sounding)
+    return virtual_eol_files
+
+#########################
+
+def find_virtual_eol_file(virtual_eol_files, site, date, time):  # Get the EOL file name of a sounding by its site, date, and time (or None)
+    for eol_file, (file_path, sounding) in virtual_eol_files.items():
+        if sounding["site_name"] == site and sounding["date"] == date and sounding["time"] == time:
+            return eol_file
+    return None
+
+#########################
+
+def decode_sounding_lines(data):  # Decode a sounding's bytes into text lines, as if read from an "EOL" file
+    return data.decode("latin-1").replace("\r\n", "\n").splitlines(keepends=True)
+
+#########################
+
+def read_sounding_lines(file_path, sounding):  # Read one sounding's lines straight from its byte range in the "CLS" file
+    with open(file_path, "rb") as myfile:
+        myfile.seek(sounding["start"])
+        data = myfile.read(sounding["end"] - sounding["start"])
+    return decode_sounding_lines(data)
+
+#########################
+
+def read_virtual_eol_file(virtual_eol_files, eol_file):  # Read the lines of a "virtual" EOL file as if it had been written out
+    file_path, sounding = virtual_eol_files[eol_file]
+    return read_sounding_lines(file_path, sounding)
+
+###############################################################################
\ No newline at end of file
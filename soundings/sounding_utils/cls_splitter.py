@@ -0,0 +1,253 @@
+### NAME:  cls_splitter.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026); Merged from the per-project
+#                          split_cls2eol_pecan.py, split_cls2eol_vse.py and
+#                          split_cls2eol_relampago.py scripts.
+
+### PURPOSE:  To name each sounding in a combined NCAR EOL ".cls" file, using a per-project
+#             site registry, so that it can be split into its own "EOL" file.
+
+### RESTRICTIONS:
+##   Each project's site registry is a table of (text to look for, site function) rules.
+#    The text is looked for in the "CLS" file name (PECAN, VSE), or in the "Data Type"
+#    header line of the sounding (RELAMPAGO). When several rules match, the last one in
+#    the table wins; when none match, the project's default site function is used.
+#    A site function gets the sounding's header lines and returns the parts of the site
+#    name, which are joined with "_" into the output file name:
+
+#    EOL_<site name parts>_<yyyymmdd>_<hhmm>.txt
+
+##   The rules are compiled into one regular expression per project, and resolved once
+#    per "CLS" file (or once per distinct "Data Type" line), not once per sounding.
+#    Naming a sounding depends only on its own header lines, so the byte ranges of a
+#    large "CLS" file can be named in chunks by separate processes.
+
+###############################################################################
+
+import os  # operating system library
+import re  # regular expressions library
+
+from . import cls_reader  # indexes soundings in "CLS" files
+
+#########################
+
+def fixed_site(*parts):  # Site function for sites whose name does not depend on the header
+    return lambda header: list(parts)
+
+#########################
+
+def join_location(split, ind):  # Join a location of one or two words that ends with a comma, e.g. "Belle Mina," -> "BELLEMINA"
+    if split[ind][-1] != ",":
+        return split[ind].upper() + split[ind+1].strip(",").upper()
+    return split[ind].strip(",").upper()
+
+######################### PECAN
+
+def pecan_nws_site(header):
+    split = header[2].split()
+    name = ""
+    for i, v in enumerate(split):
+        if i == 4:
+            name = v.strip(",").upper()
+    return ["NWS", name]
+
+def pecan_default_site(header):  # e.g. "Release Site Type/Site ID:  FP3 Ellis, KS" -> "FP3_ELLIS"
+    split = header[2].split()
+    location_id = ""
+    name = ""
+    for i, v in enumerate(split):
+        if i == 4:
+            location_id = v.strip(",")
+        if i == 5:
+            name = v.strip(",").upper()
+    if location_id == "":
+        return [name]
+    return [location_id, name]
+
+######################### VSE
+
+def vse_location_site(inst_id, location):
+    if location == "":
+        return [inst_id]
+    return [inst_id, location]
+
+def vse_nws_site(header):
+    split = header[2].split()
+    return vse_location_site("NWS", split[4])
+
+def vse_atdd_site(header):
+    split1 = header[0].split()
+    split2 = header[2].split()
+    return vse_location_site(split1[3], join_location(split2, 4))
+
+def vse_purdue_site(header):
+    split = header[2].split()
+    if split[4][-1] != "," and split[5][-1] != ",":
+        location = split[4].upper() + split[5].upper() + split[6].strip(",").upper()
+    else:
+        location = join_location(split, 4)
+    return vse_location_site("PU", location)
+
+def vse_default_site(header):
+    split1 = header[0].split()
+    split2 = header[2].split()
+    if "Courtland" in split2[4]:
+        location = "COURTLAND"
+    else:
+        location = join_location(split2, 4)
+    return vse_location_site(split1[2], location)
+
+######################### RELAMPAGO
+
+def relampago_site(inst_id, site_id, location):
+    parts = [inst_id]
+    if site_id != "":
+        parts.append(site_id)
+    if location != "":
+        parts.append(location)
+    return parts
+
+def relampago_location(header):  # e.g. "Release Site Type/Site ID:  Cordoba Aero, AR" -> "CordobaAero"
+    split = header[2].split(":", 1)
+    split2 = split[1].split(",", 1)
+    return split2[0].replace(" ", "")
+
+def relampago_gts_site(header):
+    return relampago_site("GTS", "", relampago_location(header))
+
+def relampago_arm_site(header):
+    split = header[2].split(":", 1)
+    split2 = split[1].split(",", 1)
+    split3 = split2[0].split(":")
+    return relampago_site("ARM", split3[0].strip(), split3[1].replace(" ", ""))
+
+def relampago_cswr_site(header):
+    split = header[2].split(":", 1)
+    return relampago_site("CSWR", split[1].strip().replace(" ", ""), "")
+
+def relampago_uiuc_site(header):
+    split = header[2].split(":", 1)
+    split2 = split[1].strip().replace(" ", "")
+    return relampago_site("UIUC", split2[4], "")
+
+def relampago_inpe_site(header):
+    return relampago_site("INPE", "", relampago_location(header))
+
+#########################
+
+site_registry = {
+    "PECAN": {
+        "match": "file",  # look for the text in the "CLS" file name
+        "sites": [("MINDEN", fixed_site("FP4", "MINDEN")),
+                  ("BREWSTER", fixed_site("FP5", "BREWSTER")),
+                  ("CSU", fixed_site("CSU")),
+                  ("NSSL1", fixed_site("NSSL", "1")),
+                  ("NSSL2", fixed_site("NSSL", "2")),
+                  ("ARM", fixed_site("FP1", "ARM")),
+                  ("GREEN", fixed_site("FP2", "GREEN")),
+                  ("CLAMPS", fixed_site("MP1", "OU_CLAMPS")),
+                  ("UAH", fixed_site("MP2", "UAH_MIPS")),
+                  ("SPARC", fixed_site("MP3", "UW_SPARC")),
+                  ("MISS", fixed_site("MP4", "NCAR_MISS")),
+                  ("NWS", pecan_nws_site)],
+        "default": pecan_default_site,
+    },
+    "VSE": {
+        "match": "file",
+        "sites": [("CSU", fixed_site("CSU")),
+                  ("NWS", vse_nws_site),
+                  ("ATDD", vse_atdd_site),
+                  ("Purdue", vse_purdue_site)],
+        "default": vse_default_site,
+    },
+    "RELAMPAGO": {
+        "match": "data_type",  # look for the text in the "Data Type" header line of each sounding
+        "sites": [("GTS", relampago_gts_site),
+                  ("ARM", relampago_arm_site),
+                  ("CSWR", relampago_cswr_site),
+                  ("CSU", fixed_site("CSU")),
+                  ("UIUC", relampago_uiuc_site),
+                  ("INPE", relampago_inpe_site)],
+        "default": fixed_site(""),
+    },
+}
+
+#########################
+
+def compile_site_registry(registry):  # Compile each project's rules into one regular expression (with a lookahead, so overlapping texts are all found)
+    for project in registry.values():
+        texts = [text for text, site_function in project["sites"]]
+        project["pattern"] = re.compile("(?=(" + "|".join(re.escape(text) for text in texts) + "))")
+        project["rule_number"] = {text: number for number, text in enumerate(texts)}
+
+compile_site_registry(site_registry)
+
+#########################
+
+def resolve_site_function(project, text):  # Get the site function of the last rule whose text is in the given text
+    registry = site_registry[project]
+    matches = [registry["rule_number"][m.group(1)] for m in registry["pattern"].finditer(text)]
+    if matches == []:
+        return registry["default"]
+    return registry["sites"][max(matches)][1]
+
+#########################
+
+def get_release_date_and_time(header):  # e.g. "UTC Release Time (y,m,d,h,m,s):    2015, 06, 25, 00:01:01" -> ("20150625", "0001")
+    dt = header[4].split()
+    y = ""
+    m = ""
+    d = ""
+    time = ""
+    for i, v in enumerate(dt):
+        if i == 4:
+            y = v.strip(",")
+        if i == 5:
+            m = v.strip(",")
+        if i == 6:
+            d = v.strip(",")
+        if i == 7:
+            time = v.replace(":","")[0:4]
+    return y + m + d, time
+
+#########################
+
+def get_eol_file_name(header, site_function):  # Create output file name
+    date, time = get_release_date_and_time(header)
+    return "EOL_{}_{}_{}.txt".format("_".join(site_function(header)), date, time)
+
+#########################
+
+def get_site_function(project, file_name, header, site_functions):  # Get the site function of a sounding, resolving each distinct file name (or "Data Type" line) only once
+    if site_registry[project]["match"] == "file":
+        text = os.path.basename(file_name)
+    else:
+        text = header[0]
+    if text not in site_functions:
+        site_functions[text] = resolve_site_function(project, text)
+    return site_functions[text]
+
+#########################
+
+def process_single_file(file_path, project, sounding_ranges=None):  # Yield the output file name and byte range of each sounding in the "CLS" file (or in only the given byte ranges)
+
+    site_functions = {}  # site function of each distinct file name or "Data Type" line
+
+    # Index the merged data set by the byte ranges of its individual data chunks, decoding only their header lines
+    for sounding in cls_reader.index_cls_file(file_path, sounding_ranges):
+        header = sounding["header"]
+        site_function = get_site_function(project, file_path, header, site_functions)
+        yield get_eol_file_name(header, site_function), sounding
+
+#########################
+
+def process_lines(file_name, file_lines, project):  # Yield the output file name and byte lines of each sounding in an iterable of "CLS" byte lines (e.g. a member of a compressed archive)
+
+    site_functions = {}  # site function of each distinct file name or "Data Type" line
+
+    for sounding_lines in cls_reader.split_lines_into_soundings(file_lines, cls_reader.sounding_start.encode()):
+        header = [line.decode("latin-1").replace("\r\n", "\n") for line in sounding_lines[:cls_reader.header_length]]
+        site_function = get_site_function(project, file_name, header, site_functions)
+        yield get_eol_file_name(header, site_function), sounding_lines
+
+###############################################################################
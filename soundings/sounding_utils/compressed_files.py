@@ -0,0 +1,82 @@
+### NAME:  compressed_files.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To read sounding data files straight out of compressed files (".gz", ".bz2",
+#             ".xz") and archives (".zip", ".tar", ".tar.gz", ".tgz", ...), streaming
+#             through them instead of decompressing everything to disk first.
+
+### RESTRICTIONS:
+##   Tar archives are read as a stream, one member after another, so their members can
+#    only be read in the order they are stored. Members are given as binary file objects,
+#    which can be iterated line by line.
+
+###############################################################################
+
+import bz2  # bzip2 compression library
+import gzip  # gzip compression library
+import lzma  # xz compression library
+import os  # operating system library
+import tarfile  # tar archive library
+import zipfile  # zip archive library
+
+compressions = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}  # extension: function to open a single compressed file
+tar_extensions = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+zip_extensions = (".zip",)
+
+#########################
+
+def is_tar_file(file_name):
+    return file_name.lower().endswith(tar_extensions)
+
+def is_zip_file(file_name):
+    return file_name.lower().endswith(zip_extensions)
+
+def is_archive(file_name):  # Check if a file holds several members (".zip" or tar)
+    return is_tar_file(file_name) or is_zip_file(file_name)
+
+#########################
+
+def get_compression(file_name):  # Get the function to open a single compressed file (None if it is not one)
+    if is_archive(file_name):
+        return None
+    return compressions.get(os.path.splitext(file_name)[1].lower())
+
+#########################
+
+def is_compressed(file_name):  # Check if a file has to be streamed through (a single compressed file or an archive)
+    return is_archive(file_name) or get_compression(file_name) is not None
+
+#########################
+
+def strip_compression(file_name):  # Get the name of a single compressed file without its compression extension, e.g. "a.cls.gz" -> "a.cls"
+    if get_compression(file_name) is not None:
+        return os.path.splitext(file_name)[0]
+    return file_name
+
+#########################
+
+def iterate_members(file_path):  # Yield the (name, binary file object) of each file in an archive, or of the one file in a compressed (or plain) file
+
+    if is_zip_file(file_path):
+        with zipfile.ZipFile(file_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as member:
+                    yield info.filename, member
+
+    elif is_tar_file(file_path):
+        with tarfile.open(file_path, "r|*") as tf:  # stream mode, so the archive is only read through once
+            for info in tf:
+                if not info.isfile():
+                    continue
+                yield info.name, tf.extractfile(info)
+
+    else:
+        compression = get_compression(file_path)
+        open_function = open if compression is None else compression
+        with open_function(file_path, "rb") as member:
+            yield strip_compression(os.path.basename(file_path)), member
+
+###############################################################################
@@ -0,0 +1,107 @@
+### NAME:  conversion_driver.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To run the conversion of each sounding file in the stage 2 scripts (e.g. reading an
+#             "EOL" file and writing its "SPC" file) one file after another, or on a pool of
+#             worker processes, and to report the files that could not be converted.
+
+### RESTRICTIONS:
+##   The conversion is a function of one file name (defined at the top level of the script, so
+#    the workers can find it) that reads the file, writes its converted file(s) itself, and
+#    returns something small to send back (e.g. its problem records, see "problem_report.py").
+
+##   The files are handed out to the workers in chunks of up to "files_per_task" files (fewer if
+#    there are not enough files to keep every worker busy), and the results come back in the
+#    same order as the files, whatever order the workers finish in. So the file names printed,
+#    and anything made from the results (e.g. the problem report), are the same as converting one
+#    file after another.
+
+##   A file that raises an error is skipped, instead of stopping the whole run: its traceback is
+#    printed, and it is listed in a summary at the end. It has no result, so the scripts
+#    replace the old records of every file they were given (not only of the files converted),
+#    and a file that could not be converted is left with no records from an earlier run.
+
+##   Scripts run with workers need their top level code under if __name__ == "__main__": (on
+#    Windows each worker imports the script again). Anything they set up there that the
+#    conversion needs (e.g. the virtual "EOL" files of cls_reader) is passed to the workers
+#    with an initializer function.
+
+###############################################################################
+
+import argparse  # command line argument library
+import traceback  # traceback library, for the errors of files that could not be converted
+from concurrent.futures import ProcessPoolExecutor  # process pool for converting files in parallel
+from itertools import repeat  # iteration library
+
+files_per_task = 20  # with workers, the files are handed out in chunks of up to this many files
+tasks_per_worker = 4  # with workers, chunks are made smaller if there would be fewer than this many per worker
+
+#########################
+
+def get_workers(description):  # Get the number of worker processes from the --workers command line option (1 if not given)
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes to convert files with (default: 1)")
+    return parser.parse_args().workers
+
+#########################
+
+def get_chunks(files, workers):  # Group the files into chunks for the workers (one chunk of all of them if not in parallel)
+    if workers <= 1:
+        return [files]
+    chunk_size = max(1, min(files_per_task, len(files) // (workers * tasks_per_worker)))
+    return [files[i:i+chunk_size] for i in range(0, len(files), chunk_size)]
+
+#########################
+
+def convert_chunk(convert_file, files):  # Convert each file in a chunk, and return its (file, result, error), with error None if it converted (and result None if not, and error its traceback)
+    results = []
+    for file in files:
+        try:
+            results.append((file, convert_file(file), None))
+        except Exception:
+            results.append((file, None, traceback.format_exc()))
+    return results
+
+#########################
+
+def convert_files(convert_file, files, workers=1, initializer=None, initargs=()):  # Convert each file (on a pool of worker processes if workers > 1), and return the (file, result) of each file converted, in the same order as the files
+
+    chunks = get_chunks(list(files), workers)
+    if workers > 1 and len(files) > 0:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+        results = executor.map(convert_chunk, repeat(convert_file), chunks)
+    else:
+        executor = None
+        if initializer is not None:
+            initializer(*initargs)
+        results = (convert_chunk(convert_file, chunk) for chunk in chunks)
+
+    # Results come back in chunk order, so they are in the same order as the files
+    converted = []
+    errors = []
+    for chunk_results in results:
+        for file, result, error in chunk_results:
+            print(file)
+            if error is None:
+                converted.append((file, result))
+            else:
+                print("ERROR: " + error.rstrip())
+                errors.append((file, error))
+
+    if executor is not None:
+        executor.shutdown()
+    print_error_summary(errors, len(files))
+    return converted
+
+#########################
+
+def print_error_summary(errors, file_count):  # Print the files that could not be converted, and why (the last line of each traceback, nothing if every file converted)
+    if errors == []:
+        return
+    print("")
+    print("{} of {} files could not be converted:".format(len(errors), file_count))
+    for file, error in errors:
+        print("   {}: {}".format(file, error.rstrip().splitlines()[-1]))
+
+###############################################################################
@@ -0,0 +1,236 @@
+### NAME:  eol_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To read the header and data of one "EOL" sounding (from an "EOL" file, or
+#             a "virtual" EOL file read straight from a "CLS" file) into NumPy arrays,
+#             and mask its bad or missing data using its QC flags into a Sounding (see
+#             "sounding.py"), for the stage 2 "convert_eol2spc.py", "convert_csu2spc.py"
+#             and "extract_eol2uv.py" scripts.
+
+### RESTRICTIONS:
+##   INCOMING data needs to be in the "EOL" file format, with 12 header lines, then the
+#    column names, units and dashes lines, then one line of numbers per level:
+
+#Data Type:                         GAUS SOUNDING DATA/Ascending
+#Project ID:                        PECAN
+#Release Site Type/Site ID:         IOP 15
+#Release Location (lon,lat,alt):    098 57.05'W, 40 30.93'N, -98.951, 40.516, 668.9
+#...
+#Nominal Release Time (y,m,d,h,m,s):2015, 06, 25, 00:01:01
+# Time  Press  Temp  Dewpt  RH    Ucmp   Vcmp   spd   dir   Wcmp     Lon     Lat   Ele   Azi    Alt    Qp   Qt   Qrh  Qu   Qv   QdZ
+#  sec    mb     C     C     %     m/s    m/s   m/s   deg   m/s      deg     deg   deg   deg     m    code code code code code code
+#------ ------ ----- ----- ----- ------ ------ ----- ----- ----- -------- ------- ----- ----- ------- ---- ---- ---- ---- ---- ----
+#  -1.0  936.3  29.7  22.3  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   658.0  1.0  1.0  1.0  1.0  1.0  9.0
+
+##   The data lines are split on whitespace and converted to one float array in a single
+#    step (instead of the slow regular-expression parser of pandas). If any line has a
+#    different number of values (e.g. a cut-off last line), the data is read with the
+#    pandas C parser instead, which fills the missing values with NaN.
+
+##   Values are kept as float64, so that they format to exactly the same numbers as before.
+
+### QUALITY CONTROL FLAGS:  bad or missing data is masked (written as "-9999")
+#       Qp = Pressure
+#       Qt = Temp
+#       Qrh = Relative Humidity
+#       Qu = Wind-u
+#       Qv = Wind-v
+
+#       2 = questionable/maybe - including these values for now
+#       3 = BAD
+#       9 = MISSING
+#       99 = MISSING/UNCHECKED
+
+##   The first level is often flagged bad, so its values are taken as they are (or from the
+#    next level if missing), unless its time is before the release (then it is all masked).
+#    The "SPC" and "UV" soundings have always checked this slightly differently (e.g. "UV"
+#    wind components are missing when they show "9999" to 1 decimal place), so each has
+#    its own function.
+
+###############################################################################
+
+import io  # input/output library
+import numpy as np  # numpy library for arrays
+import pandas as pd  # pandas library for data frames (only for data lines that do not all have the same length)
+
+from .sounding import Sounding  # shared sounding data model
+
+parser_version = 1  # version of what read_eol_sounding returns (see "parse_cache.py"), change it whenever that changes
+column_names_line = 12  # line number (from 0) of the column names
+data_start_line = 15  # line number (from 0) of the first data line, after the units and dashes lines
+
+#########################
+
+def parse_eol_header(file_lines):  # Get the lon, lat (as "{:.5f}" text, "" if missing), launch altitude and column names of a sounding
+
+    header = {}
+
+    # Get lat and lon
+    latlon = file_lines[3].split()
+    header["lon"] = ""
+    header["lat"] = ""
+    if len(latlon) > 7:
+        header["lon"] = '{:.5f}'.format(float(latlon[7].strip(",")))
+    if len(latlon) > 8:
+        header["lat"] = '{:.5f}'.format(float(latlon[8].strip(",")))
+
+    # Get initial altitude
+    alt_line = file_lines[3].replace(" ","").split(",")
+    header["altitude"] = float(alt_line[6].rstrip())
+
+    header["columns"] = file_lines[column_names_line].split()
+    return header
+
+#########################
+
+def read_eol_data(file_lines, columns, usecols):  # Get the data lines of a sounding as {column name: float array} for the given columns
+
+    for column in usecols:
+        if column not in columns:
+            raise ValueError("EOL data has no \"{}\" column".format(column))
+
+    data_text = "".join(file_lines[data_start_line:])
+    values = np.array(data_text.split(), dtype=float)
+    rows = len([file_line for file_line in file_lines[data_start_line:] if file_line.strip() != ""])
+
+    if values.size == rows * len(columns):
+        values = values.reshape(rows, len(columns))
+    else:
+        values = pd.read_csv(io.StringIO(data_text), sep=r"\s+", header=None, names=columns, usecols=usecols, dtype=float).reindex(columns=columns).to_numpy()
+
+    data = {}
+    for column in usecols:
+        data[column] = values[:, columns.index(column)]
+    return data
+
+#########################
+
+def read_eol_sounding(file_lines):  # Get the header (see parse_eol_header) and every data column (see read_eol_data) of a sounding
+    header = parse_eol_header(file_lines)
+    data = read_eol_data(file_lines, header["columns"], header["columns"])
+    return header, data
+
+#########################
+
+def is_missing(values, missing_value):  # Check which values are missing (at or beyond the missing value, e.g. 999.0 or 9999.0)
+    return np.abs(values) >= missing_value
+
+#########################
+
+def shows_missing(values, decimals, missing_text):  # Check which values show the missing text once formatted (e.g. "999" in "%.1f")
+    return np.char.find(np.char.mod("%.{}f".format(decimals), values), missing_text) >= 0
+
+#########################
+
+def get_initial_value(values, missing):  # Get the first value, or if it is missing, the next one, unless that is missing too (NaN)
+    if not missing[0]:
+        return values[0]
+    if len(values) > 1 and not missing[1]:
+        return values[1]
+    return np.nan
+
+#########################
+
+def add_columns(sounding, values, masks, units):  # Add the columns to a Sounding, masking NaN values too
+    for name in values:
+        sounding.add_column(name, values[name], masks[name] | np.isnan(values[name]), units.get(name, ""))
+
+#########################
+
+def get_spc_sounding(file_in, site, date, time, header, data):  # Get a Sounding of the pressure, height, temperature, dewpoint, wind direction and wind speed (m/s) for an "SPC" file, with bad or missing data masked
+
+    sounding = Sounding(file_in, site, date, time, header["lat"], header["lon"], header["altitude"])
+    for flag in ["Qp", "Qt", "Qrh", "Qu", "Qv"]:
+        sounding.add_flags(flag, data[flag])
+
+    seconds = data["Time"]
+    press = data["Press"]
+    alt = data["Alt"]
+    temp = data["Temp"]
+    dewpt = data["Dewpt"]
+    wdir = data["dir"]
+    wspd = data["spd"]
+    qp_bad = np.isin(data["Qp"], (3, 9))
+    qt_bad = np.isin(data["Qt"], (3, 9))
+    qrh_bad = np.isin(data["Qrh"], (3, 9))
+    wind_bad = np.isin(data["Qu"], (3, 9)) | np.isin(data["Qv"], (3, 9))
+
+    values = {"pressure": press.copy(), "height": alt.copy(), "temperature": temp.copy(), "dewpoint": dewpt.copy(), "wind_direction": wdir.copy(), "wind_speed": wspd.copy()}
+
+    # Mask data if QC flags are missing (9) or bad (3), or if wind speed is 0 for wind direction
+    masks = {}
+    masks["pressure"] = data["Qp"] == 9
+    masks["height"] = qp_bad | is_missing(alt, 99999)
+    masks["temperature"] = qt_bad
+    masks["dewpoint"] = qrh_bad | qt_bad
+    masks["wind_direction"] = wind_bad | (wspd == 0)
+    masks["wind_speed"] = wind_bad
+
+    # Get initial values (sometimes these are flagged bad, but then this invalidates all initial conditions)
+    if len(seconds) > 0 and seconds[0] < 0:
+        for mask in masks.values():
+            mask[0] = True
+    elif len(seconds) > 0:
+        values["height"][0] = alt[0]  # this is the only one that usually has a value
+
+        # If values are missing, get the next values for the initial conditions, unless they still have bad values
+        values["pressure"][0] = get_initial_value(press, is_missing(press, 9999))
+        values["temperature"][0] = get_initial_value(temp, is_missing(temp, 999))
+        values["dewpoint"][0] = get_initial_value(dewpt, is_missing(dewpt, 999))
+        values["wind_direction"][0] = np.nan if wspd[0] == 0 else get_initial_value(wdir, is_missing(wdir, 999))
+        values["wind_speed"][0] = get_initial_value(wspd, wspd == 999)
+        for mask in masks.values():
+            mask[0] = False
+
+    add_columns(sounding, values, masks, {"wind_speed": "m/s"})
+    return sounding
+
+#########################
+
+def get_uv_sounding(file_in, site, date, time, header, data):  # Get a Sounding of the height, wind speed (m/s), wind direction, u and v for a "UV" file, with bad or missing data masked
+
+    sounding = Sounding(file_in, site, date, time, header["lat"], header["lon"], header["altitude"])
+    for flag in ["Qp", "Qu", "Qv"]:
+        sounding.add_flags(flag, data[flag])
+
+    seconds = data["Time"]
+    alt = data["Alt"]
+    wdir = data["dir"]
+    wspd = data["spd"]
+    ucmp = data["Ucmp"]
+    vcmp = data["Vcmp"]
+    qp_bad = np.isin(data["Qp"], (3, 9))
+    qu_bad = np.isin(data["Qu"], (3, 9))
+    qv_bad = np.isin(data["Qv"], (3, 9))
+    wind_zero = np.char.mod("%.1f", wspd).astype(float) == 0
+
+    values = {"height": alt.copy(), "wind_speed": wspd.copy(), "wind_direction": wdir.copy(), "u": ucmp.copy(), "v": vcmp.copy()}
+
+    # Mask data if QC flags are missing (9) or bad (3), or if wind speed is 0 (to 1 decimal place) for wind direction
+    masks = {}
+    masks["height"] = qp_bad | shows_missing(alt, 1, "99999")
+    masks["wind_speed"] = qu_bad | qv_bad
+    masks["wind_direction"] = qu_bad | qv_bad | wind_zero
+    masks["u"] = qu_bad
+    masks["v"] = qv_bad
+
+    # Get initial values (sometimes these are flagged bad, but then this invalidates all initial conditions)
+    if len(seconds) > 0 and seconds[0] < 0:
+        for mask in masks.values():
+            mask[0] = True
+    elif len(seconds) > 0:
+        values["height"][0] = alt[0]  # this is the only one that usually has a value
+
+        # If values are missing, get the next values for the initial conditions, unless they still have bad values
+        values["wind_speed"][0] = get_initial_value(wspd, shows_missing(wspd[:2], 1, "999"))
+        values["wind_direction"][0] = np.nan if wind_zero[0] else get_initial_value(wdir, shows_missing(wdir[:2], 1, "999"))
+        values["u"][0] = get_initial_value(ucmp, shows_missing(ucmp[:2], 1, "9999"))
+        values["v"][0] = get_initial_value(vcmp, shows_missing(vcmp[:2], 1, "9999"))
+        for mask in masks.values():
+            mask[0] = False
+
+    add_columns(sounding, values, masks, {"wind_speed": "m/s", "u": "m/s", "v": "m/s"})
+    return sounding
+
+###############################################################################
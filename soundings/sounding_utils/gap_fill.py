@@ -0,0 +1,91 @@
+### NAME:  gap_fill.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To fill the small pressure gaps of a sounding written to an "SPC" file (drops of
+#             20 mb or more between two levels, from missing or interpolated data) with levels
+#             interpolated in log pressure, so that SHARPpy (stage 3) gets an evenly sampled
+#             profile instead of interpolating across each gap itself every time it needs a value
+#             there.
+
+### RESTRICTIONS:
+##   Works on the "%RAW%" block of spc_writer.py: a (levels x 6) float array of pressure (mb),
+#    height (m), temperature (C), dewpoint (C), wind direction (deg) and wind speed (kt) of the
+#    levels written, with NaN for masked values, and the gaps found in it (see get_pressure_gaps
+#    in "spc_writer.py").
+
+##   Only gaps smaller than the size given are filled, and only between two pressures above 0
+#    (not e.g. up to a -999.00 "Hgt" missing value, which is written as a level). The levels
+#    filled in are at whole multiples of the spacing given (e.g. 850, 845, 840 mb), strictly
+#    between the two levels of the gap.
+
+##   Height, temperature and dewpoint are interpolated linearly in log pressure between the two
+#    levels of the gap, and wind as its u and v components (turned back into direction and
+#    speed). A value is only filled if both levels of the gap have one, so missing data is never
+#    made up from one side only.
+
+##   Filled levels are marked by the number of levels filled into each gap (kept with the gap,
+#    and written to the problem report by the scripts), since the "SPC" format has no flags.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+from .resample import get_wind_components, get_wind_direction_speed  # wind direction and speed to and from u and v
+
+#########################
+
+def get_fill_pressures(bottom, top, spacing):  # Get the pressures of the levels to fill into a gap from bottom to top (mb), at whole multiples of the spacing strictly between them
+    first = np.floor(bottom / spacing)
+    last = np.ceil(top / spacing)
+    pressures = spacing * np.arange(first, last - 1, -1)
+    return pressures[(pressures < bottom) & (pressures > top)]
+
+#########################
+
+def fill_gaps(values, gaps, max_gap, spacing):  # Fill the gaps smaller than max_gap (mb) of a "%RAW%" block (levels x 6 array) with levels every spacing (mb), interpolated in log pressure, and set the number of levels filled into each gap as its "filled"
+
+    for gap in gaps:
+        gap["filled"] = 0
+    if max_gap <= 0 or len(gaps) == 0:
+        return values
+    if spacing <= 0:
+        raise ValueError("gap fill spacing needs to be above 0: {}".format(spacing))
+
+    # Pressures to fill, and the level below the gap each one is in
+    levels = []
+    pressures = []
+    for gap in gaps:
+        bottom, top = values[gap["level"], 0], values[gap["level"] + 1, 0]
+        if -gap["difference"] >= max_gap or bottom <= 0 or top <= 0:
+            continue
+        fill_pressures = get_fill_pressures(bottom, top, spacing)
+        gap["filled"] = len(fill_pressures)
+        levels.append(np.full(len(fill_pressures), gap["level"]))
+        pressures.append(fill_pressures)
+    if len(pressures) == 0:
+        return values
+    levels = np.concatenate(levels)
+    pressures = np.concatenate(pressures)
+
+    # Weight of the level above the gap, from the log pressures
+    below = values[levels]
+    above = values[levels + 1]
+    weight = (np.log(below[:, 0]) - np.log(pressures)) / (np.log(below[:, 0]) - np.log(above[:, 0]))
+
+    # Wind components (0 where the wind speed is 0, as its direction is masked there)
+    u_below, v_below = get_wind_components(below[:, 4], below[:, 5])
+    u_above, v_above = get_wind_components(above[:, 4], above[:, 5])
+
+    # Interpolate (NaN if either level of the gap is NaN)
+    filled = np.empty((len(pressures), 6))
+    filled[:, 0] = pressures
+    filled[:, 1:4] = below[:, 1:4] + weight[:, None] * (above[:, 1:4] - below[:, 1:4])
+    wind_direction, wind_speed = get_wind_direction_speed(u_below + weight * (u_above - u_below), v_below + weight * (v_above - v_below))
+    wind_direction[wind_speed == 0] = np.nan
+    filled[:, 4] = wind_direction
+    filled[:, 5] = wind_speed
+
+    return np.insert(values, levels + 1, filled, axis=0)
+
+###############################################################################
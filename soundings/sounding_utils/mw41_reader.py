@@ -0,0 +1,183 @@
+### NAME:  mw41_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To read the header and data of one Vaisala MW41 sounding (as exported by the CSU
+#             sounding systems) into NumPy arrays, and mask its missing data into a Sounding (see
+#             "sounding.py"), for the stage 2 "convert_csu2spc.py" script.
+
+### RESTRICTIONS:
+##   INCOMING data needs to be in the tab separated MW41 format: "key<TAB>value" header lines,
+#    a blank line, the column names and units lines, then one line of values per level:
+
+#Station name                                 	CSU_atmos1
+#System trademark and model                   	MW41
+#Balloon release date and time                	2018-11-10T15:00:04
+#Release point latitude                       	31.816505°S
+#Release point longitude                      	64.284523°W
+#Release point height from sea level          	441.4 m
+#...
+#Software version                             	MW41 2.2.1
+
+#Elapsed time	HeightMSL	P	Temp	Dewp	RH	Speed	Dir	AscRate	Lat	Lon	GpsHeightMSL
+#s	m	hPa	°C	°C	%	m/s	°	m/s	°	°	m
+#0	441.4	950.6	30.7	19.4	50.7	4.1	359.7	0.0	-31.816505	-64.284523	441.4
+
+##   The header lines are read into a dictionary of key: value text in one pass (so the release
+#    point is found by its key, not by its line number, and any number of header lines works).
+#    Latitude and longitude are given as degrees with a hemisphere letter, and are turned into
+#    signed degrees (south and west negative).
+
+##   Files are written with the degree symbol "°" in either UTF-8 or Latin-1, so they are read
+#    as UTF-8 if they can be, and as Latin-1 if not (see read_file_lines). The values never
+#    have a degree symbol, only the header values and the units line, which is skipped.
+
+##   The data lines are read with the pandas C parser. Missing values ("/////" or blank) are
+#    read as NaN, and masked.
+
+###############################################################################
+
+import io  # input/output library
+import re  # regular expressions library
+import numpy as np  # numpy library for arrays
+import pandas as pd  # pandas library for reading the tab separated data lines
+
+from .sounding import Sounding  # shared sounding data model
+
+parser_version = 1  # version of what read_mw41_sounding returns (see "parse_cache.py"), change it whenever that changes
+file_encodings = ["utf-8", "latin-1"]  # encodings MW41 files are read with, in order (Latin-1 can read any file)
+missing_values = ["/////"]  # text of missing values (besides blank)
+header_keys = {  # header value: its key in the MW41 header
+    "station": "Station name",
+    "release_time": "Balloon release date and time",
+    "lat": "Release point latitude",
+    "lon": "Release point longitude",
+    "altitude": "Release point height from sea level",
+}
+required_columns = ["Elapsed time", "HeightMSL", "P", "Temp", "Dewp", "Speed", "Dir"]  # columns every MW41 file needs
+first_key = "Station name"  # key of the first header line, to tell MW41 files from others
+
+#########################
+
+def read_file_lines(file_path):  # Read the lines of a text file as UTF-8, or as Latin-1 if it is not UTF-8 (e.g. a Latin-1 degree symbol)
+    for encoding in file_encodings:
+        try:
+            with open(file_path, "r", encoding=encoding) as myfile:
+                return myfile.readlines()
+        except UnicodeDecodeError:
+            continue
+
+#########################
+
+def is_mw41_file(file_lines):  # Check if the lines are of an MW41 file (its first line is the "Station name" key and a tab)
+    return len(file_lines) > 0 and file_lines[0].split("\t")[0].strip() == first_key and "\t" in file_lines[0]
+
+#########################
+
+def get_number(text):  # Get the number at the start of a header value (e.g. 441.4 of "441.4 m"), or None if there is none
+    match = re.match(r"\s*([-+]?\d+(?:\.\d*)?)", text)
+    if match is None:
+        return None
+    return float(match.group(1))
+
+#########################
+
+def get_degrees(text):  # Get the signed degrees of a latitude or longitude header value (e.g. -31.816505 of "31.816505°S"), as "{:.5f}" text ("" if missing)
+    degrees = get_number(text)
+    if degrees is None:
+        return ""
+    if text.strip()[-1:].upper() in ("S", "W"):
+        degrees = -abs(degrees)
+    return '{:.5f}'.format(degrees)
+
+#########################
+
+def parse_mw41_header(file_lines):  # Get the header fields ({key: value text}), station, release time, lat, lon (as "{:.5f}" text), launch altitude, column names and the line number of the first data line
+
+    # Read the "key<TAB>value" lines up to the first blank line
+    fields = {}
+    line_number = 0
+    for line_number, file_line in enumerate(file_lines):
+        if file_line.strip() == "":
+            break
+        key, _, value = file_line.partition("\t")
+        fields[key.strip()] = value.strip()
+    else:
+        line_number = len(file_lines)
+
+    # The column names are on the first line after the blank line(s), then the units line
+    while line_number < len(file_lines) and file_lines[line_number].strip() == "":
+        line_number += 1
+    if line_number >= len(file_lines) or "\t" not in file_lines[line_number]:
+        raise ValueError("MW41 data has no tab separated column names line")
+
+    header = {}
+    header["fields"] = fields
+    header["station"] = fields.get(header_keys["station"], "")
+    header["release_time"] = fields.get(header_keys["release_time"], "")
+    header["lat"] = get_degrees(fields.get(header_keys["lat"], ""))
+    header["lon"] = get_degrees(fields.get(header_keys["lon"], ""))
+    altitude = get_number(fields.get(header_keys["altitude"], ""))
+    if altitude is None:
+        raise ValueError("MW41 header has no \"{}\"".format(header_keys["altitude"]))
+    header["altitude"] = altitude
+    header["columns"] = [name.strip() for name in file_lines[line_number].split("\t")]
+    header["data_start_line"] = line_number + 2
+    return header
+
+#########################
+
+def read_mw41_data(file_lines, header):  # Get the data lines of a sounding as {column name: float array} for every column (NaN where missing)
+
+    columns = header["columns"]
+    for column in required_columns:
+        if column not in columns:
+            raise ValueError("MW41 data has no \"{}\" column".format(column))
+
+    data_lines = [file_line for file_line in file_lines[header["data_start_line"]:] if file_line.strip() != ""]
+    if data_lines == []:
+        return {column: np.array([], dtype=float) for column in columns}
+
+    data_df = pd.read_csv(io.StringIO("".join(data_lines)), sep="\t", header=None, names=columns, dtype=float, na_values=missing_values, skipinitialspace=True)
+    data = {}
+    for column in columns:
+        data[column] = data_df[column].to_numpy()
+    return data
+
+#########################
+
+def read_mw41_sounding(file_lines):  # Get the header (see parse_mw41_header) and every data column (see read_mw41_data) of a sounding
+    header = parse_mw41_header(file_lines)
+    data = read_mw41_data(file_lines, header)
+    return header, data
+
+#########################
+
+def get_site_date_time(header):  # Get the site (station name, with no spaces or underscores), date ("yyyymmdd") and time ("hhmm") of a sounding, from its header
+    site = re.sub(r"[\s_]+", "-", header["station"].strip())
+    release_time = re.sub(r"\D", "", header["release_time"])
+    if site == "" or len(release_time) < 12:
+        raise ValueError("MW41 header has no \"{}\" or \"{}\"".format(header_keys["station"], header_keys["release_time"]))
+    return site, release_time[0:8], release_time[8:12]
+
+#########################
+
+def get_spc_sounding(file_in, site, date, time, header, data):  # Get a Sounding of the pressure, height, temperature, dewpoint, wind direction and wind speed (m/s) for an "SPC" file, with missing data masked
+
+    sounding = Sounding(file_in, site, date, time, header["lat"], header["lon"], header["altitude"])
+
+    seconds = data["Elapsed time"]
+    wspd = data["Speed"]
+    values = {"pressure": data["P"], "height": data["HeightMSL"], "temperature": data["Temp"], "dewpoint": data["Dewp"], "wind_direction": data["Dir"], "wind_speed": wspd}
+
+    # Mask missing data, dewpoint if temperature is missing (as "EOL" files do with the Qt flag), wind direction if wind speed is 0, and any level before the release
+    before_release = seconds < 0
+    masks = {name: before_release | np.isnan(values[name]) for name in values}
+    masks["dewpoint"] |= masks["temperature"]
+    masks["wind_direction"] |= wspd == 0
+
+    for name in values:
+        sounding.add_column(name, values[name], masks[name], "m/s" if name == "wind_speed" else "")
+    return sounding
+
+###############################################################################
@@ -0,0 +1,108 @@
+### NAME:  parse_cache.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To keep a cache of parsed soundings (the header values and data columns that a
+#             reader gets from the text of a sounding), so that re-running stage 2 or stage 4
+#             (e.g. after changing a QC rule or the output format) does not parse every text
+#             sounding again.
+
+### RESTRICTIONS:
+##   Each parsed sounding is saved as a NumPy ".npz" file in the cache folder, named by the
+#    SHA-256 hash of the sounding's text together with the name and version of the reader:
+
+#    <cache_directory>/3f/3f9a...e1.npz
+
+#    So an entry is only used for exactly the same text read by the same reader. Change the
+#    reader's version whenever what it returns changes, and its old entries are no longer
+#    used (old entries are never removed, so the cache folder can be deleted at any time).
+
+##   Readers need to return (header, data), where header is a dictionary of values that can be
+#    saved as JSON (text, numbers, lists), and data is a dictionary of column name: 1-D NumPy
+#    array. The column order is kept.
+
+##   Entries are written to a temporary file first and then renamed, so parallel runs sharing
+#    a cache folder never read a partly written entry. An entry that cannot be read is
+#    parsed again and replaced.
+
+###############################################################################
+
+import hashlib  # hash library for the cache keys
+import json  # JSON library for the header values
+import os  # operating system library
+import tempfile  # temporary file library
+import zipfile  # zip library (".npz" files are zip files)
+import numpy as np  # numpy library for arrays
+
+cache_version = 1  # version of the cache file layout, part of every key
+
+#########################
+
+def get_cache_key(file_lines, parser_name, parser_version):  # Get the SHA-256 hash of a sounding's text and the reader that parses it
+    key = hashlib.sha256()
+    key.update("{}|{}|{}\n".format(cache_version, parser_name, parser_version).encode("utf-8"))
+    for file_line in file_lines:
+        key.update(file_line.encode("utf-8", "surrogateescape"))
+    return key.hexdigest()
+
+#########################
+
+def get_cache_file_name(cache_directory, key):  # Get the name of the cache file of a key (in a sub-folder named by its first 2 characters, so no folder gets too large)
+    return os.path.join(cache_directory, key[:2], key + ".npz")
+
+#########################
+
+def load_parsed_sounding(cache_directory, key):  # Load a parsed sounding's (header, data) from the cache, or None if it is not there (or cannot be read)
+    cache_file = get_cache_file_name(cache_directory, key)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file, allow_pickle=False) as cached:
+            header = json.loads(str(cached["header"]))
+            columns = json.loads(str(cached["columns"]))
+            data = {}
+            for ind, column in enumerate(columns):
+                data[column] = cached["column_{}".format(ind)]
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    return header, data
+
+#########################
+
+def save_parsed_sounding(cache_directory, key, header, data):  # Save a parsed sounding's (header, data) in the cache
+
+    cache_file = get_cache_file_name(cache_directory, key)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+
+    # Columns are saved by number, as column names (e.g. "U(m/s)") are not always valid file names
+    arrays = {}
+    arrays["header"] = np.array(json.dumps(header))
+    arrays["columns"] = np.array(json.dumps(list(data)))
+    for ind, column in enumerate(data):
+        arrays["column_{}".format(ind)] = np.asarray(data[column])
+
+    # Write to a temporary file first, so a partly written entry is never read
+    fd, temp_file = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(cache_file))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp_file, cache_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+#########################
+
+def read_parsed_sounding(cache_directory, file_lines, parser_name, parser_version, parser):  # Get a sounding's (header, data) from the cache, or parse its lines with parser(file_lines) and cache them (no cache if cache_directory is "")
+
+    if cache_directory == "":
+        return parser(file_lines)
+
+    key = get_cache_key(file_lines, parser_name, parser_version)
+    parsed = load_parsed_sounding(cache_directory, key)
+    if parsed is None:
+        parsed = parser(file_lines)
+        save_parsed_sounding(cache_directory, key, *parsed)
+    return parsed
+
+###############################################################################
@@ -0,0 +1,162 @@
+### NAME:  problem_report.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To keep the problems found in soundings (e.g. the first height far above the
+#             launch altitude, a completely empty file) as structured records, written once
+#             per run as a CSV or JSON Lines file by the stage 1 and 2 scripts, and joined by
+#             key onto the soundings in stage 4.
+
+### RESTRICTIONS:
+##   Each problem is one record:
+
+#       file  - name of the incoming sounding file (e.g. "EOL_MP1_OU_20150713_0300.txt")
+#       site  - site/vehicle name, as "_" separated words (e.g. "MP1_OU", see get_site_key)
+#       date  - date of the sounding, as "YYYYMMDD"
+#       time  - time of the sounding, as "HHMM"
+#       code  - problem code (see problem_codes below)
+#       value - number that goes with the problem (e.g. the altitude difference, the number
+#               of levels filled into a pressure gap), or None
+#       bottom, top - pressures (mb) of the levels below and above a pressure gap, or None
+
+##   The report is written as CSV if its name ends in ".csv", or JSON Lines (one record per
+#    line) if it ends in ".jsonl". It is written to a temporary file first and then renamed,
+#    so it is never seen partly written. Records of files converted again replace their old
+#    records, so runs can be repeated (or only convert some files) without duplicates.
+
+##   Only one process should write a report: parallel workers return their records to the
+#    main process, which writes them all at the end of the run.
+
+##   Stage 4 joins the records onto its soundings by (site, date, time), see get_problem_texts.
+#    The texts are worded as each script has always written them: the "_EOL" codes are only
+#    for the "EOL" to "SPC" scripts (convert_eol2spc.py and convert_csu2spc.py).
+
+##   Reports written before the bottom and top fields were added can still be read (and
+#    updated): their records get None for them.
+
+###############################################################################
+
+import csv  # CSV library
+import json  # JSON library
+import os  # operating system library
+import tempfile  # temporary file library
+
+fields = ["file", "site", "date", "time", "code", "value", "bottom", "top"]  # record fields, in the order written
+number_fields = {"value": float, "bottom": float, "top": float}  # record fields that are numbers (or None): their type
+
+# Problem code: text shown for it in stage 4 ("{}" is replaced by the value)
+problem_codes = {
+    "ALT_DIFF": "Problem (Alt. Diff >= 5) = {:.1f}",
+    "ALT_DIFF_EOL": "PROBLEM (Alt. Diff >= 5) = {:.1f}",
+    "QH_FLAG_THROUGHOUT": "Problem (QH Flag) = 4 THROUGHOUT",
+    "QH_FLAG_INITIALLY": "Problem (QH Flag) = 4 INITIALLY",
+    "BAD_PRESSURES": "Problem (Flag) = BAD PRESSURES",
+    "FILE_EMPTY": "Problem = FILE COMPLETELY EMPTY",
+    "FILE_EMPTY_EOL": "PROBLEM = FILE COMPLETELY EMPTY",
+    "PRESSURE_GAP": "PROBLEM (Missing/Interpolated) = Diff: {:.1f}",
+    "PRESSURE_GAP_FILLED": "FILLED (Log-p Interpolated) = {:.0f} Levels",
+    "PHYSICAL_QC_MASKED": "PROBLEM (Spikes/Superadiabatic/Shear) = {:.0f} Levels Masked",
+}
+bounds_text = " ({:.1f} to {:.1f} mb)"  # text added after a problem that has bounds (e.g. a pressure gap)
+
+#########################
+
+def get_site_key(site):  # Get a site/vehicle name as "_" separated words (e.g. "MP1: OU" and "MP1:OU" are both "MP1_OU")
+    return "_".join(site.replace(":", " ").replace("_", " ").split())
+
+#########################
+
+def get_number(value):  # Get a record number rounded to 1 decimal place (None stays None)
+    if value is None:
+        return None
+    return round(float(value), 1)
+
+#########################
+
+def get_problem_record(file, site, date, time, code, value=None, bottom=None, top=None):  # Get the record of one problem
+    if code not in problem_codes:
+        raise ValueError("unknown problem code \"{}\"".format(code))
+    return {"file": file, "site": get_site_key(site), "date": date, "time": time, "code": code, "value": get_number(value), "bottom": get_number(bottom), "top": get_number(top)}
+
+#########################
+
+def get_problem_text(record):  # Get the text of a problem record, as shown in stage 4 (with its bounds, if it has them)
+    text = problem_codes[record["code"]].format(record["value"])
+    if record["bottom"] is not None and record["top"] is not None:
+        text += bounds_text.format(record["bottom"], record["top"])
+    return text
+
+#########################
+
+def read_records(report_file, record_fields, record_number_fields):  # Get the records of a CSV or JSON Lines table (none if it does not exist), with its number fields as their type (None if blank) and any fields it does not have as None
+
+    if not os.path.exists(report_file):
+        return []
+
+    records = []
+    with open(report_file, "r", newline="") as f:
+        if report_file.endswith(".jsonl"):
+            for line in f:
+                if line.strip() != "":
+                    records.append(json.loads(line))
+        else:
+            for record in csv.DictReader(f):
+                for field, field_type in record_number_fields.items():
+                    record[field] = None if record.get(field, "") in ("", None) else field_type(float(record[field]))
+                records.append(record)
+
+    # Fields not in older tables
+    for record in records:
+        for field in record_fields:
+            record.setdefault(field, None)
+    return records
+
+#########################
+
+def write_records(report_file, records, record_fields):  # Write the records to a CSV or JSON Lines table (through a temporary file, so it is never seen partly written)
+
+    if not report_file.endswith((".csv", ".jsonl")):
+        raise ValueError("table needs to be a \".csv\" or \".jsonl\" file: " + report_file)
+
+    fd, temp_file = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(report_file)))
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            if report_file.endswith(".jsonl"):
+                for record in records:
+                    f.write(json.dumps({field: record[field] for field in record_fields}) + "\n")
+            else:
+                writer = csv.DictWriter(f, fieldnames=record_fields, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(records)
+        os.replace(temp_file, report_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+#########################
+
+def read_problem_report(report_file):  # Get the records of a problem report (none if it does not exist)
+    return read_records(report_file, fields, number_fields)
+
+#########################
+
+def write_problem_report(report_file, records):  # Write the records to a problem report (through a temporary file, so it is never seen partly written)
+    write_records(report_file, records, fields)
+
+#########################
+
+def update_problem_report(report_file, records, files):  # Write the records of the given (converted) files to a problem report, replacing any records they already had there
+    files = set(files)
+    kept_records = [record for record in read_problem_report(report_file) if record["file"] not in files]
+    write_problem_report(report_file, kept_records + list(records))
+
+#########################
+
+def get_problem_texts(records):  # Get the problem texts of each (site, date, time) key, joined together in order
+    problem_texts = {}
+    for record in records:
+        key = (record["site"], record["date"], record["time"])
+        problem_texts[key] = problem_texts.get(key, "") + get_problem_text(record)
+    return problem_texts
+
+###############################################################################
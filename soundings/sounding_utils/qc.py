@@ -0,0 +1,189 @@
+### NAME:  qc.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  Quality control checks shared by the stage 2 "convert_*2spc.py" and
+#             "extract_*2uv.py" scripts, working on whole NumPy arrays at once.
+
+### RESTRICTIONS:
+##   Invalid values are NaN in the arrays (and "-9999" in formatted values).
+
+##   Checks on a Sounding (see "sounding.py") format its values as they are written (e.g.
+#    "%10.2f"), and mask the failing levels in the given columns.
+
+##   Pressure has to be decreasing and height has to be increasing with each level.
+#    A level is compared with the last valid level before it, skipping any invalid
+#    levels in between, and it is dropped if it fails. As dropped levels never lower
+#    the running minimum pressure (or raise the running maximum height), the last
+#    kept level is always the running minimum (or maximum) of every valid level before
+#    it, so the check is one pass with "accumulate", whatever the length of the gaps.
+
+##   The formatted values are compared as text (right-aligned to the same width), as they
+#    always have been, so they are ranked in text order first. This is the same as
+#    comparing the numbers, except for negative values (e.g. a missing value of -999.00).
+
+##   Until a height is kept, heights are instead compared with the launch altitude, and
+#    dropped if they are more than 2 m below it.
+
+##   Physical checks (see mask_physical_outliers) work on the valid values only (NaN levels
+#    are skipped, so a level is compared with the valid levels either side of it), with the
+#    thresholds in physical_thresholds:
+#       - temperature and dewpoint spikes: a value that is more than the threshold above (or
+#         below) both the level before and the level after it. A temperature spike masks the
+#         dewpoint too.
+#       - superadiabatic layers above the surface layer: the temperature and dewpoint of every
+#         level of a layer (at least superadiabatic_depth deep) that cools faster than
+#         superadiabatic_lapse_rate, starting above surface_layer_depth over the launch
+#         altitude (where strong daytime heating makes such layers real).
+#       - wind shear: the wind of both levels where the change in wind (as u and v) between
+#         two adjacent levels is more than wind_shear times their height difference, and more
+#         than wind_shear_min_change (so small changes between closely spaced levels of 1 Hz
+#         data are not counted).
+#    Each check is a few whole-array operations, so it can be left on for every sounding.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+from .resample import get_wind_components  # wind direction and speed to u and v
+from .sounding import format_values  # formats columns with masked values as the invalid value
+
+# Threshold: value used by the physical checks (see RESTRICTIONS and mask_physical_outliers)
+physical_thresholds = {
+    "temperature_spike": 3.0,  # C
+    "dewpoint_spike": 6.0,  # C
+    "surface_layer_depth": 200.0,  # m above the launch altitude
+    "superadiabatic_depth": 100.0,  # m
+    "superadiabatic_lapse_rate": 20.0,  # C/km (about twice the dry adiabatic 9.8 C/km)
+    "wind_shear": 0.1,  # (m/s)/m
+    "wind_shear_min_change": 5.0,  # m/s
+}
+
+#########################
+
+def parse_formatted_values(values, invalid_value="-9999"):  # Get a list of formatted values (e.g. "  936.20") as a float array, with invalid values as NaN
+    if len(values) == 0:
+        return np.array([], dtype=float)
+    formatted = np.array(values)
+    invalid = np.char.find(formatted, invalid_value) >= 0
+    return np.where(invalid, "nan", formatted).astype(float)
+
+#########################
+
+def get_text_order(values, invalid_value="-9999"):  # Get the rank of each formatted value in text order, with invalid values as NaN
+    if len(values) == 0:
+        return np.array([], dtype=float)
+    formatted = np.array(values)
+    order = np.unique(formatted, return_inverse=True)[1].reshape(-1).astype(float)
+    order[np.char.find(formatted, invalid_value) >= 0] = np.nan
+    return order
+
+#########################
+
+def pressure_not_decreasing(p, invalid_value="-9999"):  # Find the valid formatted pressures that are not lower than every valid pressure before them
+
+    order = get_text_order(p, invalid_value)
+    valid = ~np.isnan(order)
+    running_min = np.minimum.accumulate(np.where(valid, order, np.inf))
+    previous_min = np.concatenate(([np.inf], running_min[:-1]))
+    return valid & ~(order < previous_min)
+
+#########################
+
+def height_not_increasing(h, altitude, invalid_value="-9999"):  # Find the valid formatted heights that are not higher than every valid height before them (or more than 2 m below the launch altitude, until one is kept)
+
+    order = get_text_order(h, invalid_value)
+    valid = ~np.isnan(order)
+    started = np.logical_or.accumulate(valid & ~(parse_formatted_values(h, invalid_value) - altitude < -2))
+    running_max = np.maximum.accumulate(np.where(valid & started, order, -np.inf))
+    previous_max = np.concatenate(([-np.inf], running_max[:-1]))
+    return valid & ~(started & (order > previous_max))
+
+#########################
+
+def mask_pressure_not_decreasing(sounding, names, width=8):  # Mask the given columns of a Sounding at the levels where the pressure (as written, to 2 decimal places) is not decreasing
+    p = format_values(sounding.values("pressure"), 2, width)
+    sounding.mask_levels(pressure_not_decreasing(p), names)
+
+#########################
+
+def mask_height_not_increasing(sounding, names, decimals=2, width=10):  # Mask the given columns of a Sounding at the levels where the height (as written) is not increasing
+    h = format_values(sounding.values("height"), decimals, width)
+    sounding.mask_levels(height_not_increasing(h, sounding.altitude), names)
+
+#########################
+
+def find_spikes(values, threshold):  # Find the valid values that are more than the threshold above both valid values either side of them, or below both
+
+    spikes = np.zeros(len(values), dtype=bool)
+    levels = np.flatnonzero(~np.isnan(values))
+    if len(levels) < 3:
+        return spikes
+    valid_values = values[levels]
+    diff_before = valid_values[1:-1] - valid_values[:-2]
+    diff_after = valid_values[1:-1] - valid_values[2:]
+    spikes[levels[1:-1]] = (diff_before * diff_after > 0) & (np.minimum(np.abs(diff_before), np.abs(diff_after)) > threshold)
+    return spikes
+
+#########################
+
+def find_superadiabatic_layers(temperature, height, altitude, depth, lapse_rate, surface_layer_depth):  # Find the levels of the layers (at least depth deep, starting surface_layer_depth above the launch altitude) that cool faster than the lapse rate (C/km)
+
+    superadiabatic = np.zeros(len(temperature), dtype=bool)
+    levels = np.flatnonzero(~np.isnan(temperature) & ~np.isnan(height))
+    if len(levels) < 2:
+        return superadiabatic
+    t = temperature[levels]
+    z = height[levels]
+
+    # Top of each layer: the first level at least depth above its bottom
+    top = np.searchsorted(z, z + depth)
+    has_top = top < len(z)
+    top = np.minimum(top, len(z) - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        layer_lapse_rate = -(t[top] - t) / (z[top] - z) * 1000
+    bottom = np.flatnonzero(has_top & (z - altitude >= surface_layer_depth) & (layer_lapse_rate > lapse_rate))
+
+    # Every level from the bottom to the top of each layer (counting where layers start and end)
+    in_layer = np.zeros(len(z) + 1, dtype=np.int64)
+    np.add.at(in_layer, bottom, 1)
+    np.add.at(in_layer, top[bottom] + 1, -1)
+    superadiabatic[levels] = np.cumsum(in_layer[:-1]) > 0
+    return superadiabatic
+
+#########################
+
+def find_wind_shear(wind_direction, wind_speed, height, shear, min_change):  # Find both levels of each pair of adjacent valid levels whose change in wind (m/s) is more than shear times their height difference, and more than min_change
+
+    sheared = np.zeros(len(wind_speed), dtype=bool)
+    u, v = get_wind_components(wind_direction, wind_speed)  # 0 where the wind is calm
+    levels = np.flatnonzero(~np.isnan(u) & ~np.isnan(v) & ~np.isnan(height))
+    if len(levels) < 2:
+        return sheared
+    change = np.hypot(np.diff(u[levels]), np.diff(v[levels]))
+    pairs = np.flatnonzero((change > shear * np.abs(np.diff(height[levels]))) & (change > min_change))
+    sheared[levels[pairs]] = True
+    sheared[levels[pairs + 1]] = True
+    return sheared
+
+#########################
+
+def mask_physical_outliers(sounding, thresholds=None):  # Mask the temperature and dewpoint spikes, superadiabatic layers above the surface layer, and unrealistic wind shear of a Sounding (with physical_thresholds, or any of them given in thresholds), and return the number of levels masked
+
+    limits = dict(physical_thresholds)
+    limits.update(thresholds or {})
+    temperature = sounding.values("temperature")
+    dewpoint = sounding.values("dewpoint")
+    height = sounding.values("height")
+
+    temperature_bad = find_spikes(temperature, limits["temperature_spike"])
+    temperature_bad |= find_superadiabatic_layers(temperature, height, sounding.altitude, limits["superadiabatic_depth"], limits["superadiabatic_lapse_rate"], limits["surface_layer_depth"])
+    dewpoint_bad = find_spikes(dewpoint, limits["dewpoint_spike"])
+    wind_bad = find_wind_shear(sounding.values("wind_direction"), sounding.values("wind_speed", "m/s"), height, limits["wind_shear"], limits["wind_shear_min_change"])
+
+    sounding.mask_levels(temperature_bad, ["temperature", "dewpoint"])
+    sounding.mask_levels(dewpoint_bad, ["dewpoint"])
+    sounding.mask_levels(wind_bad, ["wind_direction", "wind_speed"])
+    return int(np.count_nonzero(temperature_bad | dewpoint_bad | wind_bad))
+
+###############################################################################
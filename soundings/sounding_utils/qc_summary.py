@@ -0,0 +1,133 @@
+### NAME:  qc_summary.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To count the questionable, bad and missing levels of each QC flag of a sounding
+#             (overall, and in height bands above the launch altitude), and keep them in one
+#             summary table for the whole campaign, written once per run by the stage 2 scripts.
+#             So poor soundings can be found (and left out, or looked at) before they are run
+#             through SHARPpy in stage 3, instead of after.
+
+### RESTRICTIONS:
+##   Each count is one row of the summary table:
+
+#       file, site, date, time - as in the problem report (see "problem_report.py")
+#       flag     - QC flag name, as in the incoming data (e.g. "Qp", "QT")
+#       variable - what the flag is for (e.g. "pressure", "wind")
+#       band     - "all" levels, or a height band above the launch altitude (m), e.g. "0-1000"
+#       levels   - number of levels (in the band)
+#       questionable, bad, missing - number of levels with each kind of flag value
+#       questionable_fraction, bad_fraction, missing_fraction - the same as a fraction of
+#                  levels (blank if the band has no levels)
+
+##   The flag values of each kind differ between the file formats (see flag_schemes):
+#       "eol": 2 = questionable, 3 = bad, 9 or 99 = missing
+#       "hgt": 3 = questionable, 4 or 5 = bad (objectively or visually), 9 = missing
+#    Soundings without QC flags (e.g. UAH and MW41) have no rows.
+
+##   A level is put in a height band by its height as read (rounded back to its decimal places,
+#    see Sounding.values, so a level at the launch altitude is at 0 m), even if the height is
+#    masked (e.g. where the pressure is bad, or dropped by the monotonic checks), so the flags
+#    of bad levels are still counted in their band. Levels whose height is missing (NaN, or a
+#    missing value far out of range, see height_limits) are only counted in "all".
+
+##   All flags and bands of a sounding are counted at once: one (levels x flags) array per kind
+#    of flag value, multiplied by a (levels x bands) array of which band each level is in.
+
+##   The table is written as CSV if its name ends in ".csv", or JSON Lines if it ends in
+#    ".jsonl", in the same way as the problem report: rows of files converted again replace
+#    their old rows.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+from .problem_report import get_site_key, read_records, write_records  # site names, and reading and writing CSV or JSON Lines tables
+
+fields = ["file", "site", "date", "time", "flag", "variable", "band", "levels", "questionable", "bad", "missing",
+          "questionable_fraction", "bad_fraction", "missing_fraction"]  # row fields, in the order written
+number_fields = {"levels": int, "questionable": int, "bad": int, "missing": int,
+                 "questionable_fraction": float, "bad_fraction": float, "missing_fraction": float}  # row fields that are numbers (or None): their type
+kinds = ["questionable", "bad", "missing"]  # kinds of flag values counted
+
+# File format: QC flag name: variable, and the flag values of each kind
+flag_schemes = {
+    "eol": {
+        "flags": {"Qp": "pressure", "Qt": "temperature", "Qrh": "rh", "Qu": "wind_u", "Qv": "wind_v"},
+        "questionable": (2,),
+        "bad": (3,),
+        "missing": (9, 99),
+    },
+    "hgt": {
+        "flags": {"QP": "pressure", "QH": "height", "QT": "temperature", "QD": "dewpoint", "QW": "wind"},
+        "questionable": (3,),
+        "bad": (4, 5),
+        "missing": (9,),
+    },
+}
+height_bands = [0, 1000, 3000, 6000, 10000]  # bottom of each height band above the launch altitude (m), the last band has no top
+height_limits = (-500, 50000)  # heights above the launch altitude (m) outside these are counted as missing (e.g. 99999.0)
+fraction_decimals = 4  # decimal places fractions are rounded to
+
+#########################
+
+def get_band_names(bands):  # Get the name of each height band (e.g. "0-1000", "10000+")
+    names = ["{}-{}".format(bottom, top) for bottom, top in zip(bands[:-1], bands[1:])]
+    return names + ["{}+".format(bands[-1])]
+
+#########################
+
+def get_height_bands(sounding, bands):  # Get the height band (index into bands) of each level of a Sounding (masked or not), -1 if its height is missing, out of range or below the first band
+    height = sounding.values("height", masked=False) - sounding.altitude
+    in_range = np.isfinite(height) & (height >= height_limits[0]) & (height <= height_limits[1])
+    band = np.searchsorted(bands, np.where(in_range, height, -np.inf), side="right") - 1
+    return band
+
+#########################
+
+def get_fraction(count, levels):  # Get a count as a fraction of the levels (None if there are no levels)
+    if levels == 0:
+        return None
+    return round(count / levels, fraction_decimals)
+
+#########################
+
+def get_flag_statistics(file, site, date, time, sounding, scheme, bands=height_bands):  # Get the summary rows of the QC flags of a Sounding (see RESTRICTIONS), none if it has none of the scheme's flags
+
+    flag_names = [flag for flag in flag_schemes[scheme]["flags"] if flag in sounding.flags]
+    if flag_names == [] or len(sounding) == 0:
+        return []
+    flags = np.column_stack([sounding.flags[flag] for flag in flag_names])
+
+    # Levels in each band (levels x bands), and levels of each kind for each flag (levels x flags)
+    in_band = get_height_bands(sounding, bands)[:, None] == np.arange(len(bands))
+    band_levels = [len(flags)] + in_band.sum(axis=0).tolist()
+    counts = {}
+    for kind in kinds:
+        is_kind = np.isin(flags, flag_schemes[scheme][kind]).astype(np.int64)
+        counts[kind] = np.vstack([is_kind.sum(axis=0), in_band.T.astype(np.int64) @ is_kind]).tolist()  # (all + bands) x flags
+
+    rows = []
+    for f, flag in enumerate(flag_names):
+        for b, band in enumerate(["all"] + get_band_names(bands)):
+            row = {"file": file, "site": get_site_key(site), "date": date, "time": time, "flag": flag,
+                   "variable": flag_schemes[scheme]["flags"][flag], "band": band, "levels": band_levels[b]}
+            for kind in kinds:
+                row[kind] = counts[kind][b][f]
+                row[kind + "_fraction"] = get_fraction(counts[kind][b][f], band_levels[b])
+            rows.append(row)
+    return rows
+
+#########################
+
+def read_qc_summary(summary_file):  # Get the rows of a QC summary table (none if it does not exist)
+    return read_records(summary_file, fields, number_fields)
+
+#########################
+
+def update_qc_summary(summary_file, rows, files):  # Write the rows of the given (converted) files to a QC summary table, replacing any rows they already had there
+    files = set(files)
+    kept_rows = [row for row in read_qc_summary(summary_file) if row["file"] not in files]
+    write_records(summary_file, kept_rows + list(rows), fields)
+
+###############################################################################
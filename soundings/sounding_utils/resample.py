@@ -0,0 +1,217 @@
+### NAME:  resample.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To thin out the levels of a sounding written to an "SPC" file to set height or
+#             pressure spacings, keeping its significant levels. 1 Hz radiosondes give "SPC"
+#             files with thousands of levels, and SHARPpy (stage 3) slows down with the number of
+#             levels (creating the profile, lifting parcels, plotting wind barbs).
+
+### RESTRICTIONS:
+##   Works on the "%RAW%" block of spc_writer.py: a (levels x 6) float array of pressure (mb),
+#    height (m), temperature (C), dewpoint (C), wind direction (deg) and wind speed (kt) of the
+#    levels written (valid pressure, decreasing upwards), with NaN for masked values. Blocks
+#    of fewer than 3 levels, or with a pressure that is not above 0 (e.g. a -999.00 "Hgt"
+#    missing value) or not decreasing upwards, are written as they are.
+
+##   The spacings are given as bands of (top, spacing), from the surface up:
+#       "height":   top in m above the first level, spacing in m   e.g. [(1000, 10), (3000, 25), (10000, 50), (30000, 100)]
+#       "pressure": top in mb, spacing in mb                        e.g. [(700, 2), (300, 5), (0, 10)]
+#    The spacing of the last band carries on up to the top of the sounding. Height levels are
+#    at whole multiples of the spacing above the first level, and pressure levels at whole
+#    multiples of the spacing (e.g. 850, 845, 840 mb).
+
+##   Every column is interpolated linearly in log pressure (height levels are first given the
+#    pressure they are at the same way). Wind is interpolated as its u and v components, and
+#    turned back into direction and speed.
+
+##   A value is only interpolated between two valid values of its column that are no further
+#    apart (in height or pressure) than the spacing there. Where they are further apart
+#    (missing data), it is left masked, so resampling never fills in missing data.
+
+##   Levels resampled to where every column is left masked (e.g. in a gap of missing data) are
+#    not written, so no level is only a pressure (and height) with every other value "-9999".
+
+##   Wind is calm (u and v of 0) where its speed is 0, even though its direction is masked
+#    there, and its direction is masked again wherever the resampled speed is 0.
+
+##   Significant levels are kept as they are: the first and last level, the first and last
+#    valid value of each column (e.g. the surface values a parcel is lifted from), and any
+#    level where the resampled profile would otherwise be further from the original one than
+#    significant_tolerances (e.g. the base and top of an inversion, the top of a moist layer,
+#    a wind maximum). As in Douglas-Peucker line simplification, the level furthest from the
+#    resampled profile between each two kept levels is kept, until every level is close
+#    enough.
+
+##   The tolerances are close to the WMO significant level criteria (1 C of temperature, and
+#    7.5 kt of u and v, so at most about 10 kt or 5 m/s of wind). Tighter ones mostly keep the
+#    noise of 1 Hz data: each level further off than a tolerance is kept, and 1 Hz winds are
+#    often 1 to 2 kt off the profile. With the default bands, a 5000 level (1 Hz, 25 km)
+#    sounding is written with about 10 times fewer levels if its wind is within 1 m/s of a
+#    smooth profile, and about 5 times fewer at 1.5 m/s (see "tests/test_resample.py").
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+significant_tolerances = {"temperature": 1.0, "dewpoint": 3.0, "u": 7.5, "v": 7.5}  # most a column (C, C, kt, kt) may be off its original values before a significant level is kept (see RESTRICTIONS)
+max_iterations = 100  # most rounds of adding significant levels
+
+#########################
+
+def get_wind_components(wind_direction, wind_speed):  # Get the u and v components of wind direction and speed (0 where the wind is calm, as its direction is masked there)
+    u = -wind_speed * np.sin(np.radians(wind_direction))
+    v = -wind_speed * np.cos(np.radians(wind_direction))
+    calm = wind_speed == 0
+    u[calm], v[calm] = 0, 0
+    return u, v
+
+#########################
+
+def get_wind_direction_speed(u, v):  # Get the wind direction and speed of u and v components
+    return np.degrees(np.arctan2(-u, -v)) % 360, np.hypot(u, v)
+
+#########################
+
+def get_band_limits(by, bands, surface):  # Get the origin of the levels and the top (as coordinate) and spacing of each band, checking the bands
+    if by not in ("height", "pressure"):
+        raise ValueError("can only resample by \"height\" or \"pressure\", not \"{}\"".format(by))
+    if len(bands) == 0 or any(spacing <= 0 for top, spacing in bands):
+        raise ValueError("resampling bands need to be (top, spacing) pairs with spacing above 0: {}".format(bands))
+
+    # The coordinate increases upwards: height, or minus the pressure
+    if by == "height":
+        origin = surface
+        tops = np.array([surface + top for top, spacing in bands], dtype=float)
+    else:
+        origin = 0.0
+        tops = np.array([-top for top, spacing in bands], dtype=float)
+    tops[-1] = np.inf  # the last spacing carries on up to the top of the sounding
+    return origin, tops, np.array([spacing for top, spacing in bands], dtype=float)
+
+#########################
+
+def get_spacing(coordinate, tops, spacings):  # Get the spacing at each coordinate value
+    return spacings[np.minimum(np.searchsorted(tops, coordinate), len(spacings) - 1)]
+
+#########################
+
+def get_target_levels(coordinate, origin, tops, spacings):  # Get the coordinate of each level to resample to, from the first to the last valid coordinate
+    bottom = coordinate[0]
+    targets = [coordinate[:1]]
+    for top, spacing in zip(tops, spacings):
+        top = min(top, coordinate[-1])
+        first = np.ceil((bottom - origin) / spacing)
+        last = np.floor((top - origin) / spacing)
+        targets.append(origin + spacing * np.arange(first, last + 1))
+        bottom = top
+        if bottom >= coordinate[-1]:
+            break
+    return np.unique(np.concatenate(targets))
+
+#########################
+
+def interpolate_column(x_out, x, values, coordinate, spacing_out):  # Interpolate a column to the log pressures x_out, leaving NaN where its valid values are too far apart (see RESTRICTIONS)
+
+    valid = ~np.isnan(values)
+    x_valid = x[valid]
+    if len(x_valid) == 0:
+        return np.full(len(x_out), np.nan)
+
+    above = np.searchsorted(x_valid, x_out, side="right")  # x_valid[above - 1] <= x_out < x_valid[above]
+    below = np.maximum(above - 1, 0)
+    above = np.minimum(above, len(x_valid) - 1)
+    exact = x_valid[below] == x_out
+    gap = coordinate[valid][above] - coordinate[valid][below]
+    inside = (x_out > x_valid[0]) & (x_out < x_valid[-1])
+
+    resampled = np.interp(x_out, x_valid, values[valid])
+    resampled[~(exact | (inside & (gap <= spacing_out)))] = np.nan
+    return resampled
+
+#########################
+
+def get_significant_levels(x, target_x, columns):  # Find the levels to keep as they are: the first and last (and first and last valid value of each column), and the ones needed to keep the resampled profile within significant_tolerances
+
+    keep = np.zeros(len(x), dtype=bool)
+    keep[[0, -1]] = True
+    for values in columns.values():
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) > 0:
+            keep[valid[[0, -1]]] = True  # first and last valid value of each column
+    for _ in range(max_iterations):
+
+        # How far each level is from the profile resampled to the targets and kept levels (as a fraction of the tolerance)
+        x_out = np.union1d(target_x, x[keep])
+        error = np.zeros(len(x))
+        for name, tolerance in significant_tolerances.items():
+            valid = ~np.isnan(columns[name])
+            if np.count_nonzero(valid) < 2:
+                continue
+            resampled = np.interp(x_out, x[valid], columns[name][valid])
+            error[valid] = np.maximum(error[valid], np.abs(np.interp(x[valid], x_out, resampled) - columns[name][valid]) / tolerance)
+        error[keep] = 0
+
+        # Keep the level furthest off between each two resampled levels, if it is off by more than the tolerance
+        intervals = np.searchsorted(x_out, x)
+        order = np.lexsort((error, intervals))
+        furthest = order[np.append(intervals[order][1:] != intervals[order][:-1], True)]
+        furthest = furthest[error[furthest] > 1]
+        if len(furthest) == 0:
+            break
+        keep[furthest] = True
+    return keep
+
+#########################
+
+def resample_levels(values, by, bands):  # Resample a "%RAW%" block (levels x 6 array) to the spacings of the bands (see RESTRICTIONS), keeping its significant levels
+
+    pressure, height, temperature, dewpoint, wind_direction, wind_speed = values.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = -np.log(pressure)  # log pressure, increasing upwards
+    if len(x) < 3 or np.any(~np.isfinite(x)) or np.any(np.diff(x) <= 0):
+        return values
+
+    # Coordinate (increasing upwards) of every level: height (interpolated where it is masked), or minus the pressure
+    if by == "height":
+        valid = ~np.isnan(height)
+        valid[valid] = np.append(True, np.diff(height[valid]) > 0)  # only strictly increasing heights
+        if np.count_nonzero(valid) < 2:
+            return values
+        coordinate = np.interp(x, x[valid], height[valid])
+        surface = height[valid][0]
+    else:
+        valid = np.ones(len(x), dtype=bool)
+        coordinate = -pressure
+        surface = pressure[0]
+    origin, tops, spacings = get_band_limits(by, bands, surface)
+
+    # Log pressure of each level to resample to
+    target_coordinate = get_target_levels(coordinate[valid], origin, tops, spacings)
+    if by == "height":
+        target_x = np.interp(target_coordinate, height[valid], x[valid])
+    else:
+        target_x = -np.log(-target_coordinate)
+
+    # Add the significant levels
+    u, v = get_wind_components(wind_direction, wind_speed)
+    columns = {"height": height, "temperature": temperature, "dewpoint": dewpoint, "u": u, "v": v}
+    keep = get_significant_levels(x, target_x, columns)
+    x_out = np.union1d(target_x, x[keep])
+    spacing_out = get_spacing(np.interp(x_out, x, coordinate), tops, spacings)
+
+    # Interpolate every column (wind direction is masked where the wind is calm)
+    resampled = {name: interpolate_column(x_out, x, column, coordinate, spacing_out) for name, column in columns.items()}
+    resampled_direction, resampled_speed = get_wind_direction_speed(resampled["u"], resampled["v"])
+    resampled_direction[resampled_speed == 0] = np.nan
+    resampled_pressure = np.exp(-x_out)
+
+    # Leave out levels with the same pressure (to 2 decimal places) as the level before, and levels resampled to that have no values (only kept levels are written as they are)
+    rounded = np.round(resampled_pressure, 2)
+    levels = np.append(True, rounded[1:] != rounded[:-1])
+    value_names = ["temperature", "dewpoint", "u", "v"] + (["height"] if by == "pressure" else [])
+    has_values = np.any([~np.isnan(resampled[name]) for name in value_names], axis=0)
+    levels &= has_values | np.isin(x_out, x[keep])
+    return np.column_stack([resampled_pressure, resampled["height"], resampled["temperature"], resampled["dewpoint"], resampled_direction, resampled_speed])[levels]
+
+###############################################################################
@@ -0,0 +1,141 @@
+### NAME:  sounding.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  The one data model of a sounding shared by every stage 2 reader ("EOL", "Hgt",
+#             UAH) and writer ("SPC", "UV"): its metadata, one NumPy column per variable,
+#             and a QC mask per column, so that the readers, quality control checks and
+#             writers all work on the same arrays instead of each keeping its own lists.
+
+### RESTRICTIONS:
+##   Column names used by the readers and writers (units in brackets):
+#       pressure (mb), height (m MSL), temperature (C), dewpoint (C),
+#       wind_direction (deg), wind_speed (m/s or kt, see below), u (m/s), v (m/s)
+
+##   Columns are stored as float32 when that loses nothing: the values are checked for the
+#    fewest decimal places they are given to (at most max_decimals, e.g. 1 for "936.2"), and
+#    if float32 values rounded back to those decimal places are exactly the same numbers,
+#    float32 is kept (half the memory). Otherwise (e.g. a dewpoint calculated from RH) the
+#    column is kept as float64. Either way values() returns exactly the numbers that were
+#    added, so the output files do not change.
+
+##   Wind speed is stored in the units of the incoming data ("m/s" or "kt"), and converted
+#    by values() when the writer needs the other one, so it is only converted once.
+
+##   Masks are True where a value is bad or missing. values() returns NaN there, which the
+#    writers output as the invalid value "-9999". The values under a mask are kept, so
+#    checks can still see what was there.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+invalid_value = "-9999"
+max_decimals = 6  # most decimal places looked for when storing a column as float32
+knots_per_mps = 1.94384  # knots in 1 m/s
+
+#########################
+
+def get_decimals(values):  # Get the fewest decimal places (at most max_decimals) that the finite values are given to, or None
+    finite = values[np.isfinite(values)]
+    for decimals in range(max_decimals + 1):
+        if np.array_equal(np.round(finite, decimals), finite):
+            return decimals
+    return None
+
+#########################
+
+def compact_values(values):  # Get a column as float32 and its decimal places, if they give back exactly the same values, otherwise as float64 and None
+
+    values = np.asarray(values, dtype=np.float64)
+    decimals = get_decimals(values)
+    if decimals is not None:
+        compact = values.astype(np.float32)
+        finite = np.isfinite(values)
+        restored = np.round(compact[finite].astype(np.float64), decimals)
+        if np.array_equal(restored, values[finite]) and np.array_equal(np.isnan(compact), np.isnan(values)):
+            return compact, decimals
+    return values.copy(), None
+
+#########################
+
+def convert_units(values, units_from, units_to):  # Convert wind speeds between "m/s" and "kt" (the same arithmetic as the scripts always used)
+    if units_from == units_to:
+        return values
+    if (units_from, units_to) == ("m/s", "kt"):
+        return values * knots_per_mps
+    if (units_from, units_to) == ("kt", "m/s"):
+        return values / knots_per_mps
+    raise ValueError("cannot convert \"{}\" to \"{}\"".format(units_from, units_to))
+
+#########################
+
+def format_values(values, decimals, width):  # Format numbers right-aligned to the given decimal places (as "%10.2f"), with NaN as the invalid value, as a text array
+    formatted = np.char.mod("%{}.{}f".format(width, decimals), values)
+    formatted[np.isnan(values)] = "{0:>{1}s}".format(invalid_value, width)
+    return formatted
+
+#########################
+
+def round_values(values, decimals):  # Round numbers to the given decimal places exactly as formatting them does ("%.2f"), with NaN kept as NaN
+    rounded = np.round(values, decimals)
+    scaled = np.abs(values) * 10**decimals
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6  # np.round can round these the other way (e.g. 936.125)
+    rounded[near_half] = [float("%.{}f".format(decimals) % value) for value in values[near_half]]
+    return rounded
+
+#########################
+
+class Sounding:  # One sounding: its metadata, one column (NumPy array) per variable, and a QC mask per column
+
+    __slots__ = ("file_in", "site", "date", "time", "lat", "lon", "altitude", "columns", "decimals", "units", "masks", "flags", "info")
+
+    def __init__(self, file_in, site, date, time, lat, lon, altitude):
+        self.file_in = file_in  # name of the incoming file (or "virtual" EOL file)
+        self.site = site  # site or vehicle name, as written in the output headers
+        self.date = date  # date text, as written in the output headers
+        self.time = time  # time text, as written in the output headers
+        self.lat = lat  # latitude text ("{:.5f}", "" if missing)
+        self.lon = lon  # longitude text ("{:.5f}", "" if missing)
+        self.altitude = altitude  # launch altitude (m MSL)
+        self.columns = {}  # column name: float32 (or float64) array
+        self.decimals = {}  # column name: decimal places float32 values are rounded back to (None for float64 columns)
+        self.units = {}  # column name: units ("" if none given)
+        self.masks = {}  # column name: bool array, True where the value is bad or missing
+        self.flags = {}  # QC flag name (as in the incoming data, e.g. "Qp", "QH"): flag array
+        self.info = {}  # anything else about the sounding that a reader passes on (e.g. "flag": "BAD PRESSURES")
+
+    def __len__(self):  # Number of levels
+        for values in self.columns.values():
+            return len(values)
+        return 0
+
+    def add_column(self, name, values, mask=None, units=""):  # Add a column of values (and its mask, if any)
+        self.columns[name], self.decimals[name] = compact_values(values)
+        self.units[name] = units
+        if mask is None:
+            mask = np.zeros(len(self.columns[name]), dtype=bool)
+        self.masks[name] = np.array(mask, dtype=bool)
+
+    def add_flags(self, name, values):  # Add a QC flag column (small whole numbers, so always float32)
+        self.flags[name] = np.asarray(values, dtype=np.float32)
+
+    def values(self, name, units=None, masked=True):  # Get a column as float64 (in the given units, if not the stored ones), with masked values as NaN (or as they were added, if masked is False)
+        values = self.columns[name].astype(np.float64)
+        if self.decimals[name] is not None:
+            values = np.round(values, self.decimals[name])
+        if units is not None:
+            values = convert_units(values, self.units[name], units)
+        if masked:
+            values[self.masks[name]] = np.nan
+        return values
+
+    def mask_levels(self, levels, names=None):  # Mask the given levels (bool array or indices) in the given columns (default all)
+        for name in (self.columns if names is None else names):
+            self.masks[name][levels] = True
+
+    def nbytes(self):  # Memory used by the columns, masks and flags, in bytes
+        arrays = list(self.columns.values()) + list(self.masks.values()) + list(self.flags.values())
+        return sum(array.nbytes for array in arrays)
+
+###############################################################################
@@ -0,0 +1,134 @@
+### NAME:  spc_writer.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To write a Sounding (see "sounding.py") in "SPC" file format, which SHARPpy can
+#             read and simulate, for all the stage 2 "convert_*2spc.py" scripts.
+
+### RESTRICTIONS:
+##   OUTGOING data is in the "SPC" file format as shown below:
+
+#%TITLE%
+# SCOUT1   181110/1659 -31.72817,-63.84490
+#
+#   LEVEL       HGHT       TEMP       DWPT       WDIR       WSPD
+#-------------------------------------------------------------------
+#%RAW%
+#  963.20,    311.40,     35.00,     19.34,    196.00,     13.61
+#  962.80,    315.00,     34.26,     18.68,    196.10,     13.63
+#%END%
+
+##   The Sounding needs the columns "pressure", "height", "temperature", "dewpoint",
+#    "wind_direction" and "wind_speed" (written in knots). Masked values are written as
+#    "-9999".
+
+##   A level is only written if its pressure is valid, and not the same (to 2 decimal places)
+#    as the level before. The first level is compared with the last one, as it always was.
+#    Both checks are made on the pressures rounded to 2 decimal places as numbers (exactly as
+#    "%8.2f" rounds them, see round_values in "sounding.py"), so no text is formatted for them.
+
+##   Pressure gaps (a drop of 20 mb or more between two written levels, from missing or
+#    interpolated data) are found with np.diff of the same rounded pressures. Each gap is kept
+#    with its bounds: the pressures of the written levels below and above it.
+
+##   Gaps smaller than a size given can be filled with levels interpolated in log pressure (see
+#    "gap_fill.py"), before any resampling. The gaps are still those of the levels before
+#    filling, each with the number of levels filled into it.
+
+##   The whole "%RAW%" block is formatted in one pass: the written levels are put into one
+#    (levels x 6) float array, and formatted with one fixed-width format string for the whole
+#    block ("%8.2f,%10.2f,...", one row per line). Masked values (NaN) come out as "nan"
+#    right-aligned to the column width, and are then replaced by "-9999" of the same width,
+#    so the text is exactly what formatting each value on its own gives.
+
+##   The levels written can be resampled to set height or pressure spacings, keeping the
+#    significant levels (see "resample.py"). The first height and the pressure gaps reported
+#    as problems are still those of the levels before resampling.
+
+##   Files are written piece by piece through a buffered file, so the whole file text is
+#    never put together as one string.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+from .gap_fill import fill_gaps  # fills small pressure gaps with levels interpolated in log pressure
+from .resample import resample_levels  # resamples the "%RAW%" block to set height or pressure spacings
+from .sounding import invalid_value, round_values  # invalid value text, and rounds columns exactly as they are formatted
+
+column_names = ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"]  # columns of the "%RAW%" block, in order
+column_units = {"wind_speed": "kt"}  # units columns are written in, if not the stored ones
+row_format = "%8.2f,%10.2f,%10.2f,%10.2f,%10.2f,%10.2f"  # one "%RAW%" line
+write_buffer_size = 1024 * 1024  # bytes buffered before each write to the file
+min_pressure_gap = 20  # smallest pressure drop (mb) between written levels reported as a gap
+
+#########################
+
+def get_written_levels(pressure):  # Find the levels that are written, from the pressures rounded to 2 decimal places: valid (not NaN, and not written as "-9999"), and not the same as the level before
+    return ~np.isnan(pressure) & (pressure > -9999) & (pressure != np.roll(pressure, 1))
+
+#########################
+
+def get_pressure_gaps(pressure):  # Get each pressure drop of min_pressure_gap or more between written levels (missing or interpolated data), as {"difference", "bottom", "top"} (mb) and the written level below it ("level")
+    pressure_diff = np.diff(pressure)
+    gaps = np.flatnonzero(pressure_diff <= -min_pressure_gap)
+    return [{"difference": pressure_diff[i], "bottom": pressure[i], "top": pressure[i + 1], "level": i} for i in gaps.tolist()]
+
+#########################
+
+def format_spc_block(values):  # Format a (levels x 6) float array as "%RAW%" data lines, with NaN as the invalid value
+    block_format = "\n".join([row_format] * len(values))
+    return (block_format % tuple(values.ravel().tolist())).replace("  nan", invalid_value)
+
+#########################
+
+def get_spc_data(sounding, resample_by="", resample_bands=(), fill_gaps_below=0, fill_gaps_spacing=5):  # Get the "%RAW%" data lines of a Sounding (with its gaps smaller than fill_gaps_below mb filled every fill_gaps_spacing mb, and resampled by "height" or "pressure" to the given bands, if any), the first height written (launch altitude if nothing is) and its pressure gaps (see get_pressure_gaps, with the number of levels filled into each as "filled")
+
+    pressure = round_values(sounding.values("pressure"), 2)
+    levels = get_written_levels(pressure)
+
+    values = np.column_stack([sounding.values(name, column_units.get(name))[levels] for name in column_names])
+    if len(values) > 0:
+        h_init = round_values(values[:1, 1], 2)[0]
+        if np.isnan(h_init):
+            h_init = float(invalid_value)
+    else:
+        h_init = sounding.altitude
+    pressure_gaps = get_pressure_gaps(pressure[levels])
+
+    values = fill_gaps(values, pressure_gaps, fill_gaps_below, fill_gaps_spacing)
+    if resample_by != "":
+        values = resample_levels(values, resample_by, resample_bands)
+    spc_data = format_spc_block(values)
+    return spc_data, h_init, pressure_gaps
+
+#########################
+
+def get_header(sounding):  # Get the header lines of an "SPC" file, up to and including "%RAW%"
+
+    # Construct site header
+    site_header = " {}   {}/{} {},{}".format(sounding.site, sounding.date, sounding.time, sounding.lat, sounding.lon)
+
+    # Construct data header
+    pressure = "LEVEL"
+    height = "HGHT"
+    temp = "TEMP"
+    dwpt = "DWPT"
+    wdir = "WDIR"
+    wspd = "WSPD"
+
+    data_header = "   {}       {}       {}       {}       {}       {}".format(pressure, height, temp, dwpt, wdir, wspd)
+
+    return ("%TITLE%" + "\n" + site_header + "\n\n" + data_header + "\n"
+            + "-------------------------------------------------------------------"
+            + "\n" + "%RAW%" + "\n")
+
+#########################
+
+def write_spc_file(file_out, sounding, spc_data):  # Write an "SPC" file, from its "%RAW%" data lines
+    with open(file_out, "w", buffering=write_buffer_size) as f:
+        f.write(get_header(sounding))
+        f.write(spc_data)
+        f.write("\n" + "%END%")
+
+###############################################################################
@@ -0,0 +1,95 @@
+### NAME:  split_manifest.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To keep a manifest of the ".cls" files that have already been split, so that
+#             a re-run only splits the "CLS" files that are new or have changed since, and
+#             only removes or rewrites the outputs of those files.
+
+### RESTRICTIONS:
+##   The manifest is saved as "split_manifest.json" in the folder of the "CLS" files, with
+#    an entry for each "CLS" file name:
+
+#    {"project": "PECAN", "size": 123456, "mtime_ns": 1592870400000000000, "sha256": "...",
+#     "settings": {...}, "eol_files": ["EOL_FP4_MINDEN_20150625_0001.txt", ...]}
+
+##   A "CLS" file is unchanged if its size and modification time are the same as in its
+#    entry, or, if only the modification time differs (e.g. after copying the archive),
+#    if its content hash is the same. The "settings" (output locations, which outputs
+#    are written, and the settings of any conversion) must also be the same, otherwise
+#    the file is split again. They are compared as saved in JSON (e.g. tuples as lists).
+
+###############################################################################
+
+import hashlib  # hash library for the content hash of each "CLS" file
+import json  # JSON library for the manifest file
+import os  # operating system library
+
+manifest_name = "split_manifest.json"  # manifest file name, in the folder of the "CLS" files
+hash_block_size = 1 << 20  # number of bytes hashed at a time
+
+#########################
+
+def get_manifest_file_name(directory_in):  # Get the name of the manifest file of a folder of "CLS" files
+    return os.path.join(directory_in, manifest_name)
+
+#########################
+
+def hash_file(file_path):  # Get the SHA-256 content hash of a file, reading it a block at a time
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as myfile:
+        for block in iter(lambda: myfile.read(hash_block_size), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+#########################
+
+def load_manifest(directory_in):  # Load the manifest of a folder of "CLS" files ({} if there is none yet)
+    manifest_file = get_manifest_file_name(directory_in)
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+#########################
+
+def save_manifest(directory_in, manifest):  # Save the manifest of a folder of "CLS" files
+
+    # Write to a temporary file first, so a partly written manifest is never read
+    manifest_file = get_manifest_file_name(directory_in)
+    with open(manifest_file + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+#########################
+
+def file_is_unchanged(entry, file_path, settings):  # Check if a "CLS" file (and the settings it is split with) are the same as in its manifest entry, updating the entry's modification time if only that changed
+
+    if entry is None or entry["settings"] != json.loads(json.dumps(settings)):
+        return False
+
+    file_stat = os.stat(file_path)
+    if entry["size"] != file_stat.st_size:
+        return False
+    if entry["mtime_ns"] == file_stat.st_mtime_ns:
+        return True
+
+    if entry["sha256"] != hash_file(file_path):
+        return False
+    entry["mtime_ns"] = file_stat.st_mtime_ns
+    return True
+
+#########################
+
+def make_entry(file_path, project, settings, eol_files):  # Make the manifest entry of a "CLS" file that has just been split
+    file_stat = os.stat(file_path)
+    entry = {}
+    entry["project"] = project
+    entry["size"] = file_stat.st_size
+    entry["mtime_ns"] = file_stat.st_mtime_ns
+    entry["sha256"] = hash_file(file_path)
+    entry["settings"] = settings
+    entry["eol_files"] = eol_files
+    return entry
+
+###############################################################################
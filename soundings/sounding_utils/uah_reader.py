@@ -0,0 +1,109 @@
+### NAME:  uah_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To read the data of one UAH sounding into NumPy arrays, whichever of its column
+#             header formats it has, for the stage 2 "convert_uah2spc.py" and
+#             "extract_uah2uv.py" scripts.
+
+### RESTRICTIONS:
+##   INCOMING data needs to be in the UAH format as shown below: 2 header lines, the column
+#    names line, one line of comma separated values per level, then the "%END%" footer line:
+
+#VORTEX-SE 2017 UAH Radiosonde Data
+#20170328, 0051 UTC, Brownsferry, AL, 201 m
+#latitude (deg), longitude (deg),time (sec),height (m MSL),pressure(mb),temp (deg C),RH (%),dewpoint (deg C),Calculated wind speed (kts),Calculated wind direction (deg)
+#34.73705, -87.12219, 0:52:2, 223.0, 984.3, 17.13, 86.1, 14.83, 8.2, 127
+#%END%
+
+##   Different files name their columns differently (height in m MSL or m AGL, wind from the
+#    "Calculated" columns or not, dewpoint or only RH). The columns read are looked up once per
+#    file in the column_names table below, which gives the names each column can have, in order
+#    of preference.
+
+##   The footer is the last line of the file (after leaving out any blank lines at the end).
+#    It is left out before the data lines are read with the pandas C parser (so none of the
+#    slow Python parser is needed to skip it).
+
+##   Missing data is -9999.0, and is read as it is (the scripts mask it).
+
+###############################################################################
+
+import io  # input/output library
+import numpy as np  # numpy library for arrays
+import pandas as pd  # pandas library for reading the comma separated data lines
+
+parser_version = 1  # version of what read_uah_sounding returns (see "parse_cache.py"), change it whenever that changes
+column_names_line = 2  # line number (from 0) of the column names
+data_start_line = 3  # line number (from 0) of the first data line
+
+# Column: the names it can have in UAH files, in order of preference
+column_names = {
+    "height": ["height (m MSL)", "height (m AGL)"],
+    "pressure": ["pressure(mb)"],
+    "temperature": ["temp (deg C)"],
+    "dewpoint": ["dewpoint (deg C)"],
+    "rh": ["RH (%)"],
+    "wind_speed": ["Calculated wind speed (kts)", "wind speed (kts)"],
+    "wind_direction": ["Calculated wind direction (deg)", "wind direction (deg)"],
+}
+required_columns = ["height", "wind_speed", "wind_direction"]  # columns every UAH file needs
+
+# UAH column name: (column, preference), for looking up the names of a file in one step
+column_lookup = {name: (column, preference) for column, names in column_names.items() for preference, name in enumerate(names)}
+
+#########################
+
+def get_column_schema(file_lines):  # Get the UAH column name of each column in the file's column names line (the most preferred one, if it has more than one)
+
+    schema = {}
+    preferences = {}
+    for name in file_lines[column_names_line].split(","):
+        name = name.strip()
+        if name not in column_lookup:
+            continue
+        column, preference = column_lookup[name]
+        if column not in schema or preference < preferences[column]:
+            schema[column] = name
+            preferences[column] = preference
+
+    for column in required_columns:
+        if column not in schema:
+            raise ValueError("UAH data has no {} column (any of {})".format(column, ", ".join("\"{}\"".format(name) for name in column_names[column])))
+    return schema
+
+#########################
+
+def get_data_lines(file_lines):  # Get the data lines, leaving out the footer (the last line that is not blank)
+    end = len(file_lines)
+    while end > data_start_line and file_lines[end - 1].strip() == "":
+        end -= 1
+    return file_lines[data_start_line:max(end - 1, data_start_line)]
+
+#########################
+
+def read_uah_sounding(file_lines):  # Get the header ({"columns": UAH column name of each column, "height_agl": True if height is above ground level}) and {column: float array} of every column a UAH file has
+
+    schema = get_column_schema(file_lines)
+    header = {"columns": schema, "height_agl": schema["height"] == "height (m AGL)"}
+
+    data_lines = get_data_lines(file_lines)
+    if data_lines == []:
+        return header, {column: np.array([], dtype=float) for column in schema}
+
+    names = [name.strip() for name in file_lines[column_names_line].split(",")]
+    data_df = pd.read_csv(io.StringIO("".join(data_lines)), sep=",", header=None, names=names, usecols=list(schema.values()), dtype=float)
+    data = {}
+    for column, name in schema.items():
+        data[column] = data_df[name].to_numpy()
+    return header, data
+
+#########################
+
+def calculate_dewpoint(temperature, rh):  # Get the dewpoint (C) of temperatures (C) and relative humidities (%) with the Magnus formula, over whole arrays (NaN where RH is 0 or below)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_rh = np.log(rh / 100)
+        temperature_term = (17.625 * temperature) / (243.04 + temperature)
+        return 243.04 * (log_rh + temperature_term) / (17.625 - log_rh - temperature_term)
+
+###############################################################################
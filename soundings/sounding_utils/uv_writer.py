@@ -0,0 +1,71 @@
+### NAME:  uv_writer.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To write a Sounding (see "sounding.py") as a "UV" text file for the shear
+#             analyses, for all the stage 2 "extract_*2uv.py" scripts.
+
+### RESTRICTIONS:
+##   OUTGOING data will be a text file in the format:
+
+#Project: 				PECAN
+#Platform ID/Location: 	MP1: OU
+#Date/Time (UTC): 		CLAMPS/20150713
+#Latitude/Longitude: 	43.50500/-91.85000
+#Altitude (masl): 		418.0
+#---------------------------------------------
+#HEIGHT(masl)  WSPD(m/s)  WDIR  U(m/s)  V(m/s)
+#   421.8        10.7     164    -3.0    10.3
+
+##   Each script formats its own height, wind speed, wind direction, u and v text arrays
+#    from its Sounding (the decimal places and widths of u and v differ between them).
+
+##   A level is only written if its height is valid, and not the same (to 1 decimal place)
+#    as the level before. The first level is compared with the last one, as it always was.
+
+###############################################################################
+
+import numpy as np  # numpy library for arrays
+
+from .sounding import invalid_value  # invalid value in the formatted columns
+
+#########################
+
+def get_written_levels(h):  # Find the levels that are written: formatted height is valid, and not the same as the level before
+    return (np.char.find(h, invalid_value) < 0) & (h != np.roll(h, 1))
+
+#########################
+
+def get_uv_data(sounding, columns):  # Get the data lines from the formatted [height, wind speed, wind direction, u, v] columns of a Sounding, and the first height written (launch altitude if nothing is)
+
+    levels = get_written_levels(columns[0])
+    columns = [column[levels].tolist() for column in columns]
+
+    uv_data = "\n".join("{} {} {} {} {}".format(*row) for row in zip(*columns))
+
+    if uv_data != "":
+        h_init = float(columns[0][0])
+    else:
+        h_init = sounding.altitude
+    return uv_data, h_init
+
+#########################
+
+def get_whole_file(sounding, project, uv_data):  # Get the whole text of a "UV" file, from its data lines
+
+    # Construct site header
+    site_header = ("Project: " + "\t\t\t\t{}" + "\n" + "Platform ID/Location: " + "\t{}" + "\n" + "Date/Time (UTC): " + "\t\t{}/{}" + "\n" + "Latitude/Longitude: " + "\t{}/{}" + "\n"
+                   + "Altitude (masl): " + "\t\t{}").format(project, sounding.site, sounding.date, sounding.time, sounding.lat, sounding.lon, sounding.altitude)
+
+    # Construct data header
+    height = "HEIGHT(masl)"
+    wspd = "WSPD(m/s)"
+    wdir = "WDIR"
+    u_header = "U(m/s)"
+    v_header = "V(m/s)"
+
+    data_header = "{}  {}  {}  {}  {}".format(height, wspd, wdir, u_header, v_header)
+
+    return site_header + "\n" + "---------------------------------------------" + "\n" + data_header + "\n" + uv_data
+
+###############################################################################
@@ -0,0 +1,103 @@
+### NAME:  test_eol_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the reading of "EOL" soundings ("sounding_utils/eol_reader.py"): the
+#             header, the data columns, and data lines that do not all have the same length.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import eol_reader  # reads "EOL" soundings
+
+nan = np.nan
+
+header_text = """Data Type:                         GAUS SOUNDING DATA/Ascending
+Project ID:                        PECAN
+Release Site Type/Site ID:         FP4 MINDEN
+Release Location (lon,lat,alt):    098 57.05'W, 40 30.93'N, -98.951, 40.516, 668.9
+UTC Release Time (y,m,d,h,m,s):    2015, 06, 25, 00:00:01
+Radiosonde Serial Number:          x
+Ground Station Software:           x
+Surface Data Source:               x
+System Operator/Comments:          x
+Additional comments:               x
+/
+Nominal Release Time (y,m,d,h,m,s):2015, 06, 25, 00:00:01
+ Time  Press  Temp  Dewpt  RH    Ucmp   Vcmp   spd   dir   Wcmp     Lon     Lat   Ele   Azi    Alt    Qp   Qt   Qrh  Qu   Qv   QdZ
+  sec    mb     C     C     %     m/s    m/s   m/s   deg   m/s      deg     deg   deg   deg     m    code code code code code code
+------ ------ ----- ----- ----- ------ ------ ----- ----- ----- -------- ------- ----- ----- ------- ---- ---- ---- ---- ---- ----
+"""
+
+#########################
+
+def test_header_and_data_columns():  # Lon and lat as "{:.5f}" text, the launch altitude, and one float array per column
+    file_lines = (header_text + """\
+  -1.0  936.3  29.7  22.3  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   658.0  1.0  1.0  1.0  1.0  1.0  9.0
+   0.0  936.2  29.6  22.2  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   668.9  1.0  1.0  1.0  1.0  1.0  9.0
+   1.0  935.6  29.2  22.0  65.0   -2.0   -4.8   5.2  22.6   4.8  -98.951  40.516 999.0 999.0   674.0  1.0  1.0  1.0  1.0  1.0  9.0
+""").splitlines(keepends=True)
+    header, data = eol_reader.read_eol_sounding(file_lines)
+
+    assert (header["lon"], header["lat"], header["altitude"]) == ("-98.95100", "40.51600", 668.9)
+    assert header["columns"][:3] == ["Time", "Press", "Temp"]
+    assert len(header["columns"]) == 21
+    np.testing.assert_array_equal(data["Press"], [936.3, 936.2, 935.6])
+    np.testing.assert_array_equal(data["Alt"], [658.0, 668.9, 674.0])
+    np.testing.assert_array_equal(data["Wcmp"], [999.0, 999.0, 4.8])
+    assert data["Press"].dtype == np.float64
+
+#########################
+
+def test_cut_off_last_line_is_filled_with_nan():  # A last line with fewer values is read with its missing values as NaN
+    file_lines = (header_text + """\
+   0.0  936.2  29.6  22.2  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   668.9  1.0  1.0  1.0  1.0  1.0  9.0
+   1.0  935.6  29.2  22.0  65.0   -2.0   -4.8
+""").splitlines(keepends=True)
+    header, data = eol_reader.read_eol_sounding(file_lines)
+
+    np.testing.assert_array_equal(data["Temp"], [29.6, 29.2])
+    np.testing.assert_array_equal(data["Vcmp"], [-4.7, -4.8])
+    np.testing.assert_array_equal(data["spd"], [5.1, nan])
+    np.testing.assert_array_equal(data["QdZ"], [9.0, nan])
+
+#########################
+
+def test_spc_sounding_masks_bad_and_missing_data():  # Qp 9 masks pressure and height, Qp 3 only height, Qt 3 temperature and dewpoint, Qrh 3 dewpoint, Qu or Qv 3 the wind, and calm wind its direction
+    file_lines = (header_text + """\
+   0.0 9999.0 999.0 999.0 999.0  999.0  999.0   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   668.9  3.0  3.0  3.0  3.0  3.0  9.0
+   1.0  936.2  29.6  22.2  64.0   -1.9   -4.7   5.2  22.6   4.8  -98.951  40.516 999.0 999.0   674.0  1.0  1.0  1.0  1.0  1.0  9.0
+   2.0  935.6  29.2  22.0  65.0    0.0    0.0   0.0   0.0   4.8  -98.951  40.516 999.0 999.0   679.0  3.0  3.0  1.0  1.0  1.0  9.0
+   3.0  935.0  28.9  21.8  65.0   -2.1   -5.1   5.5  23.0   4.8  -98.951  40.516 999.0 999.0 99999.0  9.0  1.0  3.0  3.0  1.0  9.0
+""").splitlines(keepends=True)
+    header, data = eol_reader.read_eol_sounding(file_lines)
+    sounding = eol_reader.get_spc_sounding("EOL_FP4_MINDEN_20150625_0000.txt", "FP4_MINDEN", "20150625", "0000", header, data)
+
+    # The first level is never masked, and its missing values are taken from the next level
+    np.testing.assert_array_equal(sounding.values("pressure"), [936.2, 936.2, 935.6, nan])
+    np.testing.assert_array_equal(sounding.values("height"), [668.9, 674.0, nan, nan])
+    np.testing.assert_array_equal(sounding.values("temperature"), [29.6, 29.6, nan, 28.9])
+    np.testing.assert_array_equal(sounding.values("dewpoint"), [22.2, 22.2, nan, nan])
+    np.testing.assert_array_equal(sounding.values("wind_direction"), [22.1, 22.6, nan, nan])
+    np.testing.assert_array_equal(sounding.values("wind_speed"), [5.1, 5.2, 0.0, nan])
+
+#########################
+
+def test_spc_sounding_level_before_release_is_masked():  # A first level with a time before the release is masked in every column
+    file_lines = (header_text + """\
+  -1.0  936.3  29.7  22.3  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   658.0  1.0  1.0  1.0  1.0  1.0  9.0
+   0.0  936.2  29.6  22.2  64.0   -1.9   -4.7   5.1  22.1 999.0  -98.951  40.516 999.0 999.0   668.9  1.0  1.0  1.0  1.0  1.0  9.0
+""").splitlines(keepends=True)
+    header, data = eol_reader.read_eol_sounding(file_lines)
+    sounding = eol_reader.get_spc_sounding("EOL_FP4_MINDEN_20150625_0000.txt", "FP4_MINDEN", "20150625", "0000", header, data)
+
+    for name in ["pressure", "height", "temperature", "dewpoint", "wind_direction", "wind_speed"]:
+        assert sounding.masks[name].tolist() == [True, False]
+
+###############################################################################
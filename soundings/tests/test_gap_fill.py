@@ -0,0 +1,77 @@
+### NAME:  test_gap_fill.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the filling of small pressure gaps of "SPC" files
+#             ("sounding_utils/gap_fill.py"): where levels are filled in, their log pressure
+#             interpolated values, and the gaps that are left as they are.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import gap_fill  # fills small pressure gaps
+from sounding_utils import spc_writer  # finds the pressure gaps of the levels written
+
+nan = np.nan
+
+#########################
+
+def test_fill_pressures_are_whole_multiples_strictly_inside_the_gap():
+    np.testing.assert_array_equal(gap_fill.get_fill_pressures(1000.0, 950.0, 25), [975.0])
+    np.testing.assert_array_equal(gap_fill.get_fill_pressures(1003.4, 978.2, 5), [1000.0, 995.0, 990.0, 985.0, 980.0])
+    np.testing.assert_array_equal(gap_fill.get_fill_pressures(1000.0, 995.0, 5), [])
+
+#########################
+
+def test_gap_is_filled_in_log_pressure():  # 975 mb is 0.49359 of the way from 1000 to 950 mb in log pressure
+    values = np.array([
+        [1000.0, 100.0, 20.0, 15.0, 180.0, 10.0],
+        [950.0, 550.0, 15.0, 10.0, 180.0, 10.0],
+    ])
+    gaps = spc_writer.get_pressure_gaps(values[:, 0])
+    filled = gap_fill.fill_gaps(values, gaps, 100, 25)
+    np.testing.assert_allclose(filled, [
+        [1000.0, 100.0, 20.0, 15.0, 180.0, 10.0],
+        [975.0, 322.11507, 17.53205, 12.53205, 180.0, 10.0],
+        [950.0, 550.0, 15.0, 10.0, 180.0, 10.0],
+    ], rtol=1e-6)
+    assert gaps[0]["filled"] == 1
+
+#########################
+
+def test_calm_and_missing_values_are_not_made_up():  # Calm wind on both sides stays calm, and a value missing on one side stays missing
+    values = np.array([
+        [1000.0, 100.0, 20.0, nan, nan, 0.0],
+        [950.0, 550.0, 15.0, 10.0, nan, 0.0],
+    ])
+    filled = gap_fill.fill_gaps(values, spc_writer.get_pressure_gaps(values[:, 0]), 100, 25)
+    assert np.isnan(filled[1, 3])
+    assert np.isnan(filled[1, 4])
+    assert filled[1, 5] == 0.0
+
+#########################
+
+def test_large_and_non_positive_gaps_are_left_as_they_are():  # A gap of max_gap or more, or one up to a -999.00 "Hgt" missing value, is not filled
+    values = np.array([
+        [1000.0, 100.0, 20.0, 15.0, 180.0, 10.0],
+        [950.0, 550.0, 15.0, 10.0, 180.0, 10.0],
+        [-999.0, 600.0, 14.0, 9.0, 180.0, 10.0],
+    ])
+    gaps = spc_writer.get_pressure_gaps(values[:, 0])
+    assert [(gap["bottom"], gap["top"]) for gap in gaps] == [(1000.0, 950.0), (950.0, -999.0)]
+
+    filled = gap_fill.fill_gaps(values, gaps, 50, 25)
+    np.testing.assert_array_equal(filled, values)
+    assert [gap["filled"] for gap in gaps] == [0, 0]
+
+    filled = gap_fill.fill_gaps(values, gaps, 5000, 25)
+    np.testing.assert_allclose(filled[:, 0], [1000.0, 975.0, 950.0, -999.0])
+    assert [gap["filled"] for gap in gaps] == [1, 0]
+
+###############################################################################
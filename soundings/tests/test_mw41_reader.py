@@ -0,0 +1,92 @@
+### NAME:  test_mw41_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the reading of Vaisala MW41 soundings ("sounding_utils/mw41_reader.py"):
+#             the header values found by their keys, signed degrees, missing values, the file
+#             encodings, and the data masked for an "SPC" file.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+import pytest  # pytest library, for the errors expected
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import mw41_reader  # reads Vaisala MW41 soundings
+
+nan = np.nan
+
+file_text = (
+    "Station name                                 \tCSU atmos_1\n"
+    "System trademark and model                   \tMW41\n"
+    "Balloon release date and time                \t2018-11-10T15:00:04\n"
+    "Release point latitude                       \t31.81652°S\n"
+    "Release point longitude                      \t64.28452°W\n"
+    "Release point height from sea level          \t441.4 m\n"
+    "\n"
+    "Elapsed time\tHeightMSL\tP\tTemp\tDewp\tRH\tSpeed\tDir\n"
+    "s\tm\thPa\t°C\t°C\t%\tm/s\t°\n"
+    "-1\t441.4\t950.7\t30.8\t19.5\t50.7\t4.0\t359.0\n"
+    "0\t441.4\t950.6\t30.7\t19.4\t50.7\t0.0\t359.7\n"
+    "1\t446.2\t950.1\t/////\t19.3\t50.9\t4.2\t\n"
+    "2\t451.0\t949.5\t30.5\t19.2\t51.0\t4.3\t1.2\n"
+)
+
+#########################
+
+def test_header_and_data_columns():  # Header values by their keys, signed degrees, and "/////" or blank values as NaN
+    header, data = mw41_reader.read_mw41_sounding(file_text.splitlines(keepends=True))
+
+    assert (header["station"], header["release_time"]) == ("CSU atmos_1", "2018-11-10T15:00:04")
+    assert (header["lat"], header["lon"], header["altitude"]) == ("-31.81652", "-64.28452", 441.4)
+    assert header["columns"] == ["Elapsed time", "HeightMSL", "P", "Temp", "Dewp", "RH", "Speed", "Dir"]
+    assert header["data_start_line"] == 9
+    np.testing.assert_array_equal(data["P"], [950.7, 950.6, 950.1, 949.5])
+    np.testing.assert_array_equal(data["Temp"], [30.8, 30.7, nan, 30.5])
+    np.testing.assert_array_equal(data["Dir"], [359.0, 359.7, nan, 1.2])
+
+    assert mw41_reader.get_site_date_time(header) == ("CSU-atmos-1", "20181110", "1500")
+
+#########################
+
+def test_degrees():  # North and east are positive, south and west (either case) negative, and no number is ""
+    assert mw41_reader.get_degrees("12.5°N") == "12.50000"
+    assert mw41_reader.get_degrees("64.28452°E") == "64.28452"
+    assert mw41_reader.get_degrees("0.25 w") == "-0.25000"
+    assert mw41_reader.get_degrees("/////") == ""
+
+#########################
+
+def test_utf8_and_latin1_files(tmp_path):  # The degree symbol is read the same from a UTF-8 or a Latin-1 file
+    for encoding in ["utf-8", "latin-1"]:
+        file_path = os.path.join(str(tmp_path), "CSU_1_EDT.txt")
+        with open(file_path, "wb") as f:
+            f.write(file_text.encode(encoding))
+        file_lines = mw41_reader.read_file_lines(file_path)
+        assert mw41_reader.is_mw41_file(file_lines)
+        assert file_lines[3].rstrip("\n").endswith("31.81652°S")
+
+#########################
+
+def test_spc_sounding_masks_missing_data():  # Missing values, dewpoint where temperature is missing, wind direction where wind speed is 0, and levels before the release are masked
+    header, data = mw41_reader.read_mw41_sounding(file_text.splitlines(keepends=True))
+    sounding = mw41_reader.get_spc_sounding("CSU_1_EDT.txt", "CSU-atmos-1", "20181110", "1500", header, data)
+
+    assert sounding.masks["pressure"].tolist() == [True, False, False, False]
+    assert sounding.masks["temperature"].tolist() == [True, False, True, False]
+    assert sounding.masks["dewpoint"].tolist() == [True, False, True, False]
+    assert sounding.masks["wind_direction"].tolist() == [True, True, True, False]
+    np.testing.assert_array_equal(sounding.values("wind_speed", "m/s"), [nan, 0.0, 4.2, 4.3])
+
+#########################
+
+def test_header_without_altitude_is_an_error():  # The release point height is needed for the launch altitude
+    file_lines = [file_line for file_line in file_text.splitlines(keepends=True) if not file_line.startswith("Release point height")]
+    with pytest.raises(ValueError, match="Release point height"):
+        mw41_reader.read_mw41_sounding(file_lines)
+
+###############################################################################
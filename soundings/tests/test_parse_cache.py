@@ -0,0 +1,83 @@
+### NAME:  test_parse_cache.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the cache of parsed soundings ("sounding_utils/parse_cache.py"): that an
+#             entry is only used for the same text read by the same reader version, and that
+#             an entry that cannot be read is parsed again.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import parse_cache  # cache of parsed soundings
+
+file_lines = ["Release Location (lon,lat,alt):    098 57.05'W, 40 30.93'N, -98.951, 40.516, 668.9\n", "   0.0  936.2  29.6\n", "   1.0  935.6  29.2\n"]
+
+parsed_lines = []  # the lines given to parse_lines, one entry per call
+
+#########################
+
+def parse_lines(file_lines):  # Reader of the tests: the altitude and the last two columns of the lines
+    parsed_lines.append(file_lines)
+    header = {"altitude": float(file_lines[0].split(",")[-1]), "lat": "40.51600"}
+    values = np.array([file_line.split() for file_line in file_lines[1:]], dtype=float)
+    return header, {"Temp": values[:, 2], "Press": values[:, 1]}
+
+#########################
+
+def test_same_text_and_version_is_read_from_the_cache(tmp_path):  # The second read does not parse, and gives back the same header, columns (in order) and values
+    del parsed_lines[:]
+    first = parse_cache.read_parsed_sounding(str(tmp_path), file_lines, "test_reader", 1, parse_lines)
+    second = parse_cache.read_parsed_sounding(str(tmp_path), file_lines, "test_reader", 1, parse_lines)
+
+    assert len(parsed_lines) == 1
+    assert second[0] == {"altitude": 668.9, "lat": "40.51600"}
+    assert list(second[1]) == ["Temp", "Press"]
+    np.testing.assert_array_equal(second[1]["Temp"], [29.6, 29.2])
+    np.testing.assert_array_equal(second[1]["Press"], first[1]["Press"])
+
+#########################
+
+def test_new_version_or_changed_text_is_parsed_again(tmp_path):  # A different reader version or name, or one changed line, has a different key
+    key = parse_cache.get_cache_key(file_lines, "test_reader", 1)
+    changed_lines = file_lines[:2] + ["   1.0  935.6  29.3\n"]
+    assert parse_cache.get_cache_key(file_lines, "test_reader", 2) != key
+    assert parse_cache.get_cache_key(file_lines, "other_reader", 1) != key
+    assert parse_cache.get_cache_key(changed_lines, "test_reader", 1) != key
+
+    del parsed_lines[:]
+    parse_cache.read_parsed_sounding(str(tmp_path), file_lines, "test_reader", 1, parse_lines)
+    parse_cache.read_parsed_sounding(str(tmp_path), file_lines, "test_reader", 2, parse_lines)
+    header, data = parse_cache.read_parsed_sounding(str(tmp_path), changed_lines, "test_reader", 1, parse_lines)
+    assert len(parsed_lines) == 3
+    np.testing.assert_array_equal(data["Temp"], [29.6, 29.3])
+
+#########################
+
+def test_unreadable_entry_is_parsed_again(tmp_path):  # A cut-off entry is parsed again and replaced
+    key = parse_cache.get_cache_key(file_lines, "test_reader", 1)
+    cache_file = parse_cache.get_cache_file_name(str(tmp_path), key)
+    os.makedirs(os.path.dirname(cache_file))
+    with open(cache_file, "wb") as f:
+        f.write(b"PK\x03\x04")
+
+    del parsed_lines[:]
+    header, data = parse_cache.read_parsed_sounding(str(tmp_path), file_lines, "test_reader", 1, parse_lines)
+    assert len(parsed_lines) == 1
+    assert parse_cache.load_parsed_sounding(str(tmp_path), key) is not None
+
+#########################
+
+def test_no_cache_directory_always_parses():  # A blank cache_directory parses every time
+    del parsed_lines[:]
+    parse_cache.read_parsed_sounding("", file_lines, "test_reader", 1, parse_lines)
+    parse_cache.read_parsed_sounding("", file_lines, "test_reader", 1, parse_lines)
+    assert len(parsed_lines) == 2
+
+###############################################################################
@@ -0,0 +1,93 @@
+### NAME:  test_qc.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the quality control checks of "sounding_utils/qc.py": the levels dropped
+#             where pressure is not decreasing or height is not increasing (compared as text,
+#             as they are written), and the physical checks (spikes, superadiabatic layers and
+#             wind shear).
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import qc  # quality control checks
+from sounding_utils.sounding import Sounding  # shared sounding data model
+
+nan = np.nan
+
+#########################
+
+def test_pressure_not_decreasing_in_text_order():  # " -999.00" is above "  980.00" as text, so it is dropped like any other rise in pressure
+    p = [" 1000.00", "  990.00", "   -9999", "  995.00", "  980.00", "  980.00", " -999.00"]
+    assert qc.pressure_not_decreasing(p).tolist() == [False, False, False, True, False, True, True]
+
+#########################
+
+def test_height_not_increasing_from_launch_altitude():  # Heights more than 2 m below the launch altitude are dropped until one is kept, then each has to be above every kept height
+    h = ["    995.00", "    999.00", "     -9999", "   1010.00", "   1005.00", "   1010.00", "   1020.00"]
+    assert qc.height_not_increasing(h, 1000.0).tolist() == [True, False, False, False, True, True, False]
+
+#########################
+
+def test_long_gap_of_invalid_values():  # A level after a long run of invalid values is compared with the last valid level before the run
+    p = [" 1000.00"] + ["   -9999"] * 5000 + ["  990.00", " 1001.00"]
+    dropped = qc.pressure_not_decreasing(p)
+    assert dropped.sum() == 1
+    assert dropped[-1]
+
+#########################
+
+def test_mask_pressure_not_decreasing_masks_the_given_columns():  # Only the given columns are masked, at the dropped levels
+    sounding = Sounding("Sonde_20181110_SCOUT1_1000_Hgt.txt", "SCOUT1", "20181110", "1000", "", "", 300.0)
+    sounding.add_column("pressure", np.array([1000.0, 990.0, 995.0, -999.0]))
+    sounding.add_column("temperature", np.array([20.0, 19.0, 19.5, 18.0]))
+    sounding.add_column("height", np.array([300.0, 390.0, 350.0, 470.0]))
+    qc.mask_pressure_not_decreasing(sounding, ["pressure", "temperature"])
+    assert sounding.masks["pressure"].tolist() == [False, False, True, True]
+    assert sounding.masks["temperature"].tolist() == [False, False, True, True]
+    assert not sounding.masks["height"].any()
+
+#########################
+
+def test_spikes():  # 25 is 5 and 4.5 above its neighbours, and 16 is 4.5 and 3.9 below its valid neighbours (skipping the NaN), but a rise of exactly the threshold is not a spike
+    values = np.array([20.0, 25.0, 20.5, nan, 16.0, 19.9, 19.8, 15.0])
+    assert qc.find_spikes(values, 3.0).tolist() == [False, True, False, False, True, False, False, False]
+    assert qc.find_spikes(np.array([20.0, 23.0, 20.0]), 3.0).tolist() == [False, False, False]
+
+#########################
+
+def test_superadiabatic_layers():  # The 100 m layers from 300 and 350 m cool at 30 C/km, the rest at 10 C/km, and the 200 C/km layer at 100 m is in the surface layer
+    temperature = np.array([30.0, 20.0, 19.0, 18.5, 16.0, 15.5, 15.0, 14.0])
+    height = np.array([100.0, 150.0, 300.0, 350.0, 400.0, 450.0, 500.0, 600.0])
+    superadiabatic = qc.find_superadiabatic_layers(temperature, height, 100.0, 100.0, 20.0, 200.0)
+    assert superadiabatic.tolist() == [False, False, True, True, True, True, False, False]
+
+#########################
+
+def test_wind_shear():  # 12 m/s to calm in 10 m is sheared, 7 m/s in 80 m is less than 0.1 (m/s)/m, and 2 m/s in 10 m is less than 5 m/s
+    wind_direction = np.array([270.0, 270.0, nan, 270.0, 270.0, 270.0])
+    wind_speed = np.array([10.0, 12.0, 0.0, 7.0, 10.0, nan])
+    height = np.array([100.0, 110.0, 120.0, 200.0, 300.0, 310.0])
+    assert qc.find_wind_shear(wind_direction, wind_speed, height, 0.1, 5.0).tolist() == [False, True, True, False, False, False]
+
+#########################
+
+def test_mask_physical_outliers():  # A temperature spike masks the dewpoint too, and the number of levels masked is returned
+    sounding = Sounding("Sonde_20181110_SCOUT1_1000_Hgt.txt", "SCOUT1", "20181110", "1000", "", "", 300.0)
+    sounding.add_column("height", np.array([300.0, 310.0, 320.0]))
+    sounding.add_column("temperature", np.array([20.0, 25.0, 20.0]))
+    sounding.add_column("dewpoint", np.array([10.0, 10.0, 10.0]))
+    sounding.add_column("wind_direction", np.array([270.0, 270.0, 270.0]))
+    sounding.add_column("wind_speed", np.array([10.0, 10.0, 10.0]), units="kt")
+    assert qc.mask_physical_outliers(sounding) == 1
+    assert sounding.masks["temperature"].tolist() == [False, True, False]
+    assert sounding.masks["dewpoint"].tolist() == [False, True, False]
+    assert not sounding.masks["wind_speed"].any()
+
+###############################################################################
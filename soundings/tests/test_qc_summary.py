@@ -0,0 +1,55 @@
+### NAME:  test_qc_summary.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check that "sounding_utils/qc_summary.py" puts each level in the right height
+#             band above the launch altitude.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import qc_summary  # summary table of QC flag counts
+from sounding_utils.sounding import Sounding  # shared sounding data model
+
+#########################
+
+def make_sounding(heights, altitude, height_mask=None):  # Make a Sounding of the given heights (m) and "eol" Qp flags (2 = questionable on every level)
+    sounding = Sounding("EOL_MP1_OU_20150713_0300.txt", "MP1_OU", "20150713", "0300", "", "", altitude)
+    sounding.add_column("height", np.array(heights), height_mask)
+    sounding.add_flags("Qp", np.full(len(heights), 2))
+    return sounding
+
+#########################
+
+def test_level_at_launch_altitude_is_in_first_band():  # A level at exactly the launch altitude is at 0 m, not just below it
+    sounding = make_sounding([1256.2, 1260.0, 1300.5], 1256.2)
+    assert qc_summary.get_height_bands(sounding, qc_summary.height_bands).tolist() == [0, 0, 0]
+
+    rows = qc_summary.get_flag_statistics("EOL_MP1_OU_20150713_0300.txt", "MP1_OU", "20150713", "0300", sounding, "eol")
+    counts = {row["band"]: (row["levels"], row["questionable"]) for row in rows}
+    assert counts["all"] == (3, 3)
+    assert counts["0-1000"] == (3, 3)
+
+#########################
+
+def test_masked_height_is_still_in_its_band():  # A level whose height is masked (e.g. a bad pressure) is counted in the band of its height as read
+    sounding = make_sounding([1256.2, 1260.0, 2400.0], 1256.2, height_mask=[False, True, False])
+    assert qc_summary.get_height_bands(sounding, qc_summary.height_bands).tolist() == [0, 0, 1]
+
+#########################
+
+def test_missing_height_is_only_counted_in_all():  # A level whose height is missing (NaN, or the "EOL" 99999.0) is in no height band
+    sounding = make_sounding([1256.2, np.nan, 99999.0, 4000.0], 1256.2, height_mask=[False, True, True, False])
+    assert qc_summary.get_height_bands(sounding, qc_summary.height_bands).tolist() == [0, -1, -1, 1]
+
+    rows = qc_summary.get_flag_statistics("EOL_MP1_OU_20150713_0300.txt", "MP1_OU", "20150713", "0300", sounding, "eol")
+    counts = {row["band"]: row["levels"] for row in rows}
+    assert counts == {"all": 4, "0-1000": 1, "1000-3000": 1, "3000-6000": 0, "6000-10000": 0, "10000+": 0}
+
+###############################################################################
@@ -0,0 +1,103 @@
+### NAME:  test_resample.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the resampling of the levels written to "SPC" files
+#             ("sounding_utils/resample.py"): calm winds, gaps of missing data, blocks it
+#             cannot resample, and how close and how much smaller the resampled profile is.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import resample  # resamples the levels written to "SPC" files
+
+nan = np.nan
+
+#########################
+
+def test_wind_components_of_calm_wind_are_zero():  # Calm wind (speed 0, direction masked) is u = v = 0, not NaN
+    u, v = resample.get_wind_components(np.array([nan, 270.0, 180.0, nan]), np.array([0.0, 10.0, 10.0, nan]))
+    np.testing.assert_allclose(u, [0.0, 10.0, 0.0, nan], atol=1e-12)
+    np.testing.assert_allclose(v, [0.0, 0.0, 10.0, nan], atol=1e-12)
+
+#########################
+
+def test_levels_in_a_gap_of_missing_data_are_not_written():  # Every 10 mb from 1000 to 950 mb (from levels every 5 mb), except 980 and 970 mb, where there is no data between 985 and 960 mb
+    values = np.array([
+        [1000.0, 100.0, 20.0, 15.0, 180.0, 10.0],
+        [995.0, 145.0, 19.5, 14.5, 180.0, 10.0],
+        [990.0, 190.0, 19.0, 14.0, 180.0, 10.0],
+        [985.0, 235.0, 18.5, 13.5, 180.0, 10.0],
+        [980.0, nan, nan, nan, nan, nan],
+        [975.0, nan, nan, nan, nan, nan],
+        [970.0, nan, nan, nan, nan, nan],
+        [965.0, nan, nan, nan, nan, nan],
+        [960.0, 460.0, 16.0, 11.0, 180.0, 10.0],
+        [955.0, 505.0, 15.5, 10.5, 180.0, 10.0],
+        [950.0, 550.0, 15.0, 10.0, 180.0, 10.0],
+    ])
+    resampled = resample.resample_levels(values, "pressure", [(0, 10)])
+    np.testing.assert_allclose(resampled[:, 0], [1000.0, 990.0, 960.0, 950.0])
+    np.testing.assert_allclose(resampled[:, 1:4], [[100.0, 20.0, 15.0], [190.0, 19.0, 14.0], [460.0, 16.0, 11.0], [550.0, 15.0, 10.0]])
+    np.testing.assert_allclose(resampled[:, 4:], [[180.0, 10.0]] * 4)
+
+#########################
+
+def test_calm_wind_stays_calm():  # Calm levels are resampled as calm (speed 0, direction masked), not as missing wind
+    values = np.array([
+        [1000.0, 100.0, 20.0, 15.0, nan, 0.0],
+        [995.0, 145.0, 19.5, 14.5, nan, 0.0],
+        [990.0, 190.0, 19.0, 14.0, nan, 0.0],
+        [985.0, 235.0, 18.5, 13.5, nan, 0.0],
+        [980.0, 280.0, 18.0, 13.0, nan, 0.0],
+    ])
+    resampled = resample.resample_levels(values, "pressure", [(0, 10)])
+    np.testing.assert_allclose(resampled[:, 0], [1000.0, 990.0, 980.0])
+    np.testing.assert_array_equal(resampled[:, 5], [0.0, 0.0, 0.0])
+    assert np.all(np.isnan(resampled[:, 4]))
+
+#########################
+
+def test_block_with_pressure_not_above_zero_is_not_resampled():  # A pressure of 0 or below (e.g. a -999.00 "Hgt" missing value) leaves the block as it is
+    values = np.array([
+        [1000.0, 100.0, 20.0, 15.0, 180.0, 10.0],
+        [990.0, 190.0, 19.0, 14.0, 180.0, 10.0],
+        [980.0, 280.0, 18.0, 13.0, 180.0, 10.0],
+        [-999.0, 370.0, 17.0, 12.0, 180.0, 10.0],
+    ])
+    assert resample.resample_levels(values, "height", [(1000, 10)]) is values
+
+#########################
+
+def test_noisy_sounding_is_reduced_within_tolerances():  # A 5000 level (1 Hz, 5 m/s ascent) sounding with 1 m/s wind noise is written with about 10 times fewer levels, every level within significant_tolerances of the resampled profile
+
+    rng = np.random.default_rng(1)
+    height = 300 + 5.0 * np.arange(5000)
+    km = (height - 300) / 1000
+    pressure = 970 * np.exp(-km / 7.6)
+    temperature = np.where(km < 11, 25 - 6.5 * km, 25 - 6.5 * 11) + rng.normal(0, 0.15, len(km))
+    dewpoint = np.minimum(temperature - 5 - 2 * km + rng.normal(0, 0.5, len(km)), temperature)
+    speed = (5 + 25 * np.exp(-((km - 10) / 3) ** 2)) / 0.514444
+    direction = 200 + 60 * np.tanh(km / 3)
+    u, v = resample.get_wind_components(direction, speed)
+    direction, speed = resample.get_wind_direction_speed(u + rng.normal(0, 1.94, len(km)), v + rng.normal(0, 1.94, len(km)))
+    values = np.round(np.column_stack([pressure, height, temperature, dewpoint, direction, speed]), 2)
+
+    resampled = resample.resample_levels(values, "height", [(1000, 10), (3000, 25), (10000, 50), (30000, 100)])
+    assert len(values) / len(resampled) >= 8
+
+    x = -np.log(values[:, 0])
+    x_resampled = -np.log(resampled[:, 0])
+    u, v = resample.get_wind_components(values[:, 4], values[:, 5])
+    u_resampled, v_resampled = resample.get_wind_components(resampled[:, 4], resampled[:, 5])
+    for name, original, column in [("temperature", values[:, 2], resampled[:, 2]), ("dewpoint", values[:, 3], resampled[:, 3]), ("u", u, u_resampled), ("v", v, v_resampled)]:
+        profile = np.interp(x, x_resampled, column)
+        assert np.max(np.abs(profile - original)) <= resample.significant_tolerances[name] + 1e-9
+
+###############################################################################
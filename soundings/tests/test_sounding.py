@@ -0,0 +1,61 @@
+### NAME:  test_sounding.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the shared sounding data model ("sounding_utils/sounding.py"): columns
+#             kept as float32 only when that gives back exactly the same numbers, masks, wind
+#             speed units, and rounding and formatting exactly as the output files are written.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import sounding  # shared sounding data model
+
+nan = np.nan
+
+#########################
+
+def test_compact_values_keeps_float32_only_when_exact():  # Values given to 1 decimal place are float32, a calculated dewpoint stays float64
+    values, decimals = sounding.compact_values([936.2, 29.6, nan])
+    assert (values.dtype, decimals) == (np.float32, 1)
+
+    values, decimals = sounding.compact_values([1 / 3, 2.0])
+    assert (values.dtype, decimals) == (np.float64, None)
+    np.testing.assert_array_equal(values, [1 / 3, 2.0])
+
+#########################
+
+def test_values_are_the_numbers_added():  # A float32 column gives back exactly the float64 numbers added, with masked values as NaN (or as added, if masked is False)
+    data = sounding.Sounding("EOL_FP4_MINDEN_20150625_0000.txt", "FP4_MINDEN", "20150625", "0000", "40.51600", "-98.95100", 668.9)
+    data.add_column("pressure", np.array([936.2, 935.6, 934.9]), np.array([False, True, False]))
+    assert data.columns["pressure"].dtype == np.float32
+    np.testing.assert_array_equal(data.values("pressure"), [936.2, nan, 934.9])
+    assert data.values("pressure", masked=False).tolist() == [936.2, 935.6, 934.9]
+
+    data.mask_levels([0], ["pressure"])
+    assert data.masks["pressure"].tolist() == [True, True, False]
+    assert len(data) == 3
+
+#########################
+
+def test_wind_speed_is_converted_from_its_units():  # Wind speed stored in m/s is given in kt with the factor the scripts always used
+    data = sounding.Sounding("EOL_FP4_MINDEN_20150625_0000.txt", "FP4_MINDEN", "20150625", "0000", "", "", 668.9)
+    data.add_column("wind_speed", np.array([5.1, 0.0]), units="m/s")
+    np.testing.assert_array_equal(data.values("wind_speed", "kt"), [5.1 * 1.94384, 0.0])
+    np.testing.assert_array_equal(data.values("wind_speed", "m/s"), [5.1, 0.0])
+
+#########################
+
+def test_round_values_rounds_as_formatting_does():  # 0.005 is written "0.01" and 2.675 "2.67", where np.round gives 0.0 and 2.68
+    values = np.array([0.005, 2.675, 936.125, -0.005, 29.6, nan])
+    rounded = sounding.round_values(values, 2)
+    np.testing.assert_array_equal(rounded, [0.01, 2.67, 936.12, -0.01, 29.6, nan])
+    assert sounding.format_values(values, 2, 8).tolist() == ["    0.01", "    2.67", "  936.12", "   -0.01", "   29.60", "   -9999"]
+
+###############################################################################
@@ -0,0 +1,91 @@
+### NAME:  test_spc_writer.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the writing of "SPC" files ("sounding_utils/spc_writer.py"): the
+#             "%RAW%" data lines, with masked values written as "-9999", the levels written
+#             and the pressure gaps between them, and the whole file.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import spc_writer  # writes "SPC" files
+from sounding_utils.sounding import Sounding  # shared sounding data model
+
+nan = np.nan
+
+#########################
+
+def test_spc_block_lines():  # Each level is one line of fixed-width columns, with NaN as "-9999" right-aligned to the column width
+    values = np.array([
+        [963.2, 311.4, 35.0, 19.34, 196.0, 13.61],
+        [962.8, nan, 34.26, nan, 196.1, 13.63],
+        [nan, 320.0, -0.5, -12.345, nan, 0.0],
+    ])
+    assert spc_writer.format_spc_block(values).split("\n") == [
+        "  963.20,    311.40,     35.00,     19.34,    196.00,     13.61",
+        "  962.80,     -9999,     34.26,     -9999,    196.10,     13.63",
+        "   -9999,    320.00,     -0.50,    -12.35,     -9999,      0.00",
+    ]
+    assert spc_writer.format_spc_block(np.zeros((0, 6))) == ""
+
+#########################
+
+def test_written_levels():  # NaN and -9999 pressures are not written, nor a pressure the same as the level before (the first level is compared with the last)
+    pressure = np.array([963.2, 963.2, nan, -9999.0, 962.8, 962.8, 950.0, 963.2])
+    assert spc_writer.get_written_levels(pressure).tolist() == [False, False, False, False, True, False, True, True]
+
+#########################
+
+def test_pressure_gaps_and_their_bounds():  # Drops of 20 mb or more, with the pressures below and above them and the level below them
+    gaps = spc_writer.get_pressure_gaps(np.array([1000.0, 980.0, 975.0, 940.0, 920.01]))
+    assert gaps == [
+        {"difference": -20.0, "bottom": 1000.0, "top": 980.0, "level": 0},
+        {"difference": -35.0, "bottom": 975.0, "top": 940.0, "level": 2},
+    ]
+    assert spc_writer.get_pressure_gaps(np.array([1000.0])) == []
+
+#########################
+
+def test_spc_data_first_height_and_gaps():  # The first height and the gaps are those of the written levels, and the launch altitude is the first height when nothing is written
+    sounding = Sounding("Sonde_20181110_SCOUT1_1659_Hgt.txt", "SCOUT1", "181110", "1659", "", "", 300.0)
+    sounding.add_column("pressure", np.array([nan, 963.204, 963.2, 940.0]))
+    sounding.add_column("height", np.array([300.0, 311.396, 311.4, 520.0]))
+    for name in ["temperature", "dewpoint", "wind_direction"]:
+        sounding.add_column(name, np.array([20.0, 20.0, 20.0, 18.0]))
+    sounding.add_column("wind_speed", np.array([0.0, 0.0, 0.0, 10.0]), units="kt")
+
+    spc_data, h_init, pressure_gaps = spc_writer.get_spc_data(sounding)
+    assert spc_data.split("\n") == [
+        "  963.20,    311.40,     20.00,     20.00,     20.00,      0.00",
+        "  940.00,    520.00,     18.00,     18.00,     18.00,     10.00",
+    ]
+    assert h_init == 311.4
+    assert [(gap["bottom"], gap["top"]) for gap in pressure_gaps] == [(963.2, 940.0)]
+
+    sounding.mask_levels(np.ones(4, dtype=bool), ["pressure"])
+    assert spc_writer.get_spc_data(sounding) == ("", 300.0, [])
+
+#########################
+
+def test_spc_file(tmp_path):  # The header, "%RAW%" data lines and "%END%" of a whole file
+    sounding = Sounding("Sonde_20181110_SCOUT1_1659_Hgt.txt", "SCOUT1", "181110", "1659", "-31.72817", "-63.84490", 311.4)
+    file_out = os.path.join(str(tmp_path), "Sonde_20181110_SCOUT1_1659_SPC.txt")
+    spc_writer.write_spc_file(file_out, sounding, "  963.20,    311.40,     35.00,     19.34,    196.00,     13.61")
+    with open(file_out) as f:
+        assert f.read() == """%TITLE%
+ SCOUT1   181110/1659 -31.72817,-63.84490
+
+   LEVEL       HGHT       TEMP       DWPT       WDIR       WSPD
+-------------------------------------------------------------------
+%RAW%
+  963.20,    311.40,     35.00,     19.34,    196.00,     13.61
+%END%"""
+
+###############################################################################
@@ -0,0 +1,71 @@
+### NAME:  test_uah_reader.py
+
+### MODIFICATION HISTORY:  Written for Python (10/17/2026);
+
+### PURPOSE:  To check the reading of UAH soundings ("sounding_utils/uah_reader.py"): the
+#             columns looked up by their names in each header format, the footer left out,
+#             and the dewpoint calculated from RH.
+
+### USAGE:  python -m pytest soundings/tests
+
+###############################################################################
+
+import os  # operating system library
+import sys  # system library
+import numpy as np  # numpy library for arrays
+import pytest  # pytest library, for the errors expected
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # location of the shared "sounding_utils" modules
+from sounding_utils import uah_reader  # reads UAH soundings
+
+nan = np.nan
+
+#########################
+
+def test_calculated_wind_and_msl_height():  # The "Calculated" wind columns are read over the others, and the footer and blank lines after it are left out
+    file_lines = """VORTEX-SE 2017 UAH Radiosonde Data
+20170328, 0051 UTC, Brownsferry, AL, 201 m
+latitude (deg), longitude (deg),time (sec),height (m MSL),pressure(mb),temp (deg C),RH (%),dewpoint (deg C),wind speed (kts),wind direction (deg),Calculated wind speed (kts),Calculated wind direction (deg)
+34.73705, -87.12219, 0:52:2, 223.0, 984.3, 17.13, 86.1, 14.83, 1.0, 100, 8.2, 127
+34.73706, -87.12220, 0:52:3, 228.5, 983.7, 17.05, 86.4, 14.80, 1.1, 101, -9999.0, -9999.0
+%END%
+
+""".splitlines(keepends=True)
+    header, data = uah_reader.read_uah_sounding(file_lines)
+
+    assert header["columns"]["wind_speed"] == "Calculated wind speed (kts)"
+    assert header["height_agl"] is False
+    assert sorted(data) == ["dewpoint", "height", "pressure", "rh", "temperature", "wind_direction", "wind_speed"]
+    np.testing.assert_array_equal(data["height"], [223.0, 228.5])
+    np.testing.assert_array_equal(data["wind_speed"], [8.2, -9999.0])
+    np.testing.assert_array_equal(data["wind_direction"], [127.0, -9999.0])
+
+#########################
+
+def test_agl_height_without_dewpoint_or_data():  # A file with height above ground level, no dewpoint column and no data lines
+    file_lines = """VORTEX-SE 2017 UAH Radiosonde Data
+20170327, 1505 UTC, Huntsville, AL, 196 m
+time (sec),height (m AGL),pressure(mb),temp (deg C),RH (%),wind speed (kts),wind direction (deg)
+%END%
+""".splitlines(keepends=True)
+    header, data = uah_reader.read_uah_sounding(file_lines)
+
+    assert header["height_agl"] is True
+    assert "dewpoint" not in data
+    assert data["height"].tolist() == []
+
+#########################
+
+def test_missing_wind_column_is_an_error():  # Height, wind speed and wind direction are needed
+    file_lines = ["VORTEX-SE 2017 UAH Radiosonde Data\n", "20170327, 1505 UTC, Huntsville, AL, 196 m\n", "height (m MSL),pressure(mb),wind speed (kts)\n", "%END%\n"]
+    with pytest.raises(ValueError, match="wind_direction"):
+        uah_reader.read_uah_sounding(file_lines)
+
+#########################
+
+def test_dewpoint_from_rh():  # Magnus formula: 20 C at 100% is 20 C, at 50% is 9.26111 C, and RH of 0 or below has no dewpoint
+    dewpoint = uah_reader.calculate_dewpoint(np.array([20.0, 20.0, 20.0, 20.0]), np.array([100.0, 50.0, 0.0, -9999.0]))
+    np.testing.assert_allclose(dewpoint[:2], [20.0, 9.261106630534238], rtol=1e-12)
+    assert np.isnan(dewpoint[2:]).all()
+
+###############################################################################